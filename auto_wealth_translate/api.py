@@ -4,6 +4,9 @@ AutoWealthTranslate API
 API server for the AutoWealthTranslate application.
 """
 
+import asyncio
+import hashlib
+import json
 import os
 import tempfile
 import uuid
@@ -11,18 +14,22 @@ import logging
 from typing import Dict, Any, Optional, List
 from pathlib import Path
 import time
-from datetime import datetime
 
-from fastapi import FastAPI, File, UploadFile, HTTPException, Form, BackgroundTasks, Query
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi import FastAPI, File, UploadFile, HTTPException, Form, Query, Request
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.concurrency import run_in_threadpool
 import uvicorn
 from pydantic import BaseModel
 
 from auto_wealth_translate.core.document_processor import DocumentProcessor
 from auto_wealth_translate.core.translator import TranslationService
-from auto_wealth_translate.core.document_rebuilder import DocumentRebuilder
+from auto_wealth_translate.core.translation_memory import TranslationMemory
+from auto_wealth_translate.core.document_rebuilder import DocumentRebuilder, DocumentOutput
 from auto_wealth_translate.core.validator import OutputValidator
+from auto_wealth_translate.core.job_queue import JobQueue, QueueFullError
+from auto_wealth_translate.core.job_store import JobStore, process_owner
+from auto_wealth_translate.core.artifact_cache import artifact_key
 from auto_wealth_translate.utils.logger import setup_logger, get_logger
 
 # Configure logging
@@ -63,7 +70,42 @@ SUPPORTED_LANGUAGES = {
 # Storage for translation jobs
 UPLOAD_DIR = Path(tempfile.gettempdir()) / "auto_wealth_translate_uploads"
 OUTPUT_DIR = Path(tempfile.gettempdir()) / "auto_wealth_translate_outputs"
-JOBS = {}  # Store job status
+JOB_DB_PATH = os.environ.get(
+    "AWT_JOB_DB", str(Path(tempfile.gettempdir()) / "auto_wealth_translate_jobs.sqlite")
+)
+job_store = JobStore(JOB_DB_PATH)  # Job records, shared by all API worker processes
+
+# Translation jobs run on worker threads; uploads are rejected once the queue is full
+MAX_CONCURRENT_JOBS = int(os.environ.get("AWT_MAX_CONCURRENT_JOBS", "2"))
+MAX_QUEUED_JOBS = int(os.environ.get("AWT_MAX_QUEUED_JOBS", "16"))
+job_queue = JobQueue(max_workers=MAX_CONCURRENT_JOBS, max_queued=MAX_QUEUED_JOBS)
+
+# Worker processes each job may use for OCR of scanned PDFs (1 runs OCR in the job's thread)
+OCR_WORKERS = int(os.environ.get("AWT_OCR_WORKERS", "1"))
+
+# Optional translation memory shared by all jobs; previously translated text is reused instead of calling the API
+TRANSLATION_MEMORY_PATH = os.environ.get("AWT_TRANSLATION_MEMORY")
+translation_memory = TranslationMemory(TRANSLATION_MEMORY_PATH) if TRANSLATION_MEMORY_PATH else None
+
+# Uploads are streamed to disk in chunks and rejected once they exceed the limit
+MAX_UPLOAD_BYTES = int(float(os.environ.get("AWT_MAX_UPLOAD_MB", "200")) * 1024 * 1024)
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Source language and rebuild mode used for API jobs; part of the key that deduplicates identical jobs
+API_SOURCE_LANG = "en"
+API_REBUILD_MODE = DocumentRebuilder.MODE_ENHANCED
+
+# Share of overall job progress covered by each pipeline stage
+STAGE_PROGRESS = {
+    "extract": (0.1, 0.2),
+    "translate": (0.2, 0.7),
+    "rebuild": (0.7, 0.9),
+}
+# Minimum seconds between stored progress updates within a stage
+PROGRESS_UPDATE_INTERVAL = 0.25
+# How often the event stream checks a job for changes, and sends a keep-alive when idle
+EVENT_POLL_INTERVAL = 0.5
+EVENT_KEEPALIVE_INTERVAL = 15.0
 
 # Create directories if they don't exist
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
@@ -86,6 +128,7 @@ class JobStatus(BaseModel):
     model: str
     output_file: Optional[str] = None
     validation_score: Optional[float] = None
+    progress_detail: Optional[Dict[str, Any]] = None
 
 @app.get("/", tags=["Info"])
 async def root():
@@ -97,6 +140,72 @@ async def root():
         "supported_languages": SUPPORTED_LANGUAGES,
     }
 
+@app.on_event("startup")
+def recover_abandoned_jobs():
+    """Fail jobs left queued or running by an API process that has exited."""
+    job_store.fail_abandoned()
+
+@app.on_event("shutdown")
+def shutdown_job_queue():
+    """Stop the translation workers."""
+    job_queue.shutdown(wait=False)
+
+def _queue_full_response(depth: int) -> HTTPException:
+    """Build the 429 response returned when the job queue is at capacity."""
+    return HTTPException(
+        status_code=429,
+        detail={
+            "message": "Too many translation jobs queued, please retry later",
+            "queue_depth": depth,
+            "max_queued_jobs": job_queue.max_queued,
+        },
+        headers={"Retry-After": "30"},
+    )
+
+def _upload_too_large_response() -> HTTPException:
+    """Build the 413 response returned when an upload exceeds the size limit."""
+    return HTTPException(
+        status_code=413,
+        detail=f"File exceeds the maximum upload size of {MAX_UPLOAD_BYTES // (1024 * 1024)} MB",
+    )
+
+async def _save_upload(file: UploadFile, path: Path) -> Dict[str, Any]:
+    """
+    Stream an upload to disk, hashing it on the way.
+    
+    Only one chunk is held in memory at a time. A partially written file is
+    removed if the upload is too large or the copy fails.
+    
+    Args:
+        file: Uploaded file
+        path: Destination path
+        
+    Returns:
+        Dictionary with the file size in bytes and its SHA-256 hex digest
+    """
+    # Starlette knows the size once the request body has been received
+    if file.size is not None and file.size > MAX_UPLOAD_BYTES:
+        raise _upload_too_large_response()
+    
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(path, "wb") as buffer:
+            while True:
+                chunk = await file.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > MAX_UPLOAD_BYTES:
+                    raise _upload_too_large_response()
+                digest.update(chunk)
+                await run_in_threadpool(buffer.write, chunk)
+    except BaseException:
+        path.unlink(missing_ok=True)
+        raise
+    
+    return {"size": size, "sha256": digest.hexdigest()}
+
 @app.get("/languages", tags=["Info"])
 async def get_languages():
     """Get supported languages."""
@@ -104,7 +213,6 @@ async def get_languages():
 
 @app.post("/translate", tags=["Translation"])
 async def translate_file(
-    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     target_lang: str = Form(...),
     model: str = Form("gpt-4"),
@@ -114,6 +222,10 @@ async def translate_file(
     
     This endpoint accepts a document file (PDF/DOCX) and translates it to the specified language.
     The translation is performed asynchronously, and a job ID is returned for tracking progress.
+    Uploading a document that was already translated (or is being translated) with the same
+    language and model returns the existing job instead of starting a new one. Otherwise, if the
+    job queue is full the request is rejected with HTTP 429 and the current queue depth. Files
+    larger than the upload limit are rejected with HTTP 413.
     
     - **file**: The document file (PDF/DOCX)
     - **target_lang**: Target language code
@@ -133,46 +245,70 @@ async def translate_file(
     # Generate job ID
     job_id = str(uuid.uuid4())
     
-    # Save uploaded file
+    # Save uploaded file; it is removed again on every path where no queued job takes it over
     input_path = UPLOAD_DIR / f"{job_id}{file_ext}"
+    upload = await _save_upload(file, input_path)
     
-    with open(input_path, "wb") as buffer:
-        buffer.write(await file.read())
-    
-    # Create output path
-    output_path = OUTPUT_DIR / f"{job_id}_{target_lang}{file_ext}"
-    
-    # Create job record
-    JOBS[job_id] = {
-        "job_id": job_id,
-        "status": "queued",
-        "progress": 0.0,
-        "created_at": datetime.now().isoformat(),
-        "updated_at": datetime.now().isoformat(),
-        "error": None,
-        "input_file": file.filename,
-        "target_lang": target_lang,
-        "model": model,
-        "output_file": None,
-        "validation_score": None,
-    }
-    
-    # Start processing in the background
-    background_tasks.add_task(
-        process_translation,
-        job_id,
-        str(input_path),
-        str(output_path),
-        target_lang,
-        model,
-    )
+    queued = False
+    try:
+        # Create output path
+        output_path = OUTPUT_DIR / f"{job_id}_{target_lang}{file_ext}"
+        
+        # Create job record, or reuse the job for an identical document translated with the same settings
+        translation_service = await run_in_threadpool(
+            TranslationService, source_lang=API_SOURCE_LANG, target_lang=target_lang, model=model,
+            translation_memory=translation_memory
+        )
+        dedup_key = artifact_key(upload["sha256"], API_SOURCE_LANG, target_lang, model, API_REBUILD_MODE,
+                                 translation_service.output_settings())
+        while True:
+            job, created = await run_in_threadpool(
+                job_store.create_or_attach,
+                job_id,
+                input_file=file.filename,
+                target_lang=target_lang,
+                model=model,
+                dedup_key=dedup_key,
+                content_sha256=upload["sha256"],
+                file_size=upload["size"],
+                owner=process_owner(),
+            )
+            if created or job["status"] != "completed" or (job["output_file"] and os.path.exists(job["output_file"])):
+                break
+            # The earlier output is gone, so stop reusing that job
+            await run_in_threadpool(job_store.update, job["job_id"], dedup_key=None)
+        
+        if not created:
+            logger.info(f"Upload of {file.filename} to {target_lang} matches job {job['job_id']} ({job['status']})")
+            return {"job_id": job["job_id"], "status": job["status"], "deduplicated": True}
+        
+        # Only new jobs need a queue slot
+        try:
+            queue_depth = job_queue.submit(
+                job_id,
+                process_translation,
+                job_id,
+                str(input_path),
+                str(output_path),
+                translation_service,
+            )
+        except QueueFullError as e:
+            # Fail rather than delete the job, in case an identical upload attached to it meanwhile
+            await run_in_threadpool(job_store.update, job_id, status="failed", error="Job queue was full",
+                                    dedup_key=None)
+            raise _queue_full_response(e.depth)
+        
+        queued = True
+    finally:
+        if not queued:
+            input_path.unlink(missing_ok=True)
     
-    logger.info(f"Translation job {job_id} queued for {file.filename} to {target_lang}")
+    logger.info(f"Translation job {job_id} queued for {file.filename} to {target_lang} (queue depth {queue_depth})")
     
-    return {"job_id": job_id, "status": "queued"}
+    return {"job_id": job_id, "status": "queued", "queue_depth": queue_depth, "deduplicated": False}
 
 @app.get("/jobs/{job_id}", tags=["Jobs"])
-async def get_job_status(job_id: str):
+def get_job_status(job_id: str):
     """
     Get the status of a translation job.
     
@@ -180,47 +316,102 @@ async def get_job_status(job_id: str):
     
     Returns the current status of the job, including progress information.
     """
-    if job_id not in JOBS:
+    job = job_store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    
+    return job
+
+@app.get("/jobs/{job_id}/events", tags=["Jobs"])
+async def stream_job_events(job_id: str, request: Request):
+    """
+    Stream the progress of a translation job as Server-Sent Events.
+    
+    - **job_id**: ID of the job to watch
+    
+    Sends a `progress` event with the job record whenever it changes; `progress_detail`
+    holds the latest pipeline event (pages extracted, segments translated out of the
+    total with tokens used, pages rebuilt). The stream ends with a `completed`, `failed`
+    or `deleted` event.
+    """
+    if await run_in_threadpool(job_store.get, job_id) is None:
         raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
     
-    return JOBS[job_id]
+    async def events():
+        last_update = None
+        idle = 0.0
+        while not await request.is_disconnected():
+            job = await run_in_threadpool(job_store.get, job_id)
+            if job is None:
+                yield f"event: deleted\ndata: {json.dumps({'job_id': job_id})}\n\n"
+                return
+            
+            if job["updated_at"] != last_update:
+                last_update = job["updated_at"]
+                idle = 0.0
+                finished = job["status"] in ("completed", "failed")
+                event = job["status"] if finished else "progress"
+                yield f"event: {event}\ndata: {json.dumps(job)}\n\n"
+                if finished:
+                    return
+            elif idle >= EVENT_KEEPALIVE_INTERVAL:
+                idle = 0.0
+                yield ": keep-alive\n\n"
+            
+            await asyncio.sleep(EVENT_POLL_INTERVAL)
+            idle += EVENT_POLL_INTERVAL
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 @app.get("/jobs", tags=["Jobs"])
-async def list_jobs(
+def list_jobs(
     limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
     offset: int = Query(0, ge=0),
     status: Optional[str] = Query(None),
 ):
     """
-    List translation jobs.
+    List translation jobs, newest first.
     
     - **limit**: Maximum number of jobs to return
-    - **offset**: Number of jobs to skip
+    - **cursor**: Cursor from the previous page's `next_cursor`
+    - **offset**: Number of jobs to skip (prefer `cursor` for deep pages)
     - **status**: Filter by job status
     
-    Returns a list of jobs matching the criteria.
+    Returns a page of jobs matching the criteria and the cursor for the next page.
     """
-    jobs = list(JOBS.values())
-    
-    # Apply filters
-    if status:
-        jobs = [job for job in jobs if job["status"] == status]
-    
-    # Sort by creation time (newest first)
-    jobs.sort(key=lambda j: j["created_at"], reverse=True)
-    
-    # Apply pagination
-    paginated_jobs = jobs[offset:offset+limit]
+    try:
+        jobs, next_cursor = job_store.list(limit=limit, status=status, cursor=cursor, offset=offset)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     return {
-        "total": len(jobs),
         "limit": limit,
         "offset": offset,
-        "jobs": paginated_jobs,
+        "next_cursor": next_cursor,
+        "jobs": jobs,
+    }
+
+@app.get("/queue", tags=["Jobs"])
+async def get_queue_status():
+    """
+    Get the state of the translation job queue.
+    
+    Returns the number of queued and running jobs and the configured limits.
+    """
+    return {
+        "queue_depth": job_queue.depth,
+        "running": job_queue.running,
+        "max_queued_jobs": job_queue.max_queued,
+        "max_concurrent_jobs": job_queue.max_workers,
     }
 
 @app.get("/download/{job_id}", tags=["Downloads"])
-async def download_translated_file(job_id: str):
+def download_translated_file(job_id: str):
     """
     Download a translated document.
     
@@ -228,25 +419,26 @@ async def download_translated_file(job_id: str):
     
     Returns the translated document file.
     """
-    if job_id not in JOBS:
+    job = job_store.get(job_id)
+    if job is None:
         raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
     
-    job = JOBS[job_id]
-    
     if job["status"] != "completed":
         raise HTTPException(status_code=400, detail=f"Job {job_id} is not completed")
     
     if not job["output_file"] or not os.path.exists(job["output_file"]):
         raise HTTPException(status_code=404, detail=f"Output file for job {job_id} not found")
     
+    # FileResponse streams the saved document from disk in chunks
+    output_file = Path(job["output_file"])
     return FileResponse(
-        job["output_file"],
-        filename=Path(job["output_file"]).name,
-        media_type="application/octet-stream",
+        output_file,
+        filename=output_file.name,
+        media_type=DocumentOutput.media_type_for(output_file.suffix),
     )
 
 @app.delete("/jobs/{job_id}", tags=["Jobs"])
-async def delete_job(job_id: str):
+def delete_job(job_id: str):
     """
     Delete a translation job and its files.
     
@@ -254,11 +446,10 @@ async def delete_job(job_id: str):
     
     Returns a confirmation of deletion.
     """
-    if job_id not in JOBS:
+    job = job_store.get(job_id)
+    if job is None:
         raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
     
-    job = JOBS[job_id]
-    
     # Delete input file
     input_path = Path(UPLOAD_DIR) / f"{job_id}{Path(job['input_file']).suffix}"
     if input_path.exists():
@@ -269,73 +460,94 @@ async def delete_job(job_id: str):
         Path(job["output_file"]).unlink()
     
     # Remove job from registry
-    del JOBS[job_id]
+    job_store.delete(job_id)
     
     return {"message": f"Job {job_id} deleted"}
 
-async def process_translation(
+def _progress_reporter(job_id: str):
+    """
+    Build a progress callback that records pipeline events on a job.
+    
+    Updates within a stage are throttled to ``PROGRESS_UPDATE_INTERVAL``; the
+    first and last event of each stage are always stored.
+    
+    Args:
+        job_id: Job ID
+        
+    Returns:
+        Progress callback (see ``utils.progress``)
+    """
+    last_stage = None
+    last_update = 0.0
+    
+    def report(event: Dict[str, Any]) -> None:
+        nonlocal last_stage, last_update
+        now = time.monotonic()
+        stage_done = event["completed"] >= event["total"]
+        if event["stage"] == last_stage and not stage_done and now - last_update < PROGRESS_UPDATE_INTERVAL:
+            return
+        last_stage = event["stage"]
+        last_update = now
+        
+        start, end = STAGE_PROGRESS.get(event["stage"], (0.0, 0.0))
+        fraction = min(1.0, event["completed"] / event["total"]) if event["total"] else 1.0
+        job_store.update(job_id, progress=round(start + (end - start) * fraction, 3), progress_detail=event)
+    
+    return report
+
+def process_translation(
     job_id: str,
     input_path: str,
     output_path: str,
-    target_lang: str,
-    model: str,
+    translation_service: TranslationService,
 ):
     """
     Process a translation job.
     
-    This function is run in the background to perform the actual translation.
+    This function runs on a job queue worker thread to perform the actual translation.
+    The finished job is only reused for identical uploads if every segment was
+    translated and the output passed validation.
     
     Args:
         job_id: Job ID
         input_path: Path to input file
         output_path: Path to output file
-        target_lang: Target language code
-        model: Translation model to use
+        translation_service: Translation service configured for the job
     """
+    # Update job status
+    if not job_store.update(job_id, status="processing", progress=0.1):
+        logger.info(f"Skipping translation job {job_id}: deleted while queued")
+        return
+    
     try:
         logger.info(f"Starting translation job {job_id}")
         
-        # Update job status
-        JOBS[job_id]["status"] = "processing"
-        JOBS[job_id]["updated_at"] = datetime.now().isoformat()
-        
-        # Initialize core components
-        JOBS[job_id]["progress"] = 0.1
-        JOBS[job_id]["updated_at"] = datetime.now().isoformat()
-        
-        doc_processor = DocumentProcessor(input_path)
-        translation_service = TranslationService(target_lang=target_lang, model=model)
-        doc_rebuilder = DocumentRebuilder()
+        # Initialize core components, reporting fine-grained progress on the job
+        report_progress = _progress_reporter(job_id)
+        doc_processor = DocumentProcessor(input_path, ocr_workers=OCR_WORKERS, progress_callback=report_progress)
+        translation_service.progress_callback = report_progress
+        doc_rebuilder = DocumentRebuilder(progress_callback=report_progress)
         validator = OutputValidator()
         
         # Process document
         logger.info(f"Job {job_id}: Extracting document components")
-        JOBS[job_id]["progress"] = 0.2
-        JOBS[job_id]["updated_at"] = datetime.now().isoformat()
-        
         doc_components = doc_processor.process()
         
         # Translate components
         logger.info(f"Job {job_id}: Translating document components")
-        JOBS[job_id]["progress"] = 0.4
-        JOBS[job_id]["updated_at"] = datetime.now().isoformat()
-        
         translated_components = translation_service.translate(doc_components)
         
         # Rebuild document
         logger.info(f"Job {job_id}: Rebuilding document with translated content")
-        JOBS[job_id]["progress"] = 0.7
-        JOBS[job_id]["updated_at"] = datetime.now().isoformat()
-        
         rebuilt_doc = doc_rebuilder.rebuild(
             translated_components, 
-            output_format=Path(input_path).suffix[1:]
+            output_format=Path(input_path).suffix[1:],
+            rebuild_mode=API_REBUILD_MODE
         )
         
         # Validate output
         logger.info(f"Job {job_id}: Validating translation")
-        JOBS[job_id]["progress"] = 0.9
-        JOBS[job_id]["updated_at"] = datetime.now().isoformat()
+        job_store.update(job_id, progress=0.9)
         
         validation_result = validator.validate(doc_components, rebuilt_doc)
         
@@ -343,12 +555,18 @@ async def process_translation(
         logger.info(f"Job {job_id}: Saving output to {output_path}")
         rebuilt_doc.save(output_path)
         
-        # Update job status
-        JOBS[job_id]["status"] = "completed"
-        JOBS[job_id]["progress"] = 1.0
-        JOBS[job_id]["updated_at"] = datetime.now().isoformat()
-        JOBS[job_id]["output_file"] = output_path
-        JOBS[job_id]["validation_score"] = validation_result["score"]
+        # Update job status; only a successful translation may be reused for identical uploads
+        completed = {
+            "status": "completed",
+            "progress": 1.0,
+            "output_file": output_path,
+            "validation_score": validation_result["score"],
+        }
+        if not (validation_result["success"] and translation_service.translation_succeeded()):
+            logger.warning(f"Job {job_id}: {translation_service.untranslated_segments} segments were not translated, "
+                           f"validation issues: {validation_result['issues']}; not reusing the output")
+            completed["dedup_key"] = None
+        job_store.update(job_id, **completed)
         
         logger.info(f"Job {job_id} completed successfully. Validation score: {validation_result['score']:.2f}/10")
         
@@ -356,9 +574,7 @@ async def process_translation(
         logger.error(f"Error processing job {job_id}: {str(e)}", exc_info=True)
         
         # Update job status
-        JOBS[job_id]["status"] = "failed"
-        JOBS[job_id]["updated_at"] = datetime.now().isoformat()
-        JOBS[job_id]["error"] = str(e)
+        job_store.update(job_id, status="failed", error=str(e))
 
 def start():
     """Start the API server."""
@@ -8,6 +8,7 @@ Command-line interface for the AutoWealthTranslate application.
 import argparse
 import logging
 import os
+import shutil
 import sys
 from pathlib import Path
 from typing import List, Optional
@@ -15,8 +16,10 @@ import time
 
 from auto_wealth_translate.core.document_processor import DocumentProcessor
 from auto_wealth_translate.core.translator import TranslationService
+from auto_wealth_translate.core.translation_memory import TranslationMemory
 from auto_wealth_translate.core.document_rebuilder import DocumentRebuilder
 from auto_wealth_translate.core.validator import OutputValidator
+from auto_wealth_translate.core.artifact_cache import ArtifactCache, artifact_key, file_sha256
 from auto_wealth_translate.utils.logger import setup_logger, get_logger
 
 # Supported languages
@@ -82,6 +85,37 @@ def parse_args():
         help="Path to log file. If not specified, logs to console only."
     )
     
+    parser.add_argument(
+        "--translation-memory",
+        help="Path to a translation memory database. Previously translated text is reused instead of calling the API."
+    )
+    
+    parser.add_argument(
+        "--mode",
+        default=DocumentRebuilder.MODE_ENHANCED,
+        choices=[
+            DocumentRebuilder.MODE_ENHANCED,
+            DocumentRebuilder.MODE_PRECISE,
+            DocumentRebuilder.MODE_BILINGUAL,
+            DocumentRebuilder.MODE_BILINGUAL_MARKDOWN,
+            DocumentRebuilder.MODE_VECTOR,
+        ],
+        help="Rebuild mode for PDF output (default: enhanced)"
+    )
+    
+    parser.add_argument(
+        "--cache-dir",
+        help="Directory of previously translated documents. A file already translated with the same "
+             "language, model and mode is copied from the cache instead of being translated again."
+    )
+    
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes for PDF page extraction (including OCR) and rebuilding (default: 1, serial)"
+    )
+    
     parser.add_argument(
         "--max-files",
         type=int,
@@ -122,7 +156,10 @@ def validate_input(input_path: str, is_batch: bool) -> bool:
     
     return True
 
-def process_file(input_path: str, output_path: Optional[str], target_lang: str, model: str) -> bool:
+def process_file(input_path: str, output_path: Optional[str], target_lang: str, model: str,
+                 translation_memory: Optional[TranslationMemory] = None, workers: int = 1,
+                 rebuild_mode: str = DocumentRebuilder.MODE_ENHANCED,
+                 artifact_cache: Optional[ArtifactCache] = None) -> bool:
     """
     Process a single file.
     
@@ -131,6 +168,10 @@ def process_file(input_path: str, output_path: Optional[str], target_lang: str,
         output_path: Path to output file
         target_lang: Target language code
         model: Translation model to use
+        translation_memory: Optional translation memory shared between files
+        workers: Number of worker processes for PDF page extraction (including OCR) and rebuilding
+        rebuild_mode: Document rebuild mode
+        artifact_cache: Optional cache of translated documents shared between files
         
     Returns:
         True if successful, False otherwise
@@ -150,15 +191,36 @@ def process_file(input_path: str, output_path: Optional[str], target_lang: str,
         
         start_time = time.time()
         
+        logger.debug("Initializing translation service")
+        translation_service = TranslationService(
+            target_lang=target_lang,
+            model=model,
+            translation_memory=translation_memory
+        )
+        
+        # Reuse an earlier translation of the same document
+        cache_key = None
+        if artifact_cache is not None:
+            cache_key = artifact_key(
+                file_sha256(input_path),
+                translation_service.source_lang,
+                target_lang,
+                model,
+                rebuild_mode,
+                translation_service.output_settings()
+            )
+            cached_path = artifact_cache.get(cache_key, input_path.suffix)
+            if cached_path is not None:
+                shutil.copyfile(cached_path, output_path)
+                logger.info(f"Copied cached translation to {output_path}")
+                return True
+        
         # Initialize core components
         logger.debug("Initializing document processor")
-        doc_processor = DocumentProcessor(str(input_path))
-        
-        logger.debug("Initializing translation service")
-        translation_service = TranslationService(target_lang=target_lang, model=model)
+        doc_processor = DocumentProcessor(str(input_path), max_workers=workers, ocr_workers=workers)
         
         logger.debug("Initializing document rebuilder")
-        doc_rebuilder = DocumentRebuilder()
+        doc_rebuilder = DocumentRebuilder(max_workers=workers)
         
         logger.debug("Initializing validator")
         validator = OutputValidator()
@@ -167,13 +229,30 @@ def process_file(input_path: str, output_path: Optional[str], target_lang: str,
         logger.info("Extracting document components")
         doc_components = doc_processor.process()
         
-        # Translate components
-        logger.info("Translating document components")
-        translated_components = translation_service.translate(doc_components)
-        
-        # Rebuild document
-        logger.info("Rebuilding document with translated content")
-        rebuilt_doc = doc_rebuilder.rebuild(translated_components, output_format=input_path.suffix[1:])
+        is_pdf = input_path.suffix.lower() == '.pdf'
+        if rebuild_mode == DocumentRebuilder.MODE_BILINGUAL_MARKDOWN and is_pdf:
+            # Bilingual markdown mode translates each page itself
+            logger.info("Translating and rebuilding document via markdown")
+            rebuilt_doc = doc_rebuilder.rebuild(
+                doc_components,
+                output_format=input_path.suffix[1:],
+                rebuild_mode=rebuild_mode,
+                source_pdf_path=str(input_path),
+                translation_service=translation_service
+            )
+        else:
+            # Translate components
+            logger.info("Translating document components")
+            translated_components = translation_service.translate(doc_components)
+            
+            # Rebuild document
+            logger.info("Rebuilding document with translated content")
+            rebuilt_doc = doc_rebuilder.rebuild(
+                translated_components,
+                output_format=input_path.suffix[1:],
+                rebuild_mode=rebuild_mode,
+                source_pdf_path=str(input_path) if is_pdf else None
+            )
         
         # Validate output
         logger.info("Validating translation")
@@ -184,6 +263,14 @@ def process_file(input_path: str, output_path: Optional[str], target_lang: str,
         # Save output
         logger.info(f"Saving output to {output_path}")
         rebuilt_doc.save(output_path)
+        if cache_key is not None:
+            # Never serve a failed or partial translation to later runs
+            if validation_result['success'] and translation_service.translation_succeeded():
+                artifact_cache.put(cache_key, output_path)
+            else:
+                logger.warning(f"Not caching {output_path}: "
+                               f"{translation_service.untranslated_segments} segments were not translated, "
+                               f"validation {'passed' if validation_result['success'] else 'failed'}")
         
         elapsed_time = time.time() - start_time
         logger.info(f"Successfully translated to {output_path} in {elapsed_time:.1f} seconds")
@@ -195,7 +282,10 @@ def process_file(input_path: str, output_path: Optional[str], target_lang: str,
         logger.error(f"Error processing file {input_path}: {str(e)}", exc_info=True)
         return False
 
-def process_batch(input_dir: str, target_lang: str, model: str, max_files: int) -> List[str]:
+def process_batch(input_dir: str, target_lang: str, model: str, max_files: int,
+                  translation_memory: Optional[TranslationMemory] = None, workers: int = 1,
+                  rebuild_mode: str = DocumentRebuilder.MODE_ENHANCED,
+                  artifact_cache: Optional[ArtifactCache] = None) -> List[str]:
     """
     Process a batch of files in a directory.
     
@@ -204,6 +294,10 @@ def process_batch(input_dir: str, target_lang: str, model: str, max_files: int)
         target_lang: Target language code
         model: Translation model to use
         max_files: Maximum number of files to process
+        translation_memory: Optional translation memory shared between files
+        workers: Number of worker processes for PDF page extraction (including OCR) and rebuilding
+        rebuild_mode: Document rebuild mode
+        artifact_cache: Optional cache of translated documents shared between files
         
     Returns:
         List of successfully processed file paths
@@ -225,7 +319,8 @@ def process_batch(input_dir: str, target_lang: str, model: str, max_files: int)
         logger.info(f"Processing file {i+1}/{len(files)}: {file_path}")
         output_path = str(input_dir / f"{file_path.stem}_{target_lang}{file_path.suffix}")
         
-        if process_file(str(file_path), output_path, target_lang, model):
+        if process_file(str(file_path), output_path, target_lang, model, translation_memory, workers,
+                        rebuild_mode, artifact_cache):
             successful_files.append(str(file_path))
         else:
             logger.error(f"Failed to process {file_path}")
@@ -248,11 +343,20 @@ def main():
     if not validate_input(args.input, args.batch):
         sys.exit(1)
     
+    # Open the translation memory if requested
+    translation_memory = None
+    if args.translation_memory:
+        translation_memory = TranslationMemory(args.translation_memory)
+    
+    # Open the artifact cache if requested
+    artifact_cache = ArtifactCache(args.cache_dir) if args.cache_dir else None
+    
     # Process files
     try:
         if args.batch:
             logger.info(f"Processing batch from directory: {args.input}")
-            successful_files = process_batch(args.input, args.lang, args.model, args.max_files)
+            successful_files = process_batch(args.input, args.lang, args.model, args.max_files,
+                                             translation_memory, args.workers, args.mode, artifact_cache)
             total_files = len([p for p in Path(args.input).iterdir() 
                               if p.suffix.lower() in ('.pdf', '.docx')])
             
@@ -262,7 +366,9 @@ def main():
                 logger.warning("Some files failed to process. Check the log for details.")
                 sys.exit(1)
         else:
-            if not process_file(args.input, args.output, args.lang, args.model):
+            if not process_file(args.input, args.output, args.lang, args.model,
+                                translation_memory=translation_memory, workers=args.workers,
+                                rebuild_mode=args.mode, artifact_cache=artifact_cache):
                 logger.error("Failed to process file. Check the log for details.")
                 sys.exit(1)
         
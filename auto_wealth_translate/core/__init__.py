@@ -4,6 +4,8 @@ Core components for the AutoWealthTranslate application.
 
 from .document_processor import DocumentProcessor
 from .translator import TranslationService
+from .translation_memory import TranslationMemory
+from .llm_clients import configure_client_pool, close_clients
 from .document_rebuilder import DocumentRebuilder, DocumentOutput
 from .validator import OutputValidator
 from .chart_processor import detect_chart, process_chart
@@ -0,0 +1,121 @@
+"""
+Artifact cache module for AutoWealthTranslate.
+
+Translated documents are keyed by the SHA-256 of the input file together with
+the languages, model, translator settings and rebuild mode, so that translating
+the same document again with the same settings reuses the earlier output instead
+of re-running the extract/translate/rebuild pipeline. Only outputs of successful
+translations should be stored.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from auto_wealth_translate.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+def file_sha256(path: Union[str, Path], chunk_size: int = 1024 * 1024) -> str:
+    """
+    Hash a file without loading it into memory.
+
+    Args:
+        path: Path to the file
+        chunk_size: Number of bytes read at a time
+
+    Returns:
+        SHA-256 hex digest of the file contents
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def artifact_key(content_sha256: str, source_lang: str, target_lang: str, model: str, rebuild_mode: str,
+                 translator_settings: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Build the deduplication key for a translation output.
+
+    Args:
+        content_sha256: SHA-256 hex digest of the input file
+        source_lang: Source language code
+        target_lang: Target language code
+        model: Translation model
+        rebuild_mode: Document rebuild mode
+        translator_settings: Other settings that shape the output (see
+            ``TranslationService.output_settings``)
+
+    Returns:
+        Hex digest identifying the output
+    """
+    payload = json.dumps(
+        [content_sha256, source_lang or "", target_lang or "", model or "", rebuild_mode or "",
+         translator_settings or {}],
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class ArtifactCache:
+    """
+    Directory of translated documents addressed by ``artifact_key``.
+    """
+
+    def __init__(self, cache_dir: Union[str, Path]):
+        """
+        Initialize the artifact cache.
+
+        Args:
+            cache_dir: Directory holding cached outputs (created if missing)
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str, suffix: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}{suffix}"
+
+    def get(self, key: str, suffix: str) -> Optional[Path]:
+        """
+        Look up a cached output.
+
+        Args:
+            key: Artifact key
+            suffix: File extension of the output (e.g. '.pdf')
+
+        Returns:
+            Path to the cached file, or None on a miss
+        """
+        path = self._path(key, suffix)
+        return path if path.is_file() else None
+
+    def put(self, key: str, source_path: Union[str, Path]) -> Path:
+        """
+        Store a copy of an output file.
+
+        The copy is written to a temporary file and renamed into place, so
+        concurrent readers never see a partial artifact.
+
+        Args:
+            key: Artifact key
+            source_path: Output file to store
+
+        Returns:
+            Path to the cached file
+        """
+        path = self._path(key, Path(source_path).suffix)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as tmp, open(source_path, "rb") as source:
+                shutil.copyfileobj(source, tmp)
+            os.replace(tmp_path, path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+        logger.debug(f"Cached artifact {key} at {path}")
+        return path
@@ -6,22 +6,29 @@ extracting text, tables, charts, and formatting information.
 """
 
 import os
+import math
 import fitz  # PyMuPDF
 import docx
 import pdfplumber
 import pytesseract
-import cv2
 import numpy as np
-from typing import List, Dict, Any, Tuple, Optional, Union
+from typing import List, Dict, Any, Iterator, Tuple, Optional, Union
 from pathlib import Path
 import logging
 import re
+from collections import deque
 from dataclasses import dataclass, field
+from concurrent.futures import ProcessPoolExecutor
 
 from auto_wealth_translate.utils.logger import get_logger
+from auto_wealth_translate.utils.progress import ProgressCallback, report_progress
 
 logger = get_logger(__name__)
 
+def _init_ocr_worker():
+    """Limit Tesseract to one thread per worker process to avoid oversubscribing CPUs."""
+    os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+
 @dataclass
 class DocumentComponent:
     """Base class for document components."""
@@ -37,12 +44,14 @@ class TextComponent(DocumentComponent):
     position: Dict[str, float] = field(default_factory=dict)
     is_header: bool = False
     is_footer: bool = False
+    metadata: Dict[str, Any] = field(default_factory=dict)
     
 @dataclass
 class TableComponent(DocumentComponent):
     """Table component from a document."""
     rows: List[List[str]]
     position: Dict[str, float] = field(default_factory=dict)
+    metadata: Dict[str, Any] = field(default_factory=dict)
     
 @dataclass
 class ImageComponent(DocumentComponent):
@@ -51,6 +60,7 @@ class ImageComponent(DocumentComponent):
     image_format: str
     size: Tuple[int, int]
     position: Dict[str, float] = field(default_factory=dict)
+    metadata: Dict[str, Any] = field(default_factory=dict)
     
 @dataclass
 class ChartComponent(DocumentComponent):
@@ -59,20 +69,61 @@ class ChartComponent(DocumentComponent):
     image_data: Optional[bytes] = None
     chart_type: str = "unknown"
     position: Dict[str, float] = field(default_factory=dict)
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+def assign_component_ids(components: List[DocumentComponent], start: int = 0) -> None:
+    """
+    Number components sequentially in document order (e.g. text_0, table_1, image_2).
+    
+    Args:
+        components: Components to number, in document order
+        start: Index given to the first component
+    """
+    for index, component in enumerate(components, start):
+        component.component_id = f"{component.component_type}_{index}"
 
 class DocumentProcessor:
     """
     Process PDF and DOCX documents, extracting components.
     """
     
-    def __init__(self, input_file: str):
+    # A page needs OCR when images cover at least this share of it...
+    OCR_MIN_IMAGE_COVERAGE = 0.5
+    # ...and its text layer covers less than this share
+    OCR_MAX_TEXT_COVERAGE = 0.05
+    
+    # Granularity of OCR text components
+    OCR_PAGE = "page"
+    OCR_LINE = "line"
+    OCR_WORD = "word"
+    
+    def __init__(self, input_file: str, max_workers: int = 1, ocr_dpi: int = 300,
+                 ocr_workers: int = 1, ocr_granularity: str = OCR_PAGE,
+                 progress_callback: Optional[ProgressCallback] = None):
         """
         Initialize the document processor.
         
         Args:
             input_file: Path to the input document file (PDF or DOCX)
+            max_workers: Number of worker processes for extracting PDF text pages
+                (1 extracts pages serially in this process)
+            ocr_dpi: Resolution at which scanned pages are rendered for OCR
+            ocr_workers: Number of scanned PDF pages OCRed in parallel
+                (1 OCRs one page at a time)
+            ocr_granularity: 'page' for one text component per page, or 'line' /
+                'word' for components with OCR bounding boxes
+            progress_callback: Optional callback receiving an 'extract' event
+                (see ``utils.progress``) as each PDF page is extracted
         """
+        if ocr_granularity not in (self.OCR_PAGE, self.OCR_LINE, self.OCR_WORD):
+            raise ValueError(f"Unsupported OCR granularity: {ocr_granularity}")
+        
         self.input_file = input_file
+        self.max_workers = max(1, max_workers or 1)
+        self.ocr_dpi = ocr_dpi
+        self.ocr_workers = max(1, ocr_workers or 1)
+        self.ocr_granularity = ocr_granularity
+        self.progress_callback = progress_callback
         self.file_ext = os.path.splitext(input_file)[1].lower()
         
         if self.file_ext not in ['.pdf', '.docx']:
@@ -81,6 +132,12 @@ class DocumentProcessor:
         self.doc = None
         self.components = []
         logger.info(f"Initialized document processor for {input_file}")
+    
+    def __getstate__(self):
+        # Worker processes get a copy of the processor; callbacks stay in this process
+        state = self.__dict__.copy()
+        state["progress_callback"] = None
+        return state
         
     def process(self) -> List[Union[TextComponent, TableComponent, ImageComponent, ChartComponent]]:
         """
@@ -89,235 +146,389 @@ class DocumentProcessor:
         Returns:
             List of document components (text, tables, images, charts)
         """
+        return list(self.iter_components())
+    
+    def iter_components(self) -> Iterator[DocumentComponent]:
+        """
+        Extract components lazily, in document order.
+        
+        Yields the same components (with the same IDs) as ``process()``, but
+        page by page, so consumers can start on early pages while later ones
+        are still being parsed.
+        
+        Yields:
+            Document components
+        """
+        for _, page_components in self.iter_pages():
+            yield from page_components
+    
+    def iter_pages(self) -> Iterator[Tuple[int, List[DocumentComponent]]]:
+        """
+        Extract components page by page.
+        
+        DOCX documents have no page mapping and are yielded as a single page 0.
+        
+        Yields:
+            Tuples of (page number, components on that page)
+        """
         logger.info(f"Processing document: {self.input_file}")
         
         if self.file_ext == '.pdf':
-            return self._process_pdf()
-        elif self.file_ext == '.docx':
-            return self._process_docx()
+            pages = self._iter_pdf_pages()
+        else:
+            pages = iter([(0, self._process_docx())])
+        
+        next_id = 0
+        for page_number, page_components in pages:
+            assign_component_ids(page_components, start=next_id)
+            next_id += len(page_components)
+            yield page_number, page_components
             
-    def _process_pdf(self) -> List[Union[TextComponent, TableComponent, ImageComponent, ChartComponent]]:
+    def _iter_pdf_pages(self) -> Iterator[Tuple[int, List[DocumentComponent]]]:
         """
-        Process a PDF document.
+        Extract a PDF document page by page.
         
-        Returns:
-            List of document components
+        Pages are extracted serially, or fanned out across a process pool when
+        ``max_workers`` is greater than 1. Either way pages are yielded in order.
+        
+        Yields:
+            Tuples of (page number, components on that page)
         """
         logger.info("Processing PDF document")
-        components = []
-        component_id = 0
         
         # Use PyMuPDF for text and images
         doc = fitz.open(self.input_file)
+        page_count = len(doc)
         
-        # Use pdfplumber for tables
-        plumber_pdf = pdfplumber.open(self.input_file)
+        # First, decide for each page whether it is scanned and needs OCR
+        page_modes = {page_idx: self._classify_page(doc[page_idx]) for page_idx in range(page_count)}
+        doc.close()
+        
+        ocr_page_count = sum(1 for mode in page_modes.values() if mode["ocr"])
+        if ocr_page_count:
+            logger.info(f"OCR needed on {ocr_page_count}/{page_count} pages")
+        
+        # OCR is CPU-bound per page, so scanned pages get their own worker budget
+        workers = max(self.max_workers, self.ocr_workers if ocr_page_count else 1)
+        if workers > 1 and page_count > 1:
+            pages = self._iter_pages_parallel(page_count, page_modes, workers)
+        else:
+            pages = self._iter_page_range(range(page_count), page_modes)
+        
+        component_count = 0
+        for page_idx, page_components in pages:
+            component_count += len(page_components)
+            report_progress(self.progress_callback, "extract", page_idx + 1, page_count)
+            yield page_idx + 1, page_components
+        
+        logger.info(f"Extracted {component_count} components from PDF")
+    
+    def _iter_pages_parallel(self, page_count: int, page_modes: Dict[int, Dict[str, Any]],
+                             workers: int) -> Iterator[Tuple[int, List[DocumentComponent]]]:
+        """
+        Extract pages across a process pool.
         
-        # First, check if the PDF is scanned (mostly images) and needs OCR
-        needs_ocr = self._check_if_needs_ocr(doc)
+        Pages are split into contiguous ranges; each worker opens its own
+        PyMuPDF and pdfplumber handles. Pages that need OCR are handed out one
+        at a time and at most ``ocr_workers`` of them run at once, while text
+        pages are limited by ``max_workers``. Results are yielded in page order.
+        If the pool cannot be started or a worker fails (e.g. it crashes or a
+        task cannot be pickled), the remaining pages are extracted serially in
+        this process.
         
-        for page_idx in range(len(doc)):
-            page = doc[page_idx]
-            plumber_page = plumber_pdf.pages[page_idx]
+        Args:
+            page_count: Number of pages in the document
+            page_modes: Per-page extraction decisions (see ``_classify_page``)
+            workers: Number of worker processes
             
-            # Process text using appropriate method
-            if needs_ocr:
-                logger.info(f"Using OCR for page {page_idx+1} text extraction")
-                text_components = self._extract_text_with_ocr(page, page_idx, component_id)
-                components.extend(text_components)
-                component_id += len(text_components)
-            else:
-                # Try multiple text extraction methods for better coverage
-                text_blocks = page.get_text("blocks")
-                if not text_blocks:
-                    # If blocks method returns no text, try other methods
-                    logger.info(f"No text blocks found on page {page_idx+1}, trying alternate extraction")
-                    raw_text = page.get_text("text")
-                    if raw_text.strip():
-                        # Create a single text component with the entire page text
-                        component = TextComponent(
-                            component_id=f"text_{component_id}",
-                            component_type="text",
-                            page_number=page_idx + 1,
-                            text=raw_text,
-                            font_info={"size": 11},  # Default font size
-                            position={
-                                "x0": 50,
-                                "y0": 50,
-                                "x1": page.rect.width - 50,
-                                "y1": page.rect.height - 50
-                            }
-                        )
-                        components.append(component)
-                        component_id += 1
-                else:
-                    # Process text blocks
-                    for block in text_blocks:
-                        # Skip image blocks
-                        if block[6] == 1:  # Image block type
-                            continue
-                            
-                        # Create text component
-                        text = block[4]
-                        if text.strip():
-                            # Check if header or footer based on position
-                            is_header = block[1] < 100  # Example threshold for header
-                            is_footer = block[3] > page.rect.height - 100  # Example threshold for footer
-                            
-                            component = TextComponent(
-                                component_id=f"text_{component_id}",
-                                component_type="text",
-                                page_number=page_idx + 1,
-                                text=text,
-                                font_info={"size": block[5]},
-                                position={
-                                    "x0": block[0],
-                                    "y0": block[1],
-                                    "x1": block[2],
-                                    "y1": block[3]
-                                },
-                                is_header=is_header,
-                                is_footer=is_footer
-                            )
-                            components.append(component)
-                            component_id += 1
+        Yields:
+            Tuples of (page index, components on that page)
+        """
+        workers = min(workers, page_count)
+        needs_ocr = any(mode["ocr"] for mode in page_modes.values())
+        # A few text ranges per worker keeps the pool busy when page costs are uneven
+        text_chunk_size = max(1, math.ceil(page_count / (self.max_workers * 4)))
+        page_ranges = []
+        start = 0
+        while start < page_count:
+            ocr = page_modes[start]["ocr"]
+            end = start + 1
+            if not ocr:
+                # OCR cost dwarfs opening the document, so only text pages are grouped
+                while end < min(start + text_chunk_size, page_count) and not page_modes[end]["ocr"]:
+                    end += 1
+            page_ranges.append((range(start, end), ocr))
+            start = end
+        limits = {True: self.ocr_workers, False: self.max_workers}
+        
+        logger.info(f"Extracting {page_count} pages with {workers} worker processes")
+        try:
+            executor = ProcessPoolExecutor(max_workers=workers,
+                                           initializer=_init_ocr_worker if needs_ocr else None)
+        except Exception as e:
+            logger.error(f"Parallel PDF extraction unavailable, falling back to serial extraction: {str(e)}")
+            yield from self._iter_page_range(range(page_count), page_modes)
+            return
+        
+        remaining_ranges = []
+        with executor:
+            pending = deque()
+            in_flight = {True: 0, False: 0}
+            next_range = 0
+            while pending or next_range < len(page_ranges):
+                while next_range < len(page_ranges) and len(pending) < workers * 2:
+                    page_range, ocr = page_ranges[next_range]
+                    if pending and in_flight[ocr] >= limits[ocr]:
+                        break
+                    range_modes = {page_idx: page_modes[page_idx] for page_idx in page_range}
+                    future = executor.submit(self._extract_page_range, page_range, range_modes)
+                    pending.append((page_range, ocr, future))
+                    in_flight[ocr] += 1
+                    next_range += 1
+                page_range, ocr, future = pending.popleft()
+                in_flight[ocr] -= 1
+                try:
+                    results = future.result()
+                except Exception as e:
+                    logger.error(f"Parallel PDF extraction failed at page {page_range.start + 1}, "
+                                 f"extracting the remaining pages serially: {str(e)}")
+                    remaining_ranges = [page_range, *(queued for queued, _, _ in pending),
+                                        *(queued for queued, _ in page_ranges[next_range:])]
+                    # Drop queued work before leaving the pool (cancel_futures needs Python 3.9)
+                    for _, _, queued_future in pending:
+                        queued_future.cancel()
+                    executor.shutdown(wait=False)
+                    break
+                yield from results
+        
+        for page_range in remaining_ranges:
+            yield from self._iter_page_range(page_range, page_modes)
+    
+    def _extract_page_range(self, page_indices,
+                            page_modes: Dict[int, Dict[str, Any]]) -> List[Tuple[int, List[DocumentComponent]]]:
+        """
+        Extract components from a range of pages (used by worker processes).
+        
+        Args:
+            page_indices: Zero-based indices of the pages to extract
+            page_modes: Per-page extraction decisions (see ``_classify_page``)
             
-            # Extract tables
-            tables = plumber_page.find_tables()
-            for table in tables:
-                rows = []
-                for row in table.extract():
-                    rows.append([str(cell) if cell is not None else "" for cell in row])
-                
-                component = TableComponent(
-                    component_id=f"table_{component_id}",
-                    component_type="table",
-                    page_number=page_idx + 1,
-                    rows=rows,
-                    position={
-                        "x0": table.bbox[0],
-                        "y0": table.bbox[1],
-                        "x1": table.bbox[2],
-                        "y1": table.bbox[3]
-                    }
-                )
-                components.append(component)
-                component_id += 1
+        Returns:
+            List of (page index, components) tuples in page order
+        """
+        return list(self._iter_page_range(page_indices, page_modes))
+    
+    def _iter_page_range(self, page_indices,
+                         page_modes: Dict[int, Dict[str, Any]]) -> Iterator[Tuple[int, List[DocumentComponent]]]:
+        """
+        Extract components from a range of pages with this process's own handles.
+        
+        Args:
+            page_indices: Zero-based indices of the pages to extract
+            page_modes: Per-page extraction decisions (see ``_classify_page``)
             
-            # Extract images
-            image_list = page.get_images(full=True)
-            for img_idx, img_info in enumerate(image_list):
-                xref = img_info[0]
-                base_image = doc.extract_image(xref)
-                image_bytes = base_image["image"]
-                image_ext = base_image["ext"]
-                
-                # Simplified image rectangle handling - create a default rectangle if unable to get exact position
-                img_rect = fitz.Rect(100, 100, 400, 400)  # Default position
-                
-                # Add image component with position information
-                component = ImageComponent(
-                    component_id=f"image_{component_id}",
-                    component_type="image",
-                    page_number=page_idx + 1,
-                    image_data=image_bytes,
-                    image_format=image_ext,
-                    size=(base_image["width"], base_image["height"]),
-                    position={
-                        "x0": img_rect.x0,
-                        "y0": img_rect.y0,
-                        "x1": img_rect.x1,
-                        "y1": img_rect.y1
-                    }
-                )
-                components.append(component)
-                component_id += 1
+        Yields:
+            Tuples of (page index, components on that page); IDs are assigned by the caller
+        """
+        doc = fitz.open(self.input_file)
+        
+        # Use pdfplumber for tables
+        plumber_pdf = pdfplumber.open(self.input_file)
+        
+        try:
+            for page_idx in page_indices:
+                mode = page_modes[page_idx]
+                page_components = self._extract_page(doc, plumber_pdf, page_idx, mode["ocr"])
+                # Expose how each page was read so downstream steps can judge text quality
+                for component in page_components:
+                    component.metadata.update(mode)
+                yield page_idx, page_components
+        finally:
+            plumber_pdf.close()
+            doc.close()
+    
+    def _extract_page(self, doc, plumber_pdf, page_idx: int, needs_ocr: bool) -> List[DocumentComponent]:
+        """
+        Extract text, table and image components from a single page.
+        
+        Args:
+            doc: PyMuPDF document
+            plumber_pdf: pdfplumber document
+            page_idx: Page index
+            needs_ocr: Whether text should be extracted with OCR
+            
+        Returns:
+            List of document components for the page
+        """
+        components = []
+        page = doc[page_idx]
+        plumber_page = plumber_pdf.pages[page_idx]
         
-        # If we didn't extract any text, try a more aggressive approach
-        if not any(isinstance(c, TextComponent) for c in components):
-            logger.warning("No text components extracted, trying alternative method")
-            # Try to extract text from the whole document using a different approach
-            for page_idx in range(len(doc)):
-                page = doc[page_idx]
-                text = page.get_text("text")
+        # Process text using appropriate method
+        if needs_ocr:
+            logger.info(f"Using OCR for page {page_idx+1} text extraction")
+            components.extend(self._extract_text_with_ocr(page, page_idx))
+        else:
+            # Process text blocks
+            for block in page.get_text("blocks"):
+                # Skip image blocks
+                if block[6] == 1:  # Image block type
+                    continue
+                    
+                # Create text component
+                text = block[4]
                 if text.strip():
+                    # Check if header or footer based on position
+                    is_header = block[1] < 100  # Example threshold for header
+                    is_footer = block[3] > page.rect.height - 100  # Example threshold for footer
+                    
                     component = TextComponent(
-                        component_id=f"text_{component_id}",
+                        component_id="",
                         component_type="text",
                         page_number=page_idx + 1,
                         text=text,
-                        font_info={"size": 11},
+                        font_info={"size": block[5]},
                         position={
-                            "x0": 50,
-                            "y0": 50,
-                            "x1": page.rect.width - 50,
-                            "y1": page.rect.height - 50
-                        }
+                            "x0": block[0],
+                            "y0": block[1],
+                            "x1": block[2],
+                            "y1": block[3]
+                        },
+                        is_header=is_header,
+                        is_footer=is_footer
                     )
                     components.append(component)
-                    component_id += 1
         
-        plumber_pdf.close()
-        doc.close()
+        if not components:
+            # If neither blocks nor OCR found text, try plain text extraction
+            raw_text = page.get_text("text")
+            if raw_text.strip():
+                logger.info(f"No text blocks found on page {page_idx+1}, using alternate extraction")
+                # Create a single text component with the entire page text
+                component = TextComponent(
+                    component_id="",
+                    component_type="text",
+                    page_number=page_idx + 1,
+                    text=raw_text,
+                    font_info={"size": 11},  # Default font size
+                    position={
+                        "x0": 50,
+                        "y0": 50,
+                        "x1": page.rect.width - 50,
+                        "y1": page.rect.height - 50
+                    }
+                )
+                components.append(component)
+        
+        # Extract tables
+        tables = plumber_page.find_tables()
+        for table in tables:
+            rows = []
+            for row in table.extract():
+                rows.append([str(cell) if cell is not None else "" for cell in row])
+            
+            component = TableComponent(
+                component_id="",
+                component_type="table",
+                page_number=page_idx + 1,
+                rows=rows,
+                position={
+                    "x0": table.bbox[0],
+                    "y0": table.bbox[1],
+                    "x1": table.bbox[2],
+                    "y1": table.bbox[3]
+                }
+            )
+            components.append(component)
+        
+        # Release pdfplumber's parsed page objects so memory stays flat across pages
+        plumber_page.flush_cache()
+        
+        # Extract images
+        image_list = page.get_images(full=True)
+        for img_idx, img_info in enumerate(image_list):
+            xref = img_info[0]
+            base_image = doc.extract_image(xref)
+            image_bytes = base_image["image"]
+            image_ext = base_image["ext"]
+            
+            # Simplified image rectangle handling - create a default rectangle if unable to get exact position
+            img_rect = fitz.Rect(100, 100, 400, 400)  # Default position
+            
+            # Add image component with position information
+            component = ImageComponent(
+                component_id="",
+                component_type="image",
+                page_number=page_idx + 1,
+                image_data=image_bytes,
+                image_format=image_ext,
+                size=(base_image["width"], base_image["height"]),
+                position={
+                    "x0": img_rect.x0,
+                    "y0": img_rect.y0,
+                    "x1": img_rect.x1,
+                    "y1": img_rect.y1
+                }
+            )
+            components.append(component)
         
-        logger.info(f"Extracted {len(components)} components from PDF")
         return components
     
-    def _check_if_needs_ocr(self, doc):
+    def _classify_page(self, page) -> Dict[str, Any]:
         """
-        Check if the PDF appears to be scanned and needs OCR.
+        Decide whether a page is scanned and needs OCR.
+        
+        A page needs OCR when images cover most of it but its text layer
+        covers almost nothing, e.g. a scanned appendix in a digital report.
         
         Args:
-            doc: PyMuPDF document
+            page: PyMuPDF page
             
         Returns:
-            Boolean indicating if OCR is needed
+            Dictionary with the decision ('ocr') and the text and image
+            coverage ratios it was based on
         """
-        # Sample a few pages to see if they contain searchable text
-        total_pages = len(doc)
-        sample_pages = min(total_pages, 3)  # Check up to 3 pages
+        page_rect = page.rect
+        page_area = abs(page_rect) or 1.0
         
-        text_count = 0
-        image_count = 0
+        text_area = sum(
+            abs(fitz.Rect(block[:4]) & page_rect)
+            for block in page.get_text("blocks")
+            if block[6] == 0 and block[4].strip()
+        )
+        image_area = sum(abs(fitz.Rect(info["bbox"]) & page_rect) for info in page.get_image_info())
         
-        for page_idx in range(sample_pages):
-            page = doc[page_idx]
-            text = page.get_text("text")
-            images = page.get_images(full=True)
-            
-            if text.strip():
-                text_count += 1
-            if images:
-                image_count += len(images)
+        text_coverage = min(1.0, text_area / page_area)
+        image_coverage = min(1.0, image_area / page_area)
         
-        # If there are significantly more images than text pages, might need OCR
-        return (text_count == 0 and image_count > 0) or (image_count > text_count * 3)
+        return {
+            "ocr": image_coverage >= self.OCR_MIN_IMAGE_COVERAGE and text_coverage < self.OCR_MAX_TEXT_COVERAGE,
+            "text_coverage": round(text_coverage, 3),
+            "image_coverage": round(image_coverage, 3),
+        }
     
-    def _extract_text_with_ocr(self, page, page_idx, start_component_id):
+    def _extract_text_with_ocr(self, page, page_idx):
         """
         Extract text from a page using OCR.
         
         Args:
             page: PyMuPDF page
             page_idx: Page index
-            start_component_id: Starting component ID
             
         Returns:
             List of extracted TextComponents
         """
         components = []
-        component_id = start_component_id
         
         try:
-            # Render page to image for OCR
-            pix = page.get_pixmap(matrix=fitz.Matrix(300/72, 300/72))
-            img = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.h, pix.w, pix.n)
+            # Render page straight to grayscale for OCR
+            pix = page.get_pixmap(dpi=self.ocr_dpi, colorspace=fitz.csGRAY, alpha=False)
+            gray = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.h, pix.w)
             
-            # Convert to grayscale if it's not already
-            if pix.n > 1:
-                gray = cv2.cvtColor(img, cv2.COLOR_RGB2GRAY)
-            else:
-                gray = img
+            if self.ocr_granularity != self.OCR_PAGE:
+                # Use Tesseract word boxes, scaled from pixels back to PDF points
+                data = pytesseract.image_to_data(gray, lang='eng', output_type=pytesseract.Output.DICT)
+                return self._ocr_data_to_components(data, page, page_idx, 72 / self.ocr_dpi)
             
             # Use Tesseract OCR to extract text
             text = pytesseract.image_to_string(gray, lang='eng')
@@ -325,7 +536,7 @@ class DocumentProcessor:
             if text.strip():
                 # Create a text component for the OCR text
                 component = TextComponent(
-                    component_id=f"text_{component_id}",
+                    component_id="",
                     component_type="text",
                     page_number=page_idx + 1,
                     text=text,
@@ -340,11 +551,55 @@ class DocumentProcessor:
                     is_footer=False
                 )
                 components.append(component)
-                component_id += 1
         except Exception as e:
             logger.error(f"OCR processing error: {str(e)}")
         
         return components
+    
+    def _ocr_data_to_components(self, data: Dict[str, List], page, page_idx: int,
+                                scale: float) -> List[TextComponent]:
+        """
+        Build text components from Tesseract ``image_to_data`` output.
+        
+        Args:
+            data: Tesseract output dictionary (``Output.DICT``)
+            page: PyMuPDF page
+            page_idx: Page index
+            scale: Factor converting image pixels to PDF points
+            
+        Returns:
+            One TextComponent per word or per line, depending on ``ocr_granularity``
+        """
+        # Group recognized words by word or by line, keeping reading order
+        groups = {}
+        for i, word in enumerate(data["text"]):
+            if not word.strip() or float(data["conf"][i]) < 0:
+                continue
+            key = (data["block_num"][i], data["par_num"][i], data["line_num"][i])
+            if self.ocr_granularity == self.OCR_WORD:
+                key += (data["word_num"][i],)
+            groups.setdefault(key, []).append(i)
+        
+        components = []
+        for indices in groups.values():
+            x0 = min(data["left"][i] for i in indices) * scale
+            y0 = min(data["top"][i] for i in indices) * scale
+            x1 = max(data["left"][i] + data["width"][i] for i in indices) * scale
+            y1 = max(data["top"][i] + data["height"][i] for i in indices) * scale
+            
+            component = TextComponent(
+                component_id="",
+                component_type="text",
+                page_number=page_idx + 1,
+                text=" ".join(data["text"][i].strip() for i in indices),
+                font_info={"size": round(y1 - y0, 1)},  # Approximate font size from box height
+                position={"x0": x0, "y0": y0, "x1": x1, "y1": y1},
+                is_header=y0 < 100,
+                is_footer=y1 > page.rect.height - 100
+            )
+            components.append(component)
+        
+        return components
         
     def _process_docx(self) -> List[Union[TextComponent, TableComponent, ImageComponent, ChartComponent]]:
         """
@@ -7,9 +7,10 @@ translated content while preserving formatting.
 
 import os
 import io
-import tempfile
-from typing import List, Dict, Any, Union, Optional, Tuple
+import math
+from typing import List, Dict, Any, Union, Optional, Tuple, BinaryIO
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
 import fitz  # PyMuPDF
 import docx
 from reportlab.pdfgen import canvas
@@ -21,6 +22,8 @@ import numpy as np
 from PIL import Image, ImageDraw, ImageFont, ImageColor
 
 from auto_wealth_translate.utils.logger import get_logger
+from auto_wealth_translate.utils.spatial_index import GridIndex
+from auto_wealth_translate.utils.progress import ProgressCallback, report_progress, track_progress
 from auto_wealth_translate.core.document_processor import (
     DocumentComponent, TextComponent, TableComponent, 
     ImageComponent, ChartComponent
@@ -28,9 +31,44 @@ from auto_wealth_translate.core.document_processor import (
 
 logger = get_logger(__name__)
 
+def _render_pdf_fragment(rebuild_mode: str, components: List[DocumentComponent],
+                         source_pdf_path: Optional[str], page_range: range) -> bytes:
+    """
+    Render a range of pages into a PDF fragment (runs in a worker process).
+    
+    Args:
+        rebuild_mode: Rebuild mode
+        components: Components on the pages in ``page_range``
+        source_pdf_path: Path to the original PDF
+        page_range: Page numbers to render
+        
+    Returns:
+        PDF data for the fragment, or empty bytes if there is nothing to render
+        
+    Raises:
+        Exception: If the fragment cannot be rendered; the parallel rebuild then
+            falls back to rebuilding the whole document serially
+    """
+    rebuilder = DocumentRebuilder()
+    if rebuild_mode == DocumentRebuilder.MODE_PRECISE:
+        return rebuilder._rebuild_pdf_precise(components, source_pdf_path, page_range=page_range).data
+    if rebuild_mode == DocumentRebuilder.MODE_BILINGUAL:
+        return rebuilder._rebuild_pdf_bilingual(components, source_pdf_path, page_range=page_range).data
+    if not components:
+        return b""
+    if rebuild_mode == DocumentRebuilder.MODE_VECTOR:
+        return rebuilder._rebuild_pdf_vector(components, source_pdf_path).data
+    return rebuilder._rebuild_pdf_enhanced(components).data
+
 class DocumentOutput:
     """Class representing a built document."""
     
+    # Media types used when serving the document over HTTP
+    MEDIA_TYPES = {
+        'pdf': 'application/pdf',
+        'docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+    }
+    
     def __init__(self, data: bytes, format: str):
         """
         Initialize document output.
@@ -41,17 +79,33 @@ class DocumentOutput:
         """
         self.data = data
         self.format = format
+    
+    @classmethod
+    def media_type_for(cls, format: str) -> str:
+        """MIME type of a document format (e.g. the extension of a saved document)."""
+        return cls.MEDIA_TYPES.get(format.lower().lstrip('.'), 'application/octet-stream')
+    
+    @property
+    def media_type(self) -> str:
+        """MIME type of the document."""
+        return self.media_type_for(self.format)
         
-    def save(self, output_path: str) -> None:
+    def save(self, output: Union[str, os.PathLike, BinaryIO]) -> None:
         """
-        Save the document to a file.
+        Save the document to a file or a writable binary stream.
         
         Args:
-            output_path: Path to save the document to
+            output: Path to save the document to, or an object with a
+                ``write`` method (open file, socket file, HTTP response body)
         """
-        with open(output_path, 'wb') as f:
+        if hasattr(output, 'write'):
+            output.write(self.data)
+            logger.info(f"Document written to {getattr(output, 'name', type(output).__name__)}")
+            return
+        
+        with open(output, 'wb') as f:
             f.write(self.data)
-        logger.info(f"Document saved to {output_path}")
+        logger.info(f"Document saved to {output}")
 
 class DocumentRebuilder:
     """
@@ -63,15 +117,30 @@ class DocumentRebuilder:
     MODE_PRECISE = "precise"        # Precise element identification (Canva-like)
     MODE_BILINGUAL = "bilingual"    # Side-by-side or sequential bilingual pages
     MODE_BILINGUAL_MARKDOWN = "bilingual_markdown"  # Bilingual mode with markdown translation
+    MODE_VECTOR = "vector"          # Real (selectable) PDF text with embedded subset fonts
+    
+    # Modes whose pages can be rendered independently and stitched together
+    PARALLEL_MODES = (MODE_ENHANCED, MODE_PRECISE, MODE_BILINGUAL, MODE_VECTOR)
     
-    def __init__(self):
-        """Initialize the document rebuilder."""
+    def __init__(self, max_workers: int = 1, progress_callback: Optional[ProgressCallback] = None):
+        """
+        Initialize the document rebuilder.
+        
+        Args:
+            max_workers: Number of worker processes for rendering PDF pages
+                (1 renders pages serially in this process)
+            progress_callback: Optional callback receiving a 'rebuild' event
+                (see ``utils.progress``) as pages are rendered
+        """
         logger.info("Initialized document rebuilder")
+        self.max_workers = max(1, max_workers or 1)
+        self.progress_callback = progress_callback
         self.font_cache = {}  # Cache fonts to avoid reloading them
         
     def rebuild(self, components: List[DocumentComponent], output_format: str = 'pdf', 
                 rebuild_mode: str = MODE_ENHANCED, source_pdf_path: str = None,
-                source_lang: str = None, target_lang: str = None, translation_model: str = None) -> DocumentOutput:
+                source_lang: str = None, target_lang: str = None, translation_model: str = None,
+                translation_service=None) -> DocumentOutput:
         """
         Rebuild a document from components.
         
@@ -79,11 +148,16 @@ class DocumentRebuilder:
             components: List of document components
             output_format: Format of the output document (pdf, docx)
             rebuild_mode: Mode for rebuilding the document 
-                          ('enhanced', 'precise', 'bilingual', or 'bilingual_markdown')
-            source_pdf_path: Path to original PDF (needed for certain modes)
+                          ('enhanced', 'precise', 'bilingual', 'bilingual_markdown', or 'vector')
+            source_pdf_path: Path to original PDF (needed for certain modes, used
+                             for page sizes in vector mode)
             source_lang: Source language code (needed for bilingual_markdown mode)
             target_lang: Target language code (needed for bilingual_markdown mode)
             translation_model: Translation model to use (needed for bilingual_markdown mode)
+            translation_service: TranslationService for bilingual_markdown mode. When given,
+                                 the components are expected to be untranslated: the pages
+                                 are translated once via Markdown, and the components are
+                                 only translated if the standard bilingual fallback is needed
             
         Returns:
             DocumentOutput object
@@ -97,6 +171,14 @@ class DocumentRebuilder:
         )
         
         if output_format.lower() == 'pdf':
+            if self.max_workers > 1 and rebuild_mode in self.PARALLEL_MODES:
+                needs_source = rebuild_mode in (self.MODE_PRECISE, self.MODE_BILINGUAL)
+                if source_pdf_path or not needs_source:
+                    try:
+                        return self._rebuild_pdf_parallel(sorted_components, rebuild_mode, source_pdf_path)
+                    except Exception as e:
+                        logger.error(f"Parallel PDF rebuilding failed, falling back to serial rebuilding: {str(e)}")
+            
             if rebuild_mode == self.MODE_ENHANCED:
                 return self._rebuild_pdf_enhanced(sorted_components)
             elif rebuild_mode == self.MODE_PRECISE:
@@ -109,15 +191,18 @@ class DocumentRebuilder:
                     logger.warning("Source PDF path required for bilingual mode. Falling back to enhanced mode.")
                     return self._rebuild_pdf_enhanced(sorted_components)
                 return self._rebuild_pdf_bilingual(sorted_components, source_pdf_path)
+            elif rebuild_mode == self.MODE_VECTOR:
+                return self._rebuild_pdf_vector(sorted_components, source_pdf_path)
             elif rebuild_mode == self.MODE_BILINGUAL_MARKDOWN:
                 if not source_pdf_path:
                     logger.warning("Source PDF path required for bilingual markdown mode. Falling back to enhanced mode.")
                     return self._rebuild_pdf_enhanced(sorted_components)
-                if not all([source_lang, target_lang, translation_model]):
+                if translation_service is None and not all([source_lang, target_lang, translation_model]):
                     logger.warning("Language parameters required for bilingual markdown mode. Falling back to standard bilingual mode.")
                     return self._rebuild_pdf_bilingual(sorted_components, source_pdf_path)
                 return self._rebuild_pdf_bilingual_markdown(sorted_components, source_pdf_path, 
-                                                          source_lang, target_lang, translation_model)
+                                                          source_lang, target_lang, translation_model,
+                                                          translation_service=translation_service)
             else:
                 logger.warning(f"Unknown rebuild mode: {rebuild_mode}. Using enhanced mode.")
                 return self._rebuild_pdf_enhanced(sorted_components)
@@ -126,6 +211,68 @@ class DocumentRebuilder:
         else:
             raise ValueError(f"Unsupported output format: {output_format}")
     
+    def _rebuild_pdf_parallel(self, components: List[DocumentComponent], rebuild_mode: str,
+                              source_pdf_path: Optional[str] = None) -> DocumentOutput:
+        """
+        Rebuild a PDF document by rendering page ranges in worker processes.
+        
+        Each worker renders a contiguous range of pages into a PDF fragment with
+        the regular single-process method for the mode; the fragments are then
+        stitched together in page order with ``insert_pdf``.
+        
+        Args:
+            components: List of document components, sorted by page
+            rebuild_mode: One of ``PARALLEL_MODES``
+            source_pdf_path: Path to the original PDF
+            
+        Returns:
+            DocumentOutput object with PDF data
+        """
+        page_components = {}
+        for component in components:
+            page_components.setdefault(component.page_number, []).append(component)
+        
+        if rebuild_mode in (self.MODE_PRECISE, self.MODE_BILINGUAL):
+            # These modes output every page of the source document
+            with fitz.open(source_pdf_path) as source_doc:
+                page_numbers = list(range(1, len(source_doc) + 1))
+        else:
+            # These modes output only pages that have components
+            page_numbers = sorted(page_components)
+        
+        workers = min(self.max_workers, len(page_numbers))
+        if workers < 2:
+            raise ValueError("Not enough pages to render in parallel")
+        
+        # A couple of ranges per worker keeps the pool busy when page costs are uneven
+        chunk_size = max(1, math.ceil(len(page_numbers) / (workers * 2)))
+        page_ranges = [page_numbers[start:start + chunk_size]
+                       for start in range(0, len(page_numbers), chunk_size)]
+        
+        logger.info(f"Rendering {len(page_numbers)} pages with {workers} worker processes")
+        output_doc = fitz.open()
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = []
+            for pages in page_ranges:
+                range_components = [c for page_num in pages for c in page_components.get(page_num, [])]
+                page_range = range(pages[0], pages[-1] + 1)
+                futures.append(executor.submit(_render_pdf_fragment, rebuild_mode, range_components,
+                                               source_pdf_path, page_range))
+            
+            completed = 0
+            for pages, future in zip(page_ranges, futures):
+                fragment = future.result()
+                if fragment:
+                    with fitz.open(stream=fragment, filetype="pdf") as fragment_doc:
+                        output_doc.insert_pdf(fragment_doc)
+                completed += len(pages)
+                report_progress(self.progress_callback, "rebuild", completed, len(page_numbers))
+        
+        pdf_data = output_doc.tobytes(garbage=3, deflate=True)
+        output_doc.close()
+        
+        return DocumentOutput(pdf_data, 'pdf')
+    
     def _find_cjk_font(self):
         """Find a suitable CJK font on the system."""
         # Check common font directories by platform
@@ -208,11 +355,6 @@ class DocumentRebuilder:
         Returns:
             DocumentOutput object with PDF data
         """
-        # Create a temporary file for the output PDF
-        temp_file = tempfile.NamedTemporaryFile(suffix='.pdf', delete=False)
-        temp_file.close()
-        output_path = temp_file.name
-        
         # Find a suitable CJK font
         cjk_font_path = self._find_cjk_font()
         
@@ -260,7 +402,7 @@ class DocumentRebuilder:
         SCALE = DPI / 72  # Scale factor (72 is the default PDF DPI)
         
         # For each page
-        for page_num in range(1, max_page + 1):
+        for page_num in track_progress(range(1, max_page + 1), self.progress_callback, "rebuild", max_page):
             if page_num not in page_components:
                 continue
                 
@@ -463,23 +605,162 @@ class DocumentRebuilder:
                 except Exception as e:
                     logger.error(f"Error adding rendered page to PDF: {str(e)}")
         
-        # Save the document
-        doc.save(output_path)
+        # Serialize the document in memory
+        pdf_data = doc.tobytes(garbage=3, deflate=True)
         doc.close()
         
-        # Read the file back
-        with open(output_path, 'rb') as f:
-            pdf_data = f.read()
+        return DocumentOutput(pdf_data, 'pdf')
+    
+    def _rebuild_pdf_vector(self, components: List[DocumentComponent],
+                            source_pdf_path: Optional[str] = None) -> DocumentOutput:
+        """
+        Rebuild a PDF document as vector text (vector mode).
+        
+        Unlike enhanced mode, pages are not rasterized: text and tables are
+        written as real, selectable PDF text with PyMuPDF's TextWriter, shrinking
+        the font where needed so translated text fits its original box. CJK text
+        uses a system CJK font if available (otherwise PyMuPDF's built-in CJK
+        font), and fonts are subset so only the glyphs used are embedded.
+        
+        Args:
+            components: List of document components
+            source_pdf_path: Path to the original PDF, used for page sizes (optional)
+            
+        Returns:
+            DocumentOutput object with PDF data
+        """
+        # Group components by page
+        page_components = {}
+        for component in components:
+            page_components.setdefault(component.page_number, []).append(component)
+        
+        # Use the original page sizes when available
+        page_sizes = {}
+        if source_pdf_path:
+            try:
+                with fitz.open(source_pdf_path) as source_doc:
+                    page_sizes = {idx + 1: (page.rect.width, page.rect.height)
+                                  for idx, page in enumerate(source_doc)}
+            except Exception as e:
+                logger.warning(f"Could not read page sizes from source PDF: {str(e)}")
+        
+        # Load fonts once; each is embedded once and subset at the end
+        cjk_font_path = self._find_cjk_font()
+        try:
+            cjk_font = fitz.Font(fontfile=cjk_font_path) if cjk_font_path else fitz.Font("cjk")
+        except Exception as e:
+            logger.warning(f"Could not load CJK font {cjk_font_path}, using built-in CJK font: {str(e)}")
+            cjk_font = fitz.Font("cjk")
+        latin_font = fitz.Font("helv")
+        
+        doc = fitz.open()
+        max_page = max(page_components) if page_components else 0
         
-        # Clean up the temporary file
+        for page_num in track_progress(range(1, max_page + 1), self.progress_callback, "rebuild", max_page):
+            if page_num not in page_components:
+                continue
+            
+            page_width, page_height = page_sizes.get(page_num, (612, 792))  # US Letter by default
+            page = doc.new_page(width=page_width, height=page_height)
+            
+            # One writer per text color; written to the page after all components
+            writers = {}
+            
+            def write(rect, text, size, color=(0, 0, 0)):
+                font = cjk_font if any(ord(char) > 255 for char in text) else latin_font
+                if color not in writers:
+                    writers[color] = fitz.TextWriter(page.rect, color=color)
+                self._fill_textbox_to_fit(writers[color], rect, text, font, size)
+            
+            # Draw images first so text ends up on top
+            for component in page_components[page_num]:
+                if isinstance(component, ImageComponent) and component.image_data:
+                    rect = self._component_rect(component, {"x0": 50, "y0": 300, "x1": 550, "y1": 550})
+                    try:
+                        page.insert_image(rect, stream=component.image_data)
+                    except Exception as e:
+                        logger.error(f"Error adding image: {str(e)}")
+            
+            for component in page_components[page_num]:
+                try:
+                    if isinstance(component, TextComponent) and component.text.strip():
+                        rect = self._component_rect(component, {"x0": 50, "y0": 50, "x1": 550, "y1": 70})
+                        color = (0, 0, 0.7) if component.is_header else (0, 0, 0)
+                        write(rect, component.text.strip(), component.font_info.get('size', 11), color)
+                    
+                    elif isinstance(component, TableComponent) and component.rows:
+                        rect = self._component_rect(component, {"x0": 50, "y0": 200, "x1": 550, "y1": 400})
+                        num_rows = len(component.rows)
+                        num_cols = max(len(row) for row in component.rows) or 1
+                        cell_width = rect.width / num_cols
+                        cell_height = rect.height / num_rows
+                        
+                        for row_idx, row in enumerate(component.rows):
+                            for col_idx, cell in enumerate(row):
+                                cell_rect = fitz.Rect(
+                                    rect.x0 + col_idx * cell_width,
+                                    rect.y0 + row_idx * cell_height,
+                                    rect.x0 + (col_idx + 1) * cell_width,
+                                    rect.y0 + (row_idx + 1) * cell_height
+                                )
+                                # Shade the header row
+                                fill = (0.9, 0.9, 0.94) if row_idx == 0 else None
+                                page.draw_rect(cell_rect, color=(0.6, 0.6, 0.6), fill=fill, width=0.5)
+                                if str(cell).strip():
+                                    write(cell_rect + (2, 1, -2, -1), str(cell).strip(), 9)
+                except Exception as e:
+                    logger.error(f"Error adding {component.component_type} {component.component_id}: {str(e)}")
+            
+            for color, writer in writers.items():
+                writer.write_text(page)
+        
+        # Embed only the glyphs that are actually used
         try:
-            os.unlink(output_path)
-        except:
-            pass
+            doc.subset_fonts()
+        except Exception as e:
+            logger.warning(f"Font subsetting failed: {str(e)}")
+        
+        pdf_data = doc.tobytes(garbage=3, deflate=True)
+        doc.close()
         
         return DocumentOutput(pdf_data, 'pdf')
     
-    def _rebuild_pdf_precise(self, components: List[DocumentComponent], source_pdf_path: str) -> DocumentOutput:
+    @staticmethod
+    def _fill_textbox_to_fit(writer: fitz.TextWriter, rect: fitz.Rect, text: str,
+                             font: fitz.Font, font_size: float, min_font_size: float = 5) -> None:
+        """
+        Add text to a TextWriter inside a box, shrinking the font until it fits.
+        
+        Args:
+            writer: TextWriter to add the text to
+            rect: Box to fill
+            text: Text to write
+            font: Font to use
+            font_size: Preferred font size
+            min_font_size: Smallest font size to try; at this size text may overflow
+        """
+        size = font_size
+        while size > min_font_size:
+            # Lay out on a scratch writer so failed attempts leave no text behind
+            trial = fitz.TextWriter(writer.rect)
+            if not trial.fill_textbox(rect, text, font=font, fontsize=size):
+                break
+            size = max(min_font_size, size * 0.85)
+        writer.fill_textbox(rect, text, font=font, fontsize=size)
+    
+    @staticmethod
+    def _component_rect(component: DocumentComponent, default_position: Dict[str, float]) -> fitz.Rect:
+        """Get the page rectangle of a component, falling back to a default position."""
+        position = getattr(component, 'position', None) or default_position
+        return fitz.Rect(
+            position.get('x0', default_position['x0']),
+            position.get('y0', default_position['y0']),
+            position.get('x1', default_position['x1']),
+            position.get('y1', default_position['y1'])
+        )
+    
+    def _rebuild_pdf_precise(self, components: List[DocumentComponent], source_pdf_path: str,
+                             page_range: Optional[range] = None) -> DocumentOutput:
         """
         Rebuild a PDF document using precise object identification (Canva-like approach).
         This method preserves the original PDF layout exactly and only replaces text.
@@ -487,15 +768,15 @@ class DocumentRebuilder:
         Args:
             components: List of document components
             source_pdf_path: Path to the original PDF file
+            page_range: Page numbers to output (all pages if not given)
             
         Returns:
             DocumentOutput object with PDF data
+            
+        Raises:
+            Exception: If rendering a ``page_range`` fragment fails (the whole
+                document falls back to enhanced mode instead)
         """
-        # Create a temporary file for the output PDF
-        temp_file = tempfile.NamedTemporaryFile(suffix='.pdf', delete=False)
-        temp_file.close()
-        output_path = temp_file.name
-        
         try:
             # Open the source PDF
             doc = fitz.open(source_pdf_path)
@@ -512,15 +793,22 @@ class DocumentRebuilder:
                 components_by_page[page_num].append(component)
             
             # Process each page
-            for page_num, page in enumerate(doc, start=1):
-                if page_num not in components_by_page:
+            for page_num, page in track_progress(enumerate(doc, start=1), self.progress_callback,
+                                                 "rebuild", len(doc)):
+                if page_num not in components_by_page or (page_range is not None and page_num not in page_range):
                     continue
                 
                 # Get page components
                 page_components = components_by_page[page_num]
                 
-                # Create a list of text components
-                text_components = [c for c in page_components if isinstance(c, TextComponent)]
+                # Create a list of positioned text components with an index over their boxes,
+                # so each span is only compared with components near it
+                text_components = [c for c in page_components if isinstance(c, TextComponent) and c.position]
+                component_rects = [
+                    fitz.Rect(c.position.get('x0'), c.position.get('y0'), c.position.get('x1'), c.position.get('y1'))
+                    for c in text_components
+                ]
+                component_index = GridIndex(tuple(rect) for rect in component_rects)
                 
                 # First extract detailed text information using the "dict" mode
                 text_dict = page.get_text("dict")
@@ -538,15 +826,13 @@ class DocumentRebuilder:
                                 
                                 # Try to find a matching component by position overlap
                                 matched_component = None
-                                for comp in text_components:
-                                    pos = comp.position
-                                    if pos:
-                                        comp_rect = fitz.Rect(pos.get('x0'), pos.get('y0'), pos.get('x1'), pos.get('y1'))
-                                        # Check if the rectangles overlap significantly
-                                        overlap = span_rect.intersect(comp_rect)
-                                        if overlap.get_area() > 0.5 * min(span_rect.get_area(), comp_rect.get_area()):
-                                            matched_component = comp
-                                            break
+                                for comp_idx in component_index.query(tuple(span_rect)):
+                                    comp_rect = component_rects[comp_idx]
+                                    # Check if the rectangles overlap significantly
+                                    overlap = fitz.Rect(span_rect).intersect(comp_rect)
+                                    if overlap.get_area() > 0.5 * min(span_rect.get_area(), comp_rect.get_area()):
+                                        matched_component = text_components[comp_idx]
+                                        break
                                 
                                 # If we found a matching component, replace the text
                                 if matched_component:
@@ -595,29 +881,27 @@ class DocumentRebuilder:
                 # Now handle any image components if needed
                 # For this version, we'll keep the original images
             
-            # Save the document
-            doc.save(output_path)
-            doc.close()
+            # Keep only the requested pages when rendering a fragment
+            if page_range is not None:
+                doc.select([page_num - 1 for page_num in page_range if page_num <= len(doc)])
             
-            # Read the file back
-            with open(output_path, 'rb') as f:
-                pdf_data = f.read()
+            # Serialize the document in memory
+            pdf_data = doc.tobytes(garbage=3, deflate=True)
+            doc.close()
             
         except Exception as e:
             logger.error(f"Error in precise PDF rebuilding: {str(e)}")
+            if page_range is not None:
+                # An enhanced rebuild cannot stand in for a fragment; the caller rebuilds serially
+                raise
             # Fallback to enhanced mode
             logger.warning("Falling back to enhanced mode")
             return self._rebuild_pdf_enhanced(components)
         
-        # Clean up the temporary file
-        try:
-            os.unlink(output_path)
-        except:
-            pass
-        
         return DocumentOutput(pdf_data, 'pdf')
     
-    def _rebuild_pdf_bilingual(self, components: List[DocumentComponent], source_pdf_path: str) -> DocumentOutput:
+    def _rebuild_pdf_bilingual(self, components: List[DocumentComponent], source_pdf_path: str,
+                               page_range: Optional[range] = None) -> DocumentOutput:
         """
         Rebuild a PDF document with bilingual pages.
         This method keeps the original pages and adds translated pages after each original.
@@ -625,15 +909,15 @@ class DocumentRebuilder:
         Args:
             components: List of document components
             source_pdf_path: Path to the original PDF file
+            page_range: Original page numbers to output (all pages if not given)
             
         Returns:
             DocumentOutput object with PDF data
+            
+        Raises:
+            Exception: If rendering a ``page_range`` fragment fails (the whole
+                document falls back to enhanced mode instead)
         """
-        # Create a temporary file for the output PDF
-        temp_file = tempfile.NamedTemporaryFile(suffix='.pdf', delete=False)
-        temp_file.close()
-        output_path = temp_file.name
-        
         try:
             # Open the source PDF to get original pages
             orig_doc = fitz.open(source_pdf_path)
@@ -655,8 +939,10 @@ class DocumentRebuilder:
                 page_components[page_num].append(component)
             
             # For each page in the original document
-            for page_idx in range(len(orig_doc)):
+            for page_idx in track_progress(range(len(orig_doc)), self.progress_callback, "rebuild", len(orig_doc)):
                 page_num = page_idx + 1
+                if page_range is not None and page_num not in page_range:
+                    continue
                 
                 # Add the original page
                 new_doc.insert_pdf(orig_doc, from_page=page_idx, to_page=page_idx)
@@ -786,31 +1072,25 @@ class DocumentRebuilder:
                                 logger.error(f"Error adding image to bilingual PDF: {str(e)}")
                                 y_position += y_spacing
             
-            # Save the document
-            new_doc.save(output_path)
+            # Serialize the document in memory
+            pdf_data = new_doc.tobytes(garbage=3, deflate=True)
             orig_doc.close()
             new_doc.close()
-            
-            # Read the file back
-            with open(output_path, 'rb') as f:
-                pdf_data = f.read()
                 
         except Exception as e:
             logger.error(f"Error in bilingual PDF rebuilding: {str(e)}")
+            if page_range is not None:
+                # An enhanced rebuild cannot stand in for a fragment; the caller rebuilds serially
+                raise
             # Fallback to enhanced mode
             logger.warning("Falling back to enhanced mode")
             return self._rebuild_pdf_enhanced(components)
         
-        # Clean up the temporary file
-        try:
-            os.unlink(output_path)
-        except:
-            pass
-        
         return DocumentOutput(pdf_data, 'pdf')
     
     def _rebuild_pdf_bilingual_markdown(self, components: List[DocumentComponent], source_pdf_path: str, 
-                                        source_lang: str, target_lang: str, translation_model: str) -> DocumentOutput:
+                                        source_lang: str, target_lang: str, translation_model: str,
+                                        translation_service=None) -> DocumentOutput:
         """
         Rebuild a PDF document with bilingual pages using the Markdown approach.
         This method keeps the original pages and adds translated pages after each original,
@@ -822,6 +1102,8 @@ class DocumentRebuilder:
             source_lang: Source language code
             target_lang: Target language code
             translation_model: Translation model to use
+            translation_service: Existing TranslationService to reuse; the components are
+                                 then treated as untranslated (see ``rebuild``)
             
         Returns:
             DocumentOutput object with PDF data
@@ -830,10 +1112,8 @@ class DocumentRebuilder:
         from auto_wealth_translate.core.markdown_processor import MarkdownProcessor
         from auto_wealth_translate.core.translator import TranslationService
         
-        # Create a temporary file for the output PDF
-        temp_file = tempfile.NamedTemporaryFile(suffix='.pdf', delete=False)
-        temp_file.close()
-        output_path = temp_file.name
+        # A caller-supplied service means the components have not been translated yet
+        components_translated = translation_service is None
         
         try:
             # Open the source PDF to get original pages
@@ -844,50 +1124,37 @@ class DocumentRebuilder:
             
             # Initialize the markdown processor and translator
             md_processor = MarkdownProcessor()
-            translation_service = TranslationService(
-                source_lang=source_lang,
-                target_lang=target_lang,
-                model=translation_model
-            )
+            if translation_service is None:
+                translation_service = TranslationService(
+                    source_lang=source_lang,
+                    target_lang=target_lang,
+                    model=translation_model
+                )
             
             # For each page in the original document
-            for page_idx in range(len(orig_doc)):
+            for page_idx in track_progress(range(len(orig_doc)), self.progress_callback, "rebuild", len(orig_doc)):
                 page_num = page_idx + 1
                 logger.info(f"Processing page {page_num} for bilingual markdown output")
                 
                 # Add the original page
                 new_doc.insert_pdf(orig_doc, from_page=page_idx, to_page=page_idx)
                 
-                # Create a temporary PDF for just this page
-                temp_page_pdf = tempfile.NamedTemporaryFile(suffix='.pdf', delete=False)
-                temp_page_pdf.close()
-                page_pdf_path = temp_page_pdf.name
-                
-                # Extract just this page to a separate PDF
-                with fitz.open() as page_doc:
-                    page_doc.insert_pdf(orig_doc, from_page=page_idx, to_page=page_idx)
-                    page_doc.save(page_pdf_path)
-                
                 try:
-                    # Convert this page to markdown
+                    # Convert this page to markdown straight from the open document
                     logger.info(f"Converting page {page_num} to markdown")
-                    md_content = md_processor.pdf_to_markdown(page_pdf_path)
+                    md_content = md_processor.pdf_to_markdown(orig_doc, pages=[page_idx])
                     
                     # Translate the markdown content
                     logger.info(f"Translating page {page_num} content")
                     translated_md = md_processor.translate_markdown(md_content, translation_service)
                     
-                    # Create a temporary PDF from the translated markdown
-                    temp_translated_pdf = tempfile.NamedTemporaryFile(suffix='.pdf', delete=False)
-                    temp_translated_pdf.close()
-                    translated_pdf_path = temp_translated_pdf.name
-                    
-                    # Generate PDF from the translated markdown
+                    # Generate PDF from the translated markdown into memory
                     logger.info(f"Generating translated PDF for page {page_num}")
-                    md_processor.markdown_to_pdf(translated_md, translated_pdf_path)
+                    translated_pdf = io.BytesIO()
+                    md_processor.markdown_to_pdf(translated_md, translated_pdf)
                     
                     # Add the translated page(s) from the generated PDF
-                    with fitz.open(translated_pdf_path) as translated_doc:
+                    with fitz.open(stream=translated_pdf.getvalue(), filetype="pdf") as translated_doc:
                         # Add header to indicate this is a translation page
                         for t_page in translated_doc:
                             # Create a new page with the same dimensions
@@ -922,9 +1189,6 @@ class DocumentRebuilder:
                                 t_page.number
                             )
                     
-                    # Clean up temporary files
-                    os.unlink(translated_pdf_path)
-                    
                 except Exception as page_err:
                     logger.error(f"Error processing page {page_num} with markdown: {str(page_err)}")
                     # Add an empty translation page with error message
@@ -938,31 +1202,21 @@ class DocumentRebuilder:
                         fontname="helv",
                         align=fitz.TEXT_ALIGN_CENTER
                     )
-                
-                # Clean up page PDF
-                os.unlink(page_pdf_path)
             
-            # Save the document
-            new_doc.save(output_path)
+            # Serialize the document in memory
+            pdf_data = new_doc.tobytes(garbage=3, deflate=True)
             new_doc.close()
             orig_doc.close()
-            
-            # Read the file back
-            with open(output_path, 'rb') as f:
-                pdf_data = f.read()
                 
         except Exception as e:
             logger.error(f"Error in bilingual markdown PDF rebuilding: {str(e)}")
             # Fallback to standard bilingual mode
             logger.warning("Falling back to standard bilingual mode")
+            if not components_translated:
+                # Components were handed over untranslated; translate them only now
+                components = translation_service.translate(components)
             return self._rebuild_pdf_bilingual(components, source_pdf_path)
         
-        # Clean up the temporary file
-        try:
-            os.unlink(output_path)
-        except:
-            pass
-        
         return DocumentOutput(pdf_data, 'pdf')
     
     def _draw_table_on_image(self, draw, component, rect, cjk_font_path, default_font_path, font_size=24):
@@ -1088,7 +1342,8 @@ class DocumentRebuilder:
             page_components[page_num].append(component)
         
         # Process each page
-        for page_num in sorted(page_components.keys()):
+        for page_num in track_progress(sorted(page_components), self.progress_callback, "rebuild",
+                                       len(page_components)):
             # Add page break if not the first page
             if page_num > 1:
                 doc.add_page_break()
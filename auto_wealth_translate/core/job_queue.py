@@ -0,0 +1,150 @@
+"""
+Job queue for AutoWealthTranslate.
+
+This module runs translation jobs on a fixed pool of worker threads fed by a
+bounded queue, so that long-running document pipelines never block the API
+event loop and a burst of uploads is rejected instead of piling up without
+limit. Worker threads are used rather than processes because jobs spend most
+of their time waiting on the translation API, and parallel page extraction and
+OCR already start their own process pools. Job state lives in the SQLite job
+store, so the queue itself only holds the work waiting for a worker.
+"""
+
+import queue
+import threading
+from typing import Any, Callable, List
+
+from auto_wealth_translate.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted while the queue is at capacity."""
+
+    def __init__(self, depth: int, capacity: int):
+        super().__init__(f"Job queue is full ({depth}/{capacity} jobs waiting)")
+        self.depth = depth
+        self.capacity = capacity
+
+class JobQueue:
+    """
+    Bounded FIFO queue of jobs executed by a pool of worker threads.
+    """
+
+    # How often idle workers check whether the queue has been shut down
+    POLL_INTERVAL = 0.5
+
+    def __init__(self, max_workers: int = 2, max_queued: int = 16):
+        """
+        Initialize the job queue.
+
+        Args:
+            max_workers: Number of jobs run concurrently
+            max_queued: Number of jobs that may wait for a worker before
+                submissions are rejected
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        if max_queued < 1:
+            raise ValueError("max_queued must be at least 1")
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self._queue: "queue.Queue[tuple]" = queue.Queue(maxsize=max_queued)
+        self._workers: List[threading.Thread] = []
+        self._running = 0
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+
+    @property
+    def depth(self) -> int:
+        """Number of jobs waiting for a worker."""
+        return self._queue.qsize()
+
+    @property
+    def running(self) -> int:
+        """Number of jobs currently being executed."""
+        return self._running
+
+    def full(self) -> bool:
+        """Check whether a new job would be rejected."""
+        return self._queue.full()
+
+    def submit(self, job_id: str, func: Callable[..., Any], *args: Any, **kwargs: Any) -> int:
+        """
+        Queue a job for execution.
+
+        Args:
+            job_id: Job ID, used for logging
+            func: Callable running the job
+            *args: Positional arguments for ``func``
+            **kwargs: Keyword arguments for ``func``
+
+        Returns:
+            Queue depth after the job was added
+
+        Raises:
+            QueueFullError: If the queue is at capacity
+            RuntimeError: If the queue has been shut down
+        """
+        if self._stopping.is_set():
+            raise RuntimeError("Job queue has been shut down")
+        self._start_workers()
+        try:
+            self._queue.put_nowait((job_id, func, args, kwargs))
+        except queue.Full:
+            raise QueueFullError(self.depth, self.max_queued) from None
+        return self.depth
+
+    def _start_workers(self) -> None:
+        with self._lock:
+            while len(self._workers) < self.max_workers:
+                worker = threading.Thread(
+                    target=self._work,
+                    name=f"translation-worker-{len(self._workers)}",
+                    daemon=True,
+                )
+                worker.start()
+                self._workers.append(worker)
+
+    def _work(self) -> None:
+        while True:
+            try:
+                item = self._queue.get(timeout=self.POLL_INTERVAL)
+            except queue.Empty:
+                # Exit once shut down and every queued job has been taken
+                if self._stopping.is_set():
+                    return
+                continue
+
+            job_id, func, args, kwargs = item
+            with self._lock:
+                self._running += 1
+            try:
+                func(*args, **kwargs)
+            except Exception as e:
+                # Jobs record their own failures; this only guards the worker
+                logger.error(f"Unhandled error in job {job_id}: {str(e)}", exc_info=True)
+            finally:
+                with self._lock:
+                    self._running -= 1
+                self._queue.task_done()
+
+    def join(self) -> None:
+        """Block until every queued job has finished."""
+        self._queue.join()
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stop accepting jobs and let the workers exit once the queued jobs have run.
+
+        Never blocks on a full queue, so ``wait=False`` returns immediately.
+
+        Args:
+            wait: Whether to block until the workers have exited
+        """
+        self._stopping.set()
+        with self._lock:
+            workers, self._workers = self._workers, []
+        if wait:
+            for worker in workers:
+                worker.join()
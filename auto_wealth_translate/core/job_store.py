@@ -0,0 +1,464 @@
+"""
+Job store module for AutoWealthTranslate.
+
+This module persists translation job records in SQLite so that jobs survive
+restarts and are visible to every API worker process sharing the database.
+Jobs are listed newest first with keyset pagination over an index, so a page
+costs the same no matter how many historical jobs are stored.
+"""
+
+import base64
+import binascii
+import json
+import os
+import secrets
+import socket
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from auto_wealth_translate.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+JOB_FIELDS = (
+    "job_id", "status", "progress", "created_at", "updated_at", "error",
+    "input_file", "target_lang", "model", "output_file", "validation_score",
+    "content_sha256", "file_size", "dedup_key", "progress_detail", "owner",
+)
+
+# Columns added after the first release, created on databases that lack them
+_ADDED_COLUMNS = {
+    "content_sha256": "TEXT",
+    "file_size": "INTEGER",
+    "dedup_key": "TEXT",
+    "progress_detail": "TEXT",
+    "owner": "TEXT",
+}
+
+# Fields stored as JSON text
+_JSON_FIELDS = {"progress_detail"}
+
+# Fields that may change after a job has been created
+_MUTABLE_FIELDS = {"status", "progress", "error", "output_file", "validation_score", "dedup_key",
+                   "progress_detail"}
+
+# Jobs that a duplicate submission can reuse
+_REUSABLE_STATUSES = ("queued", "processing", "completed")
+
+# Jobs that still depend on the in-memory queue of the process that owns them
+_ACTIVE_STATUSES = ("queued", "processing")
+
+def _now() -> str:
+    # Fixed-width timestamps so that string order matches time order
+    return datetime.now().isoformat(timespec="microseconds")
+
+# Random token of this process instance, regenerated in forked children
+_instance: Optional[Tuple[int, str]] = None
+
+def _instance_token() -> str:
+    global _instance
+    pid = os.getpid()
+    if _instance is None or _instance[0] != pid:
+        _instance = (pid, secrets.token_hex(8))
+    return _instance[1]
+
+def process_owner() -> str:
+    """
+    Identify the current process as the owner of the jobs it queues.
+
+    The owner is ``host:pid:token``; the random token tells this process
+    apart from an earlier one that ran with the same PID, e.g. in a
+    restarted container.
+    """
+    return f"{socket.gethostname()}:{os.getpid()}:{_instance_token()}"
+
+def _owner_exited(owner: Optional[str], registered: Dict[int, str]) -> bool:
+    """
+    Check whether the process owning a job is gone.
+
+    Args:
+        owner: Owner recorded on the job (see ``process_owner``)
+        registered: Token of the latest process registered under each PID on this host
+
+    Returns:
+        True if the owner has exited, False if it is (or may be) alive
+    """
+    if not owner:
+        # Created before owners were recorded
+        return True
+    # Owners recorded before instance tokens were added are 'host:pid'
+    host, pid, *token = owner.split(":")
+    token = token[0] if token else None
+    if host != socket.gethostname() or os.name == "nt":
+        # Processes on other hosts (or on Windows) cannot be probed; assume they are alive
+        return False
+    try:
+        pid = int(pid)
+    except ValueError:
+        return True
+    if pid == os.getpid():
+        # Either this process or an earlier one that had the same PID
+        return token != _instance_token()
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return True
+    except OSError:
+        # The process exists but belongs to another user
+        pass
+    # The PID is in use; if a newer process registered under it, the owner is gone
+    current = registered.get(pid)
+    return token is not None and current is not None and current != token
+
+class JobStore:
+    """
+    SQLite-backed store of translation jobs.
+
+    Every update is a single statement, so concurrent writers from other
+    threads or processes never see a partially updated job.
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Initialize the job store.
+
+        Args:
+            db_path: Path to the SQLite database file (created if missing)
+        """
+        self.db_path = str(db_path)
+
+        db_dir = os.path.dirname(os.path.abspath(self.db_path))
+        os.makedirs(db_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                progress REAL NOT NULL DEFAULT 0,
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL,
+                error TEXT,
+                input_file TEXT NOT NULL,
+                target_lang TEXT NOT NULL,
+                model TEXT NOT NULL,
+                output_file TEXT,
+                validation_score REAL,
+                content_sha256 TEXT,
+                file_size INTEGER,
+                dedup_key TEXT,
+                progress_detail TEXT,
+                owner TEXT
+            )
+            """
+        )
+        existing = {row["name"] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        for column, column_type in _ADDED_COLUMNS.items():
+            if column not in existing:
+                self._conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {column_type}")
+        # Instance token of the latest process started under each host and PID
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS processes (
+                host TEXT NOT NULL,
+                pid INTEGER NOT NULL,
+                token TEXT NOT NULL,
+                started_at TEXT NOT NULL,
+                PRIMARY KEY (host, pid)
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_jobs_created_at ON jobs (created_at, job_id)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_jobs_status_created_at ON jobs (status, created_at, job_id)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_jobs_dedup_key ON jobs (dedup_key, created_at)"
+        )
+        self._conn.commit()
+        logger.info(f"Opened job store at {self.db_path}")
+
+    def create(self, job_id: str, input_file: str, target_lang: str, model: str,
+               status: str = "queued", content_sha256: Optional[str] = None,
+               file_size: Optional[int] = None, dedup_key: Optional[str] = None,
+               owner: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Create a job record.
+
+        Args:
+            job_id: Job ID
+            input_file: Name of the uploaded file
+            target_lang: Target language code
+            model: Translation model
+            status: Initial status
+            content_sha256: SHA-256 hex digest of the uploaded file
+            file_size: Size of the uploaded file in bytes
+            dedup_key: Key identifying the output (see ``artifact_cache.artifact_key``)
+            owner: Process that will run the job (see ``process_owner``)
+
+        Returns:
+            The new job record
+        """
+        job = self._new_job(job_id, input_file, target_lang, model, status,
+                            content_sha256, file_size, dedup_key, owner)
+        with self._lock:
+            self._insert(job)
+            self._conn.commit()
+        return job
+
+    def create_or_attach(self, job_id: str, input_file: str, target_lang: str, model: str,
+                         dedup_key: str, content_sha256: Optional[str] = None,
+                         file_size: Optional[int] = None,
+                         owner: Optional[str] = None) -> Tuple[Dict[str, Any], bool]:
+        """
+        Create a job unless a queued, running or completed job has the same key.
+
+        The lookup and the insert run in one write transaction, so concurrent
+        submissions of the same document from any process end up on one job.
+
+        Args:
+            job_id: ID for the new job
+            input_file: Name of the uploaded file
+            target_lang: Target language code
+            model: Translation model
+            dedup_key: Key identifying the output (see ``artifact_cache.artifact_key``)
+            content_sha256: SHA-256 hex digest of the uploaded file
+            file_size: Size of the uploaded file in bytes
+            owner: Process that will run the job if it is created (see ``process_owner``)
+
+        Returns:
+            Tuple of (job record, True if the job was created or False if an
+            existing job was returned)
+        """
+        placeholders = ", ".join("?" * len(_REUSABLE_STATUSES))
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    f"SELECT * FROM jobs WHERE dedup_key = ? AND status IN ({placeholders}) "
+                    "ORDER BY created_at DESC LIMIT 1",
+                    (dedup_key, *_REUSABLE_STATUSES)
+                ).fetchone()
+                if row is None:
+                    job = self._new_job(job_id, input_file, target_lang, model, "queued",
+                                        content_sha256, file_size, dedup_key, owner)
+                    self._insert(job)
+                self._conn.commit()
+            except BaseException:
+                self._conn.rollback()
+                raise
+        if row is not None:
+            return self._row_to_job(row), False
+        return job, True
+
+    def fail_abandoned(self, error: str = "Job was interrupted by a server restart") -> List[str]:
+        """
+        Fail queued and running jobs whose owning process has exited.
+
+        Such jobs were held in that process's in-memory job queue and will never
+        run, so their dedup key is cleared and identical uploads start a new
+        job. Call this when a process starts, before it queues jobs of its own:
+        it also registers the process's instance token, so that jobs of an
+        exited process whose PID was reused are recognized as abandoned.
+
+        Args:
+            error: Error message recorded on the failed jobs
+
+        Returns:
+            IDs of the jobs marked as failed
+        """
+        placeholders = ", ".join("?" * len(_ACTIVE_STATUSES))
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = _now()
+                host = socket.gethostname()
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO processes (host, pid, token, started_at) VALUES (?, ?, ?, ?)",
+                    (host, os.getpid(), _instance_token(), now)
+                )
+                registered = {
+                    row["pid"]: row["token"]
+                    for row in self._conn.execute("SELECT pid, token FROM processes WHERE host = ?", (host,))
+                }
+                rows = self._conn.execute(
+                    f"SELECT job_id, owner FROM jobs WHERE status IN ({placeholders})", _ACTIVE_STATUSES
+                ).fetchall()
+                abandoned = [row["job_id"] for row in rows if _owner_exited(row["owner"], registered)]
+                self._conn.executemany(
+                    "UPDATE jobs SET status = 'failed', error = ?, dedup_key = NULL, updated_at = ? "
+                    f"WHERE job_id = ? AND status IN ({placeholders})",
+                    [(error, now, job_id, *_ACTIVE_STATUSES) for job_id in abandoned]
+                )
+                self._conn.commit()
+            except BaseException:
+                self._conn.rollback()
+                raise
+        if abandoned:
+            logger.warning(f"Marked {len(abandoned)} abandoned jobs as failed")
+        return abandoned
+
+    @staticmethod
+    def _new_job(job_id: str, input_file: str, target_lang: str, model: str, status: str,
+                 content_sha256: Optional[str], file_size: Optional[int],
+                 dedup_key: Optional[str], owner: Optional[str] = None) -> Dict[str, Any]:
+        now = _now()
+        return {
+            "job_id": job_id,
+            "status": status,
+            "progress": 0.0,
+            "created_at": now,
+            "updated_at": now,
+            "error": None,
+            "input_file": input_file,
+            "target_lang": target_lang,
+            "model": model,
+            "output_file": None,
+            "validation_score": None,
+            "content_sha256": content_sha256,
+            "file_size": file_size,
+            "dedup_key": dedup_key,
+            "progress_detail": None,
+            "owner": owner,
+        }
+
+    @staticmethod
+    def _row_to_job(row: sqlite3.Row) -> Dict[str, Any]:
+        job = dict(row)
+        for field in _JSON_FIELDS:
+            if job[field] is not None:
+                job[field] = json.loads(job[field])
+        return job
+
+    def _insert(self, job: Dict[str, Any]) -> None:
+        """Insert a job record. Caller must hold the lock and commit."""
+        self._conn.execute(
+            f"INSERT INTO jobs ({', '.join(JOB_FIELDS)}) VALUES ({', '.join('?' * len(JOB_FIELDS))})",
+            [job[field] for field in JOB_FIELDS]
+        )
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a job.
+
+        Args:
+            job_id: Job ID
+
+        Returns:
+            The job record, or None if there is no such job
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return self._row_to_job(row) if row is not None else None
+
+    def update(self, job_id: str, **fields: Any) -> bool:
+        """
+        Atomically update fields of a job and its ``updated_at`` timestamp.
+
+        Args:
+            job_id: Job ID
+            **fields: Any of status, progress, error, output_file, validation_score, dedup_key,
+                progress_detail (any JSON-serializable value)
+
+        Returns:
+            True if the job exists and was updated, False otherwise
+        """
+        unknown = set(fields) - _MUTABLE_FIELDS
+        if unknown:
+            raise ValueError(f"Cannot update job fields: {', '.join(sorted(unknown))}")
+
+        for field in _JSON_FIELDS & set(fields):
+            if fields[field] is not None:
+                fields[field] = json.dumps(fields[field])
+        fields["updated_at"] = _now()
+        assignments = ", ".join(f"{field} = ?" for field in fields)
+        with self._lock:
+            cursor = self._conn.execute(
+                f"UPDATE jobs SET {assignments} WHERE job_id = ?", [*fields.values(), job_id]
+            )
+            self._conn.commit()
+        return cursor.rowcount > 0
+
+    def delete(self, job_id: str) -> bool:
+        """
+        Delete a job record.
+
+        Args:
+            job_id: Job ID
+
+        Returns:
+            True if the job existed
+        """
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM jobs WHERE job_id = ?", (job_id,))
+            self._conn.commit()
+        return cursor.rowcount > 0
+
+    @staticmethod
+    def encode_cursor(job: Dict[str, Any]) -> str:
+        """Build the opaque pagination cursor pointing just past a job."""
+        payload = json.dumps([job["created_at"], job["job_id"]]).encode("utf-8")
+        return base64.urlsafe_b64encode(payload).decode("ascii")
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[str, str]:
+        """
+        Parse a pagination cursor.
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        try:
+            created_at, job_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        except (binascii.Error, UnicodeError, TypeError, ValueError):
+            raise ValueError(f"Invalid cursor: {cursor}") from None
+        return str(created_at), str(job_id)
+
+    def list(self, limit: int = 10, status: Optional[str] = None,
+             cursor: Optional[str] = None, offset: int = 0) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        List jobs, newest first.
+
+        Args:
+            limit: Maximum number of jobs to return
+            status: Only return jobs with this status
+            cursor: Cursor returned with the previous page
+            offset: Number of jobs to skip (for clients without a cursor; costs
+                time proportional to the offset)
+
+        Returns:
+            Tuple of (jobs, cursor for the next page or None if this is the last page)
+        """
+        conditions = []
+        params: List[Any] = []
+        if status:
+            conditions.append("status = ?")
+            params.append(status)
+        if cursor:
+            conditions.append("(created_at, job_id) < (?, ?)")
+            params.extend(self.decode_cursor(cursor))
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        # Fetch one extra row to know whether there is a next page
+        query = (f"SELECT * FROM jobs {where} ORDER BY created_at DESC, job_id DESC "
+                 f"LIMIT ? OFFSET ?")
+        with self._lock:
+            rows = self._conn.execute(query, [*params, limit + 1, offset]).fetchall()
+
+        jobs = [self._row_to_job(row) for row in rows[:limit]]
+        next_cursor = self.encode_cursor(jobs[-1]) if len(rows) > limit else None
+        return jobs, next_cursor
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,134 @@
+"""
+LLM client registry for AutoWealthTranslate.
+
+This module keeps one API client per (provider, base_url, api_key) for the
+whole process so that HTTP keep-alive connections and TLS sessions are reused
+across translation requests instead of being re-established for every call.
+Retries are left to the rate limiter (see ``rate_limiter``), so the clients
+themselves never retry.
+"""
+
+import asyncio
+import threading
+import weakref
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+import openai
+
+from auto_wealth_translate.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Default API endpoints per provider (None means the OpenAI default)
+PROVIDER_BASE_URLS = {
+    "openai": None,
+    "xai": "https://api.x.ai/v1",
+}
+
+# Connection pool settings applied to newly created clients
+CLIENT_POOL_SETTINGS = {
+    "max_connections": 100,
+    "max_keepalive_connections": 20,
+    "keepalive_expiry": 30.0,
+    "timeout": 60.0,
+    "connect_timeout": 10.0,
+}
+
+_lock = threading.Lock()
+_clients: Dict[Tuple[str, Optional[str], str], openai.OpenAI] = {}
+# Async clients hold connections bound to the event loop they were used on
+_async_clients = weakref.WeakKeyDictionary()
+
+def configure_client_pool(**settings: Any) -> None:
+    """
+    Update connection pool settings.
+
+    Existing clients are closed so that the new settings take effect on the
+    next request.
+
+    Args:
+        **settings: Any of the keys in ``CLIENT_POOL_SETTINGS``
+    """
+    unknown = set(settings) - set(CLIENT_POOL_SETTINGS)
+    if unknown:
+        raise ValueError(f"Unknown client pool settings: {', '.join(sorted(unknown))}")
+    CLIENT_POOL_SETTINGS.update(settings)
+    close_clients()
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=CLIENT_POOL_SETTINGS["max_connections"],
+        max_keepalive_connections=CLIENT_POOL_SETTINGS["max_keepalive_connections"],
+        keepalive_expiry=CLIENT_POOL_SETTINGS["keepalive_expiry"],
+    )
+
+def _timeout() -> httpx.Timeout:
+    return httpx.Timeout(
+        CLIENT_POOL_SETTINGS["timeout"],
+        connect=CLIENT_POOL_SETTINGS["connect_timeout"],
+    )
+
+def _resolve_base_url(provider: str, base_url: Optional[str]) -> Optional[str]:
+    return base_url if base_url is not None else PROVIDER_BASE_URLS.get(provider)
+
+def get_client(provider: str, api_key: str, base_url: Optional[str] = None) -> openai.OpenAI:
+    """
+    Get the shared client for a provider, creating it on first use.
+
+    Args:
+        provider: Provider key (e.g. 'openai', 'xai')
+        api_key: API key for the provider
+        base_url: Optional API endpoint overriding the provider default
+
+    Returns:
+        A pooled ``openai.OpenAI`` client
+    """
+    base_url = _resolve_base_url(provider, base_url)
+    key = (provider, base_url, api_key)
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            http_client = httpx.Client(limits=_limits(), timeout=_timeout())
+            client = openai.OpenAI(api_key=api_key, base_url=base_url, http_client=http_client,
+                                   max_retries=0)
+            _clients[key] = client
+            logger.info(f"Created pooled {provider} client")
+        return client
+
+def get_async_client(provider: str, api_key: str, base_url: Optional[str] = None) -> openai.AsyncOpenAI:
+    """
+    Get the shared async client for a provider on the running event loop.
+
+    Args:
+        provider: Provider key (e.g. 'openai', 'xai')
+        api_key: API key for the provider
+        base_url: Optional API endpoint overriding the provider default
+
+    Returns:
+        A pooled ``openai.AsyncOpenAI`` client
+    """
+    loop = asyncio.get_running_loop()
+    base_url = _resolve_base_url(provider, base_url)
+    key = (provider, base_url, api_key)
+    with _lock:
+        clients = _async_clients.setdefault(loop, {})
+        client = clients.get(key)
+        if client is None:
+            http_client = httpx.AsyncClient(limits=_limits(), timeout=_timeout())
+            client = openai.AsyncOpenAI(api_key=api_key, base_url=base_url, http_client=http_client,
+                                        max_retries=0)
+            clients[key] = client
+            logger.info(f"Created pooled async {provider} client")
+        return client
+
+def close_clients() -> None:
+    """Close all pooled synchronous clients and forget all async clients."""
+    with _lock:
+        for client in _clients.values():
+            try:
+                client.close()
+            except Exception as e:
+                logger.warning(f"Error closing API client: {str(e)}")
+        _clients.clear()
+        _async_clients.clear()
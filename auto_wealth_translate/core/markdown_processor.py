@@ -5,7 +5,9 @@ import fitz
 import re
 import os
 import base64
-from typing import List, Dict, Any, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from typing import List, Dict, Any, Optional, Tuple, Union, Iterable, BinaryIO
 import logging
 from pathlib import Path
 import markdown
@@ -17,39 +19,125 @@ import tempfile
 import subprocess
 import os
 
+from auto_wealth_translate.core.document_processor import (
+    DocumentComponent, TextComponent, TableComponent, ImageComponent, assign_component_ids
+)
+
 logger = logging.getLogger(__name__)
 
+def _is_cjk(char: str) -> bool:
+    """Check whether a character is a CJK ideograph, kana, hangul or full-width punctuation."""
+    code = ord(char)
+    return (0x3000 <= code <= 0x9fff or 0xac00 <= code <= 0xd7af or
+            0xf900 <= code <= 0xfaff or 0xff00 <= code <= 0xffef)
+
 class MarkdownProcessor:
     """Process documents through Markdown format."""
     
-    def __init__(self):
-        """Initialize the processor."""
+    # Post-editing policies for translated Markdown
+    POST_EDIT_OFF = "off"            # No LLM editing pass
+    POST_EDIT_FLAGGED = "flagged"    # Edit only failed or low-confidence segments
+    POST_EDIT_ALL = "all"            # Edit the whole document in chunks
+    POST_EDIT_POLICIES = (POST_EDIT_OFF, POST_EDIT_FLAGGED, POST_EDIT_ALL)
+    
+    # Translated/source length ratios outside this range mark a segment as low-confidence
+    LOW_CONFIDENCE_LENGTH_RATIO = (0.2, 5.0)
+    
+    # Maximum characters of running text combined into one translation segment
+    MAX_SEGMENT_CHARS = 2000
+    
+    def __init__(self, max_concurrency: Optional[int] = None, post_edit: str = POST_EDIT_OFF,
+                 post_edit_token_budget: Optional[int] = None):
+        """
+        Initialize the processor.
+        
+        Args:
+            max_concurrency: Maximum number of translation requests in flight
+                             (defaults to the translation service's ``max_concurrency``)
+            post_edit: Post-editing policy ('off', 'flagged' or 'all')
+            post_edit_token_budget: Maximum estimated tokens to spend on post-editing
+                                    per document (no limit if not given)
+        """
+        if post_edit not in self.POST_EDIT_POLICIES:
+            raise ValueError(f"Unknown post-edit policy: {post_edit}")
+        
         self.md_converter = markdown.Markdown(extensions=['tables', 'fenced_code'])
         self.image_dir = None
+        self.max_concurrency = max_concurrency
+        self.post_edit = post_edit
+        self.post_edit_token_budget = post_edit_token_budget
         
-    def pdf_to_markdown(self, pdf_path: str) -> str:
+        # Token accounting for the last translate_markdown() call
+        self.usage = {}
+    
+    def _max_workers(self, translator) -> int:
+        """Number of threads used to translate segments and post-processing chunks."""
+        return max(1, self.max_concurrency or getattr(translator, "max_concurrency", 1))
+        
+    def pdf_to_markdown(self, pdf_path: Union[str, fitz.Document], pages: Optional[Iterable[int]] = None) -> str:
         """
         Convert PDF to Markdown while preserving structure.
         
         Args:
-            pdf_path: Path to the PDF file
+            pdf_path: Path to the PDF file, or an already open document
+            pages: Zero-based page numbers to convert (all pages if not given)
+            
+        Returns:
+            str: Markdown content
+        """
+        return self._convert_pdf(pdf_path, pages)
+    
+    def pdf_to_markdown_with_components(self, pdf_path: Union[str, fitz.Document],
+                                        pages: Optional[Iterable[int]] = None) -> Tuple[str, List[DocumentComponent]]:
+        """
+        Convert PDF to Markdown and collect a component inventory in the same pass.
+        
+        The components are built from the text blocks, images and tables already
+        read for the Markdown, so the PDF is opened and parsed only once. They
+        are meant for validation and statistics; use ``DocumentProcessor`` when
+        layout-accurate components (or OCR) are needed for rebuilding.
+        
+        Args:
+            pdf_path: Path to the PDF file, or an already open document
+            pages: Zero-based page numbers to convert (all pages if not given)
+            
+        Returns:
+            Tuple of (Markdown content, document components)
+        """
+        components = []
+        md_content = self._convert_pdf(pdf_path, pages, components)
+        assign_component_ids(components)
+        return md_content, components
+    
+    def _convert_pdf(self, pdf_path: Union[str, fitz.Document], pages: Optional[Iterable[int]] = None,
+                     components: Optional[List[DocumentComponent]] = None) -> str:
+        """
+        Convert PDF to Markdown, optionally appending document components to ``components``.
+        
+        Args:
+            pdf_path: Path to the PDF file, or an already open document
+            pages: Zero-based page numbers to convert (all pages if not given)
+            components: List to collect components into, or None to skip collecting
             
         Returns:
             str: Markdown content
         """
         try:
-            doc = fitz.open(pdf_path)
+            doc = pdf_path if isinstance(pdf_path, fitz.Document) else fitz.open(pdf_path)
+            doc_name = doc.name or f"stream_{id(doc)}"
             md_content = []
             
-            logger.info(f"Converting PDF to Markdown: {pdf_path}")
+            logger.info(f"Converting PDF to Markdown: {doc_name}")
             logger.info(f"PDF has {len(doc)} pages")
             
             # Create temporary directory for images
-            self.image_dir = Path(tempfile.gettempdir()) / f"md_images_{Path(pdf_path).stem}"
+            self.image_dir = Path(tempfile.gettempdir()) / f"md_images_{Path(doc_name).stem}"
             self.image_dir.mkdir(parents=True, exist_ok=True)
             logger.info(f"Created image directory: {self.image_dir}")
             
-            for page_num, page in enumerate(doc):
+            page_numbers = range(len(doc)) if pages is None else pages
+            for page_num in page_numbers:
+                page = doc[page_num]
                 # Extract text blocks with their properties
                 text_dict = page.get_text("dict")
                 blocks = text_dict["blocks"]
@@ -81,41 +169,32 @@ class MarkdownProcessor:
                         # Add image reference to markdown content
                         md_content.append(f"\n![Image {page_num+1}-{img_idx}]({img_path})\n")
                         logger.info(f"Added image reference to {img_path}")
+                        
+                        if components is not None:
+                            components.append(self._image_component(page, page_num, img_info, base_image))
                     except Exception as img_err:
                         logger.error(f"Error extracting image {img_idx} on page {page_num+1}: {str(img_err)}")
                 
-                for block_idx, block in enumerate(blocks):
-                    if "lines" in block:
-                        for line_idx, line in enumerate(block["lines"]):
-                            line_text = ""
-                            for span in line["spans"]:
-                                text = span["text"].strip()
-                                if not text:
-                                    continue
-                                    
-                                # Log extracted text for debugging
-                                logger.debug(f"Block {block_idx}, Line {line_idx}, Text: {text[:50]}{'...' if len(text) > 50 else ''}")
-                                line_text += text + " "
-                                    
-                                # Determine text style
-                                font_size = span["size"]
-                                font_name = span["font"]
-                                is_bold = "bold" in font_name.lower()
-                                
-                                # Add text with appropriate markdown formatting
-                                if font_size > 14:
-                                    md_content.append(f"# {text}")
-                                elif font_size > 12:
-                                    md_content.append(f"## {text}")
-                                elif is_bold:
-                                    md_content.append(f"**{text}**")
-                                else:
-                                    md_content.append(text)
-                            
-                            # Log full line text
-                            if line_text.strip():
-                                logger.debug(f"Full line text: {line_text.strip()}")
-                                    
+                if components is not None:
+                    components.extend(self._text_components(page, page_num, blocks))
+                    components.extend(self._table_components(page, page_num))
+                
+                # Merge spans into paragraphs so each paragraph becomes one Markdown line
+                for paragraph in self._build_paragraphs(blocks):
+                    text = paragraph["text"]
+                    logger.debug(f"Paragraph on page {page_num+1}: {text[:50]}{'...' if len(text) > 50 else ''}")
+                    
+                    # Add text with appropriate markdown formatting
+                    if paragraph["size"] > 14:
+                        md_content.append(f"# {text}")
+                    elif paragraph["size"] > 12:
+                        md_content.append(f"## {text}")
+                    elif paragraph["bold"]:
+                        md_content.append(f"**{text}**")
+                    else:
+                        md_content.append(text)
+                    md_content.append("")
+                    
                 # Add page break
                 md_content.append("\n---\n")
             
@@ -128,6 +207,170 @@ class MarkdownProcessor:
         except Exception as e:
             logger.error(f"Error converting PDF to Markdown: {str(e)}")
             raise
+    
+    @classmethod
+    def _build_paragraphs(cls, blocks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Merge the spans of ``page.get_text("dict")`` blocks into paragraphs.
+        
+        Spans are first joined into lines. Consecutive lines, including lines
+        from neighbouring blocks, are merged while the font stays the same and
+        the vertical gap stays within normal line spacing.
+        
+        Args:
+            blocks: Blocks from ``page.get_text("dict")``
+            
+        Returns:
+            List of paragraphs with their text, dominant font size, bold flag and bbox
+        """
+        paragraphs = []
+        current = None
+        
+        for block_idx, block in enumerate(blocks):
+            for line in block.get("lines", []):
+                line_info = cls._line_info(line, block_idx)
+                if line_info is None:
+                    continue
+                
+                if current is not None and cls._continues_paragraph(current, line_info):
+                    current["text"] = cls._join_text(current["text"], line_info["text"])
+                    current["bbox"] = (
+                        min(current["bbox"][0], line_info["bbox"][0]),
+                        min(current["bbox"][1], line_info["bbox"][1]),
+                        max(current["bbox"][2], line_info["bbox"][2]),
+                        max(current["bbox"][3], line_info["bbox"][3]),
+                    )
+                    current["last_line"] = line_info
+                else:
+                    current = dict(line_info, last_line=line_info)
+                    paragraphs.append(current)
+        
+        for paragraph in paragraphs:
+            del paragraph["last_line"]
+        return paragraphs
+    
+    @staticmethod
+    def _line_info(line: Dict[str, Any], block_idx: int) -> Optional[Dict[str, Any]]:
+        """Join the spans of a line and find its dominant font (by character count)."""
+        text = ""
+        weights = {}
+        for span in line["spans"]:
+            if not span["text"].strip():
+                text += span["text"]
+                continue
+            text += span["text"]
+            style = (round(span["size"], 1), "bold" in span["font"].lower())
+            weights[style] = weights.get(style, 0) + len(span["text"].strip())
+        
+        text = " ".join(text.split())
+        if not text:
+            return None
+        size, bold = max(weights, key=weights.get)
+        return {"text": text, "size": size, "bold": bold, "bbox": tuple(line["bbox"]), "block": block_idx}
+    
+    @staticmethod
+    def _continues_paragraph(paragraph: Dict[str, Any], line: Dict[str, Any]) -> bool:
+        """Decide whether a line continues the current paragraph."""
+        previous = paragraph["last_line"]
+        
+        # Font continuity: headings, bold runs and body text stay separate
+        if abs(previous["size"] - line["size"]) > 0.5 or previous["bold"] != line["bold"]:
+            return False
+        
+        prev_x0, prev_y0, prev_x1, prev_y1 = previous["bbox"]
+        x0, y0, x1, y1 = line["bbox"]
+        line_height = max(prev_y1 - prev_y0, y1 - y0, 1.0)
+        
+        # Lines on the same baseline (e.g. a line split into several pieces)
+        if y0 < prev_y1 - line_height / 2:
+            return line["block"] == previous["block"]
+        
+        # A gap larger than normal line spacing starts a new paragraph
+        if y0 - prev_y1 > line_height * 0.6:
+            return False
+        
+        # Within a block the layout engine already grouped the lines
+        if line["block"] == previous["block"]:
+            return True
+        
+        # Across blocks, only merge lines of the same column
+        return x0 < prev_x1 and prev_x0 < x1
+    
+    @staticmethod
+    def _join_text(text: str, continuation: str) -> str:
+        """Join two lines of a paragraph, undoing hyphenation and spacing CJK correctly."""
+        if text.endswith("-") and continuation[:1].islower():
+            return text[:-1] + continuation
+        if _is_cjk(text[-1]) or _is_cjk(continuation[0]):
+            return text + continuation
+        return f"{text} {continuation}"
+    
+    @staticmethod
+    def _text_components(page, page_num: int, blocks: List[Dict[str, Any]]) -> List[TextComponent]:
+        """Build text components from the blocks of ``page.get_text("dict")``."""
+        text_components = []
+        for block in blocks:
+            if "lines" not in block:
+                continue
+            spans = [span for line in block["lines"] for span in line["spans"]]
+            text = "\n".join(
+                "".join(span["text"] for span in line["spans"]) for line in block["lines"]
+            )
+            if not text.strip():
+                continue
+            x0, y0, x1, y1 = block["bbox"]
+            text_components.append(TextComponent(
+                component_id="",
+                component_type="text",
+                page_number=page_num + 1,
+                text=text,
+                font_info={"size": spans[0]["size"], "font": spans[0]["font"]} if spans else {},
+                position={"x0": x0, "y0": y0, "x1": x1, "y1": y1},
+                is_header=y0 < 100,
+                is_footer=y1 > page.rect.height - 100
+            ))
+        return text_components
+    
+    @staticmethod
+    def _table_components(page, page_num: int) -> List[TableComponent]:
+        """Build table components with PyMuPDF's table finder, if this PyMuPDF has one."""
+        find_tables = getattr(page, "find_tables", None)
+        if find_tables is None:
+            return []
+        
+        table_components = []
+        try:
+            for table in find_tables().tables:
+                rows = [[str(cell) if cell is not None else "" for cell in row] for row in table.extract()]
+                x0, y0, x1, y1 = table.bbox
+                table_components.append(TableComponent(
+                    component_id="",
+                    component_type="table",
+                    page_number=page_num + 1,
+                    rows=rows,
+                    position={"x0": x0, "y0": y0, "x1": x1, "y1": y1}
+                ))
+        except Exception as e:
+            logger.error(f"Error finding tables on page {page_num+1}: {str(e)}")
+        return table_components
+    
+    @staticmethod
+    def _image_component(page, page_num: int, img_info, base_image: Dict[str, Any]) -> ImageComponent:
+        """Build an image component from an image already extracted for the Markdown."""
+        try:
+            rects = page.get_image_rects(img_info[0])
+        except Exception:
+            rects = []
+        rect = rects[0] if rects else fitz.Rect(100, 100, 400, 400)  # Default position
+        return ImageComponent(
+            component_id="",
+            component_type="image",
+            page_number=page_num + 1,
+            image_data=base_image["image"],
+            image_format=base_image["ext"],
+            size=(base_image["width"], base_image["height"]),
+            position={"x0": rect.x0, "y0": rect.y0, "x1": rect.x1, "y1": rect.y1}
+        )
             
     def translate_markdown(self, md_content: str, translator) -> str:
         """
@@ -145,124 +388,47 @@ class MarkdownProcessor:
             logger.info(f"Original markdown sample (first 300 chars): {md_content[:300]}...")
             logger.info(f"Translating from {translator.source_lang} to {translator.target_lang}")
             
+            self.usage = {
+                "translation_tokens": 0,
+                "post_edit_tokens": 0,
+                "post_edit_requests": 0,
+                "post_edit_skipped": 0,
+                "flagged_segments": 0,
+            }
+            # Tokens reported for this document's own requests; the translator may be shared
+            translation_usage = {}
+            
             # Split content into translatable segments
             segments = self._split_markdown(md_content)
-            translated_segments = []
             
             logger.info(f"Split markdown into {len(segments)} segments")
             
+            # Translate segments concurrently; map() keeps the results in document order
+            with ThreadPoolExecutor(max_workers=self._max_workers(translator)) as executor:
+                results = list(executor.map(
+                    lambda item: self._translate_segment(item[0], item[1], translator, translation_usage),
+                    enumerate(segments)
+                ))
+            
+            translated_segments = [translated for translated, _ in results]
+            
             # Keep track of failed translations
-            failed_segments = []
-            
-            for i, segment in enumerate(segments):
-                if segment["type"] == "text":
-                    # Skip if segment is empty or whitespace
-                    if not segment["content"].strip():
-                        translated_segments.append(segment)
-                        continue
-                    
-                    # Log the original text segment
-                    logger.info(f"Segment {i} (original): {segment['content'][:100]}{'...' if len(segment['content']) > 100 else ''}")
-                    
-                    # Check if the segment contains mathematical formulas or special characters
-                    content = segment['content']
-                    has_math = self._contains_math_or_special_chars(content)
-                    
-                    try:
-                        # Get the target language code
-                        target_lang = translator.target_lang
-                        
-                        # For Chinese translation, use a custom approach
-                        if target_lang == "zh":
-                            # If the segment contains math formulas, preserve it as is
-                            if has_math:
-                                logger.info(f"Segment {i} contains mathematical notation, preserving it as is")
-                                translated_segments.append(segment)
-                                continue
-                                
-                            logger.info(f"Using specialized approach for Chinese translation of segment {i}")
-                            
-                            # Create explicit instruction for Chinese translation
-                            instruction = f"""
-                            Translate the following text from {translator.language_names.get(translator.source_lang, translator.source_lang)} to Chinese (Simplified).
-                            
-                            Rules:
-                            1. ONLY respond with the translated text
-                            2. Keep all formatting and special characters
-                            3. Use appropriate Chinese financial terminology
-                            4. Ensure output is in UTF-8 encoded Chinese characters
-                            5. Do not add any comments, explanations, or notes
-                            6. DO NOT translate mathematical formulas, variable names, or equations - keep them exactly as they are
-                            
-                            Text to translate:
-                            {segment['content']}
-                            """
-                            
-                            # Use direct call with temperature = 0 for consistency
-                            translated_text = translator._translate_with_openai(
-                                text=instruction,
-                                target_lang="zh",
-                                temperature=0.0
-                            )
-                            
-                            # Verify Chinese characters are present
-                            has_chinese = any('\u4e00' <= char <= '\u9fff' for char in translated_text)
-                            if not has_chinese:
-                                logger.warning(f"No Chinese characters found in translation output for segment {i}! Content: {translated_text[:100]}")
-                                
-                                # For segments with special characters or math formulas, preserve original
-                                if self._contains_complex_notation(segment['content']):
-                                    logger.info(f"Segment {i} contains complex notation, preserving original")
-                                    translated_segments.append(segment)
-                                    continue
-                                
-                                # Try one more time with simpler instruction
-                                retry_instruction = f"将以下文本翻译成中文(不要添加任何解释,只需给出翻译结果,保留所有数学公式和特殊符号不变):\n\n{segment['content']}"
-                                translated_text = translator._translate_with_openai(
-                                    text=retry_instruction, 
-                                    target_lang="zh",
-                                    temperature=0.0
-                                )
-                                
-                                # Check again
-                                has_chinese = any('\u4e00' <= char <= '\u9fff' for char in translated_text)
-                                if not has_chinese:
-                                    logger.error(f"Second attempt also failed to produce Chinese characters for segment {i}")
-                                    # Preserve original content if translation fails
-                                    translated_segments.append(segment)
-                                    # Record failed segment for reference
-                                    failed_segments.append(i)
-                                    continue
-                                else:
-                                    logger.info(f"Second attempt successfully produced Chinese characters for segment {i}")
-                            else:
-                                logger.info(f"Chinese characters verified in translation output for segment {i}")
-                                
-                        else:
-                            # For other languages, use standard approach
-                            translated_text = translator._translate_with_openai(
-                                text=segment["content"],
-                                target_lang=target_lang,
-                                temperature=0.3
-                            )
-                        
-                        # Log the translated segment
-                        logger.info(f"Segment {i} (translated): {translated_text[:100]}{'...' if len(translated_text) > 100 else ''}")
-                        
-                        # Store the translated segment
-                        translated_segments.append({
-                            "type": "text",
-                            "content": translated_text
-                        })
-                        
-                    except Exception as e:
-                        logger.error(f"Error translating segment {i}: {str(e)}")
-                        # Fall back to original content on error
-                        translated_segments.append(segment)
-                        failed_segments.append(i)
-                else:
-                    # Keep formatting intact
-                    translated_segments.append(segment)
+            failed_segments = [i for i, (_, failed) in enumerate(results) if failed]
+            self.usage["translation_tokens"] = translation_usage.get("total_tokens", 0)
+            
+            # Post-edit only the segments that failed or look suspicious
+            if self.post_edit == self.POST_EDIT_FLAGGED:
+                failed = set(failed_segments)
+                flagged = [
+                    i for i, (segment, translated) in enumerate(zip(segments, translated_segments))
+                    if i in failed or self._is_low_confidence(segment, translated)
+                ]
+                self.usage["flagged_segments"] = len(flagged)
+                if flagged:
+                    logger.info(f"Post-editing {len(flagged)} flagged segments")
+                    edited = self._post_edit([translated_segments[i]["content"] for i in flagged], translator)
+                    for i, content in zip(flagged, edited):
+                        translated_segments[i] = {"type": "text", "content": content}
             
             # Reconstruct markdown
             result = self._reconstruct_markdown(translated_segments)
@@ -279,35 +445,180 @@ class MarkdownProcessor:
                 else:
                     logger.info("Chinese characters verified in the translated content")
             
-            # Post-process the translated content if there are failed segments or if it's Chinese
-            # This step improves the formatting and flow of the translated document
-            if failed_segments or translator.target_lang == "zh":
+            # Post-process the whole translated document only when explicitly requested;
+            # this roughly doubles the tokens spent on the document
+            if self.post_edit == self.POST_EDIT_ALL:
                 result = self._post_process_translation(result, translator, failed_segments)
                 logger.info("Applied post-processing to improve translation quality and formatting")
             
+            logger.info(f"Markdown translation used {self.usage['translation_tokens']} tokens, "
+                        f"post-editing used {self.usage['post_edit_tokens']} tokens "
+                        f"({self.usage['post_edit_requests']} requests, {self.usage['post_edit_skipped']} skipped)")
+            
             return result
             
         except Exception as e:
             logger.error(f"Error translating Markdown: {str(e)}")
             raise
             
+    def _translate_segment(self, i: int, segment: Dict[str, Any], translator,
+                           usage: Optional[Dict[str, int]] = None) -> Tuple[Dict[str, Any], bool]:
+        """
+        Translate a single Markdown segment.
+        
+        Args:
+            i: Index of the segment (for logging)
+            segment: Segment from ``_split_markdown``
+            translator: Translation service instance
+            usage: Optional dictionary to which the token usage of the requests is added
+            
+        Returns:
+            Tuple of (translated segment, whether translation failed); the original
+            segment is returned when it is not translated
+        """
+        if segment["type"] != "text" or not segment["content"].strip():
+            # Keep formatting and whitespace-only segments intact
+            return segment, False
+        
+        # Log the original text segment
+        logger.info(f"Segment {i} (original): {segment['content'][:100]}{'...' if len(segment['content']) > 100 else ''}")
+        
+        # Check if the segment contains mathematical formulas or special characters
+        content = segment['content']
+        has_math = self._contains_math_or_special_chars(content)
+        
+        try:
+            # Get the target language code
+            target_lang = translator.target_lang
+            
+            # For Chinese translation, use a custom approach
+            if target_lang == "zh":
+                # If the segment contains math formulas, preserve it as is
+                if has_math:
+                    logger.info(f"Segment {i} contains mathematical notation, preserving it as is")
+                    return segment, False
+                    
+                logger.info(f"Using specialized approach for Chinese translation of segment {i}")
+                
+                # Create explicit instruction for Chinese translation
+                instruction = f"""
+                Translate the following text from {translator.language_names.get(translator.source_lang, translator.source_lang)} to Chinese (Simplified).
+                
+                Rules:
+                1. ONLY respond with the translated text
+                2. Keep all formatting and special characters
+                3. Use appropriate Chinese financial terminology
+                4. Ensure output is in UTF-8 encoded Chinese characters
+                5. Do not add any comments, explanations, or notes
+                6. DO NOT translate mathematical formulas, variable names, or equations - keep them exactly as they are
+                
+                Text to translate:
+                {segment['content']}
+                """
+                
+                # Use direct call with temperature = 0 for consistency
+                translated_text = translator._translate_with_openai(
+                    text=instruction,
+                    target_lang="zh",
+                    temperature=0.0,
+                    usage=usage
+                )
+                
+                # Verify Chinese characters are present
+                has_chinese = any('\u4e00' <= char <= '\u9fff' for char in translated_text)
+                if not has_chinese:
+                    logger.warning(f"No Chinese characters found in translation output for segment {i}! Content: {translated_text[:100]}")
+                    
+                    # For segments with special characters or math formulas, preserve original
+                    if self._contains_complex_notation(segment['content']):
+                        logger.info(f"Segment {i} contains complex notation, preserving original")
+                        return segment, False
+                    
+                    # Try one more time with simpler instruction
+                    retry_instruction = f"将以下文本翻译成中文(不要添加任何解释,只需给出翻译结果,保留所有数学公式和特殊符号不变):\n\n{segment['content']}"
+                    translated_text = translator._translate_with_openai(
+                        text=retry_instruction, 
+                        target_lang="zh",
+                        temperature=0.0,
+                        usage=usage
+                    )
+                    
+                    # Check again
+                    has_chinese = any('\u4e00' <= char <= '\u9fff' for char in translated_text)
+                    if not has_chinese:
+                        logger.error(f"Second attempt also failed to produce Chinese characters for segment {i}")
+                        # Preserve original content if translation fails and record the failure
+                        return segment, True
+                    else:
+                        logger.info(f"Second attempt successfully produced Chinese characters for segment {i}")
+                else:
+                    logger.info(f"Chinese characters verified in translation output for segment {i}")
+                    
+            else:
+                # For other languages, use standard approach
+                translated_text = translator._translate_with_openai(
+                    text=segment["content"],
+                    target_lang=target_lang,
+                    temperature=0.3,
+                    usage=usage
+                )
+            
+            # Log the translated segment
+            logger.info(f"Segment {i} (translated): {translated_text[:100]}{'...' if len(translated_text) > 100 else ''}")
+            
+            # Store the translated segment
+            return {
+                "type": "text",
+                "content": translated_text
+            }, False
+            
+        except Exception as e:
+            logger.error(f"Error translating segment {i}: {str(e)}")
+            # Fall back to original content on error
+            return segment, True
+            
     def _split_markdown(self, md_content: str) -> List[Dict[str, Any]]:
-        """Split markdown into translatable segments."""
+        """
+        Split markdown into translatable segments.
+        
+        Consecutive paragraphs separated only by blank lines are kept in one
+        text segment (up to ``MAX_SEGMENT_CHARS``), so a page of prose needs a
+        few requests instead of one per paragraph.
+        """
         segments = []
         current_text = []
+        current_length = 0
+        
+        def flush():
+            nonlocal current_text, current_length
+            # Blank lines after the last paragraph stay formatting segments
+            trailing = 0
+            while current_text and current_text[-1].strip() == "":
+                current_text.pop()
+                trailing += 1
+            if current_text:
+                segments.append({
+                    "type": "text",
+                    "content": "\n".join(current_text)
+                })
+            segments.extend({"type": "format", "content": ""} for _ in range(trailing))
+            current_text = []
+            current_length = 0
         
         for line in md_content.split("\n"):
+            # Blank lines between paragraphs are kept inside the current text segment
+            if line.strip() == "" and current_text:
+                current_text.append(line)
+                continue
+            
+            prose = self._is_prose(line)
+            
             # Check for mathematical formulas and preserve them
             if (line.strip().startswith('$') and line.strip().endswith('$')) or \
                ('\\begin{' in line and '\\end{' in line) or \
-               (self._contains_math_or_special_chars(line)):
+               (not prose and self._contains_math_or_special_chars(line)):
                 # Save any current text before the formula
-                if current_text:
-                    segments.append({
-                        "type": "text",
-                        "content": "\n".join(current_text)
-                    })
-                    current_text = []
+                flush()
                 segments.append({
                     "type": "format",
                     "content": line
@@ -316,12 +627,7 @@ class MarkdownProcessor:
                 
             # Check for image references (don't translate these)
             if line.strip().startswith("![") and "](" in line and line.endswith(")"):
-                if current_text:
-                    segments.append({
-                        "type": "text",
-                        "content": "\n".join(current_text)
-                    })
-                    current_text = []
+                flush()
                 segments.append({
                     "type": "format",
                     "content": line
@@ -330,12 +636,7 @@ class MarkdownProcessor:
                 
             # Check for headers
             if line.startswith("#"):
-                if current_text:
-                    segments.append({
-                        "type": "text",
-                        "content": "\n".join(current_text)
-                    })
-                    current_text = []
+                flush()
                 segments.append({
                     "type": "format",
                     "content": line
@@ -344,12 +645,7 @@ class MarkdownProcessor:
                 
             # Check for code blocks
             if line.strip().startswith("```") or line.strip().startswith("~~~"):
-                if current_text:
-                    segments.append({
-                        "type": "text",
-                        "content": "\n".join(current_text)
-                    })
-                    current_text = []
+                flush()
                 segments.append({
                     "type": "format",
                     "content": line
@@ -358,12 +654,7 @@ class MarkdownProcessor:
                 
             # Check for formatting
             if line.startswith(("**", "*", "`", ">", "-", "1.", "|", "---")) or line.strip() == "":
-                if current_text:
-                    segments.append({
-                        "type": "text",
-                        "content": "\n".join(current_text)
-                    })
-                    current_text = []
+                flush()
                 segments.append({
                     "type": "format",
                     "content": line
@@ -371,29 +662,41 @@ class MarkdownProcessor:
                 continue
                 
             # Check for special characters that might indicate formulas or technical content
-            if self._contains_complex_notation(line):
-                if current_text:
-                    segments.append({
-                        "type": "text",
-                        "content": "\n".join(current_text)
-                    })
-                    current_text = []
+            if not prose and self._contains_complex_notation(line):
+                flush()
                 segments.append({
                     "type": "format",
                     "content": line
                 })
                 continue
+            
+            # Keep segments small enough to translate in parallel
+            if current_text and current_length + len(line) > self.MAX_SEGMENT_CHARS:
+                flush()
                 
             # Regular text
             current_text.append(line)
+            current_length += len(line)
             
-        if current_text:
-            segments.append({
-                "type": "text",
-                "content": "\n".join(current_text)
-            })
+        flush()
             
         return segments
+    
+    @staticmethod
+    def _is_prose(line: str) -> bool:
+        """
+        Check whether a line is a paragraph of running text.
+        
+        Formula heuristics are meant for short technical lines; a paragraph
+        mentioning "Q4" or "and/or" must still be translated.
+        """
+        if sum(1 for char in line if _is_cjk(char)) >= 10:
+            return True
+        words = line.split()
+        if len(words) < 8:
+            return False
+        wordlike = sum(1 for word in words if sum(char.isalpha() for char in word) >= 2)
+        return wordlike / len(words) >= 0.6
         
     def _reconstruct_markdown(self, segments: List[Dict[str, Any]]) -> str:
         """Reconstruct markdown from translated segments."""
@@ -459,15 +762,17 @@ class MarkdownProcessor:
             logger.error(f"Error converting Markdown to DOCX: {str(e)}")
             raise
             
-    def markdown_to_pdf(self, markdown_content, output_path):
+    def markdown_to_pdf(self, markdown_content, output_path: Union[str, BinaryIO]):
         """
         Convert markdown to PDF.
         
         Args:
             markdown_content: Markdown content
-            output_path: Path to output PDF file
+            output_path: Path to output PDF file, or a writable binary stream
+                (e.g. ``io.BytesIO``) to keep the PDF in memory
         """
-        logger.info(f"Converting Markdown to PDF: {output_path}")
+        to_stream = hasattr(output_path, 'write')
+        logger.info(f"Converting Markdown to PDF: {'<stream>' if to_stream else output_path}")
         
         try:
             # First try WeasyPrint if available
@@ -642,8 +947,11 @@ class MarkdownProcessor:
                     temp_md_path = temp_md.name
                     temp_md.write(markdown_content.encode('utf-8'))
                 
+                # Pandoc can only write PDFs to a file
+                pandoc_output = os.path.splitext(temp_md_path)[0] + '.pdf' if to_stream else output_path
+                
                 # Build pandoc command - use xelatex for CJK support
-                cmd = f"pandoc {temp_md_path} -o {output_path} --pdf-engine=xelatex -V mainfont=Noto Sans -V CJKmainfont=Noto Sans CJK SC"
+                cmd = f"pandoc {temp_md_path} -o {pandoc_output} --pdf-engine=xelatex -V mainfont=Noto Sans -V CJKmainfont=Noto Sans CJK SC"
                 
                 logger.info(f"Running pandoc command: {cmd}")
                 result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
@@ -655,6 +963,11 @@ class MarkdownProcessor:
                     logger.error(f"Pandoc error: {result.stderr}")
                     raise Exception(f"Pandoc failed: {result.stderr}")
                 
+                if to_stream:
+                    with open(pandoc_output, 'rb') as f:
+                        output_path.write(f.read())
+                    os.unlink(pandoc_output)
+                
                 logger.info("Converted to PDF using Pandoc")
                 return
             except Exception as e:
@@ -756,7 +1069,7 @@ class MarkdownProcessor:
             
             # Ultimate fallback - create a simple text file with .pdf extension
             logger.warning("All PDF generation methods failed. Creating text file with .pdf extension")
-            with open(output_path, 'wb') as f:
+            with (nullcontext(output_path) if to_stream else open(output_path, 'wb')) as f:
                 f.write(b"%PDF-1.4\n")  # PDF header
                 f.write(b"1 0 obj\n<</Type /Catalog /Pages 2 0 R>>\nendobj\n")
                 f.write(b"2 0 obj\n<</Type /Pages /Kids [3 0 R] /Count 1>>\nendobj\n")
@@ -771,7 +1084,7 @@ class MarkdownProcessor:
                 f.write(b"xref\n0 6\n0000000000 65535 f \n0000000009 00000 n \n0000000056 00000 n \n0000000111 00000 n \n0000000212 00000 n \n0000000293 00000 n \n")
                 f.write(b"trailer\n<</Size 6 /Root 1 0 R>>\nstartxref\n394\n%%EOF\n")
             
-            logger.warning(f"Created minimal PDF placeholder at {output_path}")
+            logger.warning(f"Created minimal PDF placeholder at {'<stream>' if to_stream else output_path}")
             
         except Exception as e:
             logger.error(f"Error converting Markdown to PDF: {str(e)}")
@@ -883,20 +1196,90 @@ class MarkdownProcessor:
             if current_chunk:
                 chunks.append('\n'.join(current_chunk))
             
-            # Process each chunk
-            processed_chunks = []
-            for i, chunk in enumerate(chunks):
-                logger.info(f"Post-processing chunk {i+1}/{len(chunks)}")
-                processed_chunk = self._process_content_chunk(chunk, translator)
-                processed_chunks.append(processed_chunk)
-            
-            return '\n'.join(processed_chunks)
+            logger.info(f"Post-processing {len(chunks)} chunks")
+            return '\n'.join(self._post_edit(chunks, translator))
         else:
             # Process the entire content at once
-            return self._process_content_chunk(translated_content, translator)
+            return self._post_edit([translated_content], translator)[0]
+    
+    def _post_edit(self, texts: List[str], translator) -> List[str]:
+        """
+        Run the post-editing pass over texts, within the token budget.
         
-    def _process_content_chunk(self, content: str, translator) -> str:
-        """Process a chunk of translated content to improve formatting and coherence."""
+        Texts are taken in document order while their estimated cost fits the
+        remaining budget; the rest are returned unchanged. Selected texts are
+        edited concurrently and the consumed tokens are added to ``usage``.
+        
+        Args:
+            texts: Translated texts to improve
+            translator: Translation service instance
+            
+        Returns:
+            List of edited texts in the same order
+        """
+        selected = []
+        remaining = self.post_edit_token_budget
+        for i, text in enumerate(texts):
+            cost = self._estimate_post_edit_tokens(text, translator)
+            if remaining is not None:
+                if cost > remaining:
+                    continue
+                remaining -= cost
+            selected.append(i)
+        
+        skipped = len(texts) - len(selected)
+        if skipped:
+            logger.info(f"Post-edit token budget of {self.post_edit_token_budget} reached, "
+                        f"skipping {skipped} of {len(texts)} texts")
+        
+        # Count only the editing requests, not other requests made on the shared translator
+        post_edit_usage = {}
+        edited = list(texts)
+        with ThreadPoolExecutor(max_workers=self._max_workers(translator)) as executor:
+            # map() keeps the results in document order
+            for i, text in zip(selected, executor.map(
+                lambda i: self._process_content_chunk(texts[i], translator, post_edit_usage), selected
+            )):
+                edited[i] = text
+        
+        self.usage["post_edit_tokens"] = self.usage.get("post_edit_tokens", 0) + post_edit_usage.get("total_tokens", 0)
+        # Requests are counted as their responses arrive, so failed edits are not included
+        self.usage["post_edit_requests"] = self.usage.get("post_edit_requests", 0) + post_edit_usage.get("requests", 0)
+        self.usage["post_edit_skipped"] = self.usage.get("post_edit_skipped", 0) + skipped
+        return edited
+    
+    @staticmethod
+    def _estimate_post_edit_tokens(text: str, translator) -> int:
+        """Estimate the tokens of one post-editing request (instructions, text and edited output)."""
+        count_tokens = getattr(translator, "_count_tokens", None)
+        text_tokens = count_tokens(text) if count_tokens else len(text) / 4
+        return int(300 + 2 * text_tokens)
+    
+    def _is_low_confidence(self, segment: Dict[str, Any], translated: Dict[str, Any]) -> bool:
+        """
+        Check whether a translated segment looks unreliable.
+        
+        Segments that were deliberately kept (formatting, math) are never flagged.
+        A translation is low-confidence when it is identical to the source or its
+        length is far off the source length.
+        """
+        if translated is segment or segment["type"] != "text":
+            return False
+        source = segment["content"].strip()
+        target = translated["content"].strip()
+        if not source:
+            return False
+        if target == source:
+            return True
+        low, high = self.LOW_CONFIDENCE_LENGTH_RATIO
+        return not low <= len(target) / len(source) <= high
+        
+    def _process_content_chunk(self, content: str, translator, usage: Optional[Dict[str, int]] = None) -> str:
+        """
+        Process a chunk of translated content to improve formatting and coherence.
+        
+        The token usage of the editing request is added to ``usage`` if given.
+        """
         target_lang = translator.target_lang
         source_lang = translator.source_lang
         
@@ -949,7 +1332,8 @@ class MarkdownProcessor:
             improved_content = translator._translate_with_openai(
                 text=instruction,
                 target_lang=target_lang,
-                temperature=0.4
+                temperature=0.4,
+                usage=usage
             )
             
             # Verify the improved content still contains the target language if it's Chinese
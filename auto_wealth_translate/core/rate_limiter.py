@@ -0,0 +1,346 @@
+"""
+Rate limiting module for AutoWealthTranslate.
+
+This module provides a process-wide rate limiter per model that tracks
+requests-per-minute and tokens-per-minute with token buckets, adapts to the
+``x-ratelimit-*`` / ``Retry-After`` headers returned by the API, and retries
+transient failures with jittered exponential backoff.
+"""
+
+import asyncio
+import email.utils
+import random
+import re
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional
+
+import openai
+
+from auto_wealth_translate.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Initial limits per model prefix; refined from response headers at runtime
+MODEL_RATE_LIMITS = {
+    "gpt-4": {"requests_per_minute": 500, "tokens_per_minute": 300000},
+    "gpt-3.5": {"requests_per_minute": 3500, "tokens_per_minute": 200000},
+    "grok": {"requests_per_minute": 60, "tokens_per_minute": 100000},
+}
+DEFAULT_RATE_LIMITS = {"requests_per_minute": 500, "tokens_per_minute": 200000}
+
+_RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+def parse_duration(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a rate limit reset duration such as '1s', '6m0s' or '20ms'.
+
+    Args:
+        value: Duration string from an ``x-ratelimit-reset-*`` header
+
+    Returns:
+        Duration in seconds, or None if the value cannot be parsed
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+
+def parse_retry_after(headers: Optional[Mapping[str, str]]) -> Optional[float]:
+    """
+    Extract the server-requested retry delay from response headers.
+
+    Args:
+        headers: Response headers
+
+    Returns:
+        Delay in seconds, or None if the server did not request one
+    """
+    if not headers:
+        return None
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return float(retry_after_ms) / 1000
+        except ValueError:
+            pass
+    retry_after = headers.get("retry-after")
+    if retry_after:
+        try:
+            return float(retry_after)
+        except ValueError:
+            pass
+        try:
+            parsed = email.utils.parsedate_to_datetime(retry_after)
+        except (TypeError, ValueError):
+            # Malformed header; fall back to exponential backoff
+            return None
+        if parsed is not None:
+            return max(0.0, parsed.timestamp() - time.time())
+    return None
+
+class TokenBucket:
+    """
+    Token bucket that refills continuously up to a per-minute capacity.
+
+    Reservations may drive the level negative; the caller then waits until
+    the debt has been refilled, which keeps waiters in FIFO order without
+    polling.
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.level = float(per_minute)
+        self.updated = time.monotonic()
+
+    @property
+    def rate(self) -> float:
+        return self.capacity / 60.0
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, amount: float, now: float) -> float:
+        """Take ``amount`` from the bucket and return the seconds to wait before using it."""
+        self._refill(now)
+        self.level -= min(amount, self.capacity)
+        return 0.0 if self.level >= 0 else -self.level / self.rate
+
+    def refund(self, amount: float, now: float) -> None:
+        """Return unused capacity to the bucket."""
+        self._refill(now)
+        self.level = min(self.capacity, self.level + amount)
+
+    def sync(self, limit: Optional[float], remaining: Optional[float], now: float) -> None:
+        """Align the bucket with the limit and remaining values reported by the server."""
+        self._refill(now)
+        if limit and limit > 0:
+            self.capacity = float(limit)
+        if remaining is not None:
+            self.level = min(self.level, float(remaining))
+
+class RateLimiter:
+    """
+    Rate limiter for a single model, shared by all threads and event loops.
+    """
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int,
+                 max_retries: int = 6, base_delay: float = 1.0, max_delay: float = 60.0):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            requests_per_minute: Initial request budget per minute
+            tokens_per_minute: Initial token budget per minute
+            max_retries: Maximum number of retries for a failed request
+            base_delay: Base delay in seconds for exponential backoff
+            max_delay: Upper bound for a single backoff delay in seconds
+        """
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens: int) -> float:
+        now = time.monotonic()
+        with self._lock:
+            wait = max(self.requests.reserve(1, now), self.tokens.reserve(tokens, now))
+            return max(wait, self._blocked_until - now)
+
+    def acquire(self, tokens: int) -> None:
+        """Block until a request of ``tokens`` tokens fits within the limits."""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            logger.debug(f"Rate limiter waiting {wait:.2f}s")
+            time.sleep(wait)
+
+    async def aacquire(self, tokens: int) -> None:
+        """Async counterpart of ``acquire``."""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            logger.debug(f"Rate limiter waiting {wait:.2f}s")
+            await asyncio.sleep(wait)
+
+    def reconcile(self, estimated_tokens: int, actual_tokens: Optional[int]) -> None:
+        """Refund the difference between the estimated and actual token usage."""
+        if not isinstance(actual_tokens, int) or actual_tokens >= estimated_tokens:
+            return
+        with self._lock:
+            self.tokens.refund(estimated_tokens - actual_tokens, time.monotonic())
+
+    def update_from_headers(self, headers: Optional[Mapping[str, str]]) -> None:
+        """
+        Adapt the limiter to the ``x-ratelimit-*`` headers of a response.
+
+        Args:
+            headers: Response headers
+        """
+        if not headers:
+            return
+
+        def number(name: str) -> Optional[float]:
+            try:
+                return float(headers.get(name))
+            except (TypeError, ValueError):
+                return None
+
+        now = time.monotonic()
+        with self._lock:
+            self.requests.sync(number("x-ratelimit-limit-requests"),
+                               number("x-ratelimit-remaining-requests"), now)
+            self.tokens.sync(number("x-ratelimit-limit-tokens"),
+                             number("x-ratelimit-remaining-tokens"), now)
+
+            # Pause everyone until the window resets once the quota is exhausted
+            for kind in ("requests", "tokens"):
+                if number(f"x-ratelimit-remaining-{kind}") == 0:
+                    reset = parse_duration(headers.get(f"x-ratelimit-reset-{kind}"))
+                    if reset:
+                        self._blocked_until = max(self._blocked_until, now + reset)
+
+    def backoff_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Compute the delay before the next retry.
+
+        Args:
+            attempt: Zero-based retry attempt
+            retry_after: Delay requested by the server, if any
+
+        Returns:
+            Delay in seconds
+        """
+        if retry_after is not None:
+            # Jitter on top of the server's delay so waiters don't all wake together
+            return retry_after + random.uniform(0, self.base_delay)
+        cap = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return random.uniform(cap / 2, cap)
+
+    @staticmethod
+    def is_retryable(error: Exception) -> bool:
+        """Check whether an API error is transient and worth retrying."""
+        if isinstance(error, (openai.APITimeoutError, openai.APIConnectionError)):
+            return True
+        if isinstance(error, openai.APIStatusError):
+            return error.status_code in _RETRYABLE_STATUS_CODES or error.status_code >= 500
+        return False
+
+    def _handle_error(self, error: Exception, attempt: int, tokens: int) -> None:
+        """Re-raise non-retryable errors, otherwise schedule a shared backoff."""
+        # A failed request did not produce a completion; the next attempt reserves again
+        with self._lock:
+            self.tokens.refund(tokens, time.monotonic())
+
+        if attempt >= self.max_retries or not self.is_retryable(error):
+            raise error
+
+        response = getattr(error, "response", None)
+        headers = getattr(response, "headers", None)
+        self.update_from_headers(headers)
+        delay = self.backoff_delay(attempt, parse_retry_after(headers))
+
+        # Rate limiting applies to every worker using this model, not just this one
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+        logger.info(f"Request failed ({type(error).__name__}), retrying in {delay:.1f}s "
+                    f"(attempt {attempt + 1}/{self.max_retries})")
+
+    def call(self, request: Callable[[], Any], tokens: int) -> Any:
+        """
+        Run a request within the rate limits, retrying transient failures.
+
+        Args:
+            request: Callable performing the API request
+            tokens: Estimated number of tokens the request will consume
+
+        Returns:
+            The result of ``request``; its ``headers`` (if any) update the limits
+        """
+        attempt = 0
+        while True:
+            self.acquire(tokens)
+            try:
+                result = request()
+            except Exception as e:
+                self._handle_error(e, attempt, tokens)
+                attempt += 1
+                continue
+            self.update_from_headers(getattr(result, "headers", None))
+            return result
+
+    async def acall(self, request: Callable[[], Awaitable[Any]], tokens: int) -> Any:
+        """Async counterpart of ``call``."""
+        attempt = 0
+        while True:
+            await self.aacquire(tokens)
+            try:
+                result = await request()
+            except Exception as e:
+                self._handle_error(e, attempt, tokens)
+                attempt += 1
+                continue
+            self.update_from_headers(getattr(result, "headers", None))
+            return result
+
+_limiters: Dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+def _default_limits(model: str) -> Dict[str, int]:
+    for prefix, limits in MODEL_RATE_LIMITS.items():
+        if model.startswith(prefix):
+            return limits
+    return DEFAULT_RATE_LIMITS
+
+def get_rate_limiter(model: str) -> RateLimiter:
+    """
+    Get the process-wide rate limiter for a model, creating it on first use.
+
+    Args:
+        model: Model name
+
+    Returns:
+        The shared ``RateLimiter``
+    """
+    with _limiters_lock:
+        limiter = _limiters.get(model)
+        if limiter is None:
+            limiter = RateLimiter(**_default_limits(model))
+            _limiters[model] = limiter
+        return limiter
+
+def configure_rate_limits(model: str, requests_per_minute: Optional[int] = None,
+                          tokens_per_minute: Optional[int] = None, **options: Any) -> RateLimiter:
+    """
+    Replace the rate limiter for a model with explicit limits.
+
+    Args:
+        model: Model name
+        requests_per_minute: Request budget per minute (default for the model if omitted)
+        tokens_per_minute: Token budget per minute (default for the model if omitted)
+        **options: Extra ``RateLimiter`` options (max_retries, base_delay, max_delay)
+
+    Returns:
+        The new ``RateLimiter``
+    """
+    defaults = _default_limits(model)
+    limiter = RateLimiter(
+        requests_per_minute=requests_per_minute or defaults["requests_per_minute"],
+        tokens_per_minute=tokens_per_minute or defaults["tokens_per_minute"],
+        **options
+    )
+    with _limiters_lock:
+        _limiters[model] = limiter
+    return limiter
@@ -0,0 +1,190 @@
+"""
+Translation memory module for AutoWealthTranslate.
+
+This module provides a persistent, content-addressed cache of previous
+translations so that recurring boilerplate (disclaimers, headers, table
+labels) is only sent to the LLM once.
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+from auto_wealth_translate.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+class TranslationMemory:
+    """
+    SQLite-backed translation memory.
+
+    Entries are keyed by a SHA-256 hash of the normalized source text, the
+    language pair, the model and the glossary version. When the number of
+    entries exceeds ``max_entries`` the least recently used entries are evicted.
+    """
+
+    def __init__(self, db_path: str, max_entries: int = 100000):
+        """
+        Initialize the translation memory.
+
+        Args:
+            db_path: Path to the SQLite database file (created if missing)
+            max_entries: Maximum number of entries to keep before evicting
+        """
+        self.db_path = str(db_path)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        db_dir = os.path.dirname(os.path.abspath(self.db_path))
+        os.makedirs(db_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS translations (
+                key TEXT PRIMARY KEY,
+                translation TEXT NOT NULL,
+                source_lang TEXT NOT NULL,
+                target_lang TEXT NOT NULL,
+                model TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_translations_last_used ON translations (last_used)"
+        )
+        self._conn.commit()
+
+        self._size = self._conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+        logger.info(f"Opened translation memory at {self.db_path} ({self._size} entries)")
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Normalize text so that whitespace-only differences share an entry."""
+        return re.sub(r"\s+", " ", text).strip()
+
+    @staticmethod
+    def glossary_version(terms: Optional[Iterable[str]]) -> str:
+        """
+        Compute a short version identifier for a glossary of terms.
+
+        Args:
+            terms: Glossary terms (order does not matter)
+
+        Returns:
+            Hex digest identifying the glossary, or an empty string if there is none
+        """
+        if not terms:
+            return ""
+        joined = "\n".join(sorted(set(terms)))
+        return hashlib.sha256(joined.encode("utf-8")).hexdigest()[:16]
+
+    def make_key(self, text: str, source_lang: str, target_lang: str, model: str,
+                 glossary_version: str = "") -> str:
+        """Build the content-addressed key for a translation request."""
+        payload = "\x1f".join([
+            self.normalize(text), source_lang or "", target_lang or "", model or "", glossary_version or ""
+        ])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, text: str, source_lang: str, target_lang: str, model: str,
+            glossary_version: str = "") -> Optional[str]:
+        """
+        Look up a previous translation.
+
+        Args:
+            text: Source text
+            source_lang: Source language code
+            target_lang: Target language code
+            model: Model used for translation
+            glossary_version: Glossary version (see ``glossary_version``)
+
+        Returns:
+            The stored translation, or None on a miss
+        """
+        key = self.make_key(text, source_lang, target_lang, model, glossary_version)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT translation FROM translations WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._conn.execute(
+                "UPDATE translations SET last_used = ? WHERE key = ?", (time.time(), key)
+            )
+            self._conn.commit()
+            return row[0]
+
+    def put(self, text: str, translation: str, source_lang: str, target_lang: str, model: str,
+            glossary_version: str = "") -> None:
+        """
+        Store a translation, evicting least recently used entries if needed.
+
+        Args:
+            text: Source text
+            translation: Translated text
+            source_lang: Source language code
+            target_lang: Target language code
+            model: Model used for translation
+            glossary_version: Glossary version (see ``glossary_version``)
+        """
+        key = self.make_key(text, source_lang, target_lang, model, glossary_version)
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO translations "
+                "(key, translation, source_lang, target_lang, model, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, translation, source_lang, target_lang, model, now, now)
+            )
+            if cursor.rowcount:
+                self._size += 1
+            else:
+                self._conn.execute(
+                    "UPDATE translations SET translation = ?, last_used = ? WHERE key = ?",
+                    (translation, now, key)
+                )
+            if self._size > self.max_entries:
+                self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        """Evict least recently used entries. Caller must hold the lock."""
+        # Evict a little more than strictly needed so we don't evict on every insert
+        excess = self._size - self.max_entries + max(1, self.max_entries // 10)
+        cursor = self._conn.execute(
+            "DELETE FROM translations WHERE key IN "
+            "(SELECT key FROM translations ORDER BY last_used ASC LIMIT ?)",
+            (excess,)
+        )
+        removed = max(cursor.rowcount, 0)
+        self.evictions += removed
+        self._size = self._conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+        logger.info(f"Evicted {removed} entries from translation memory")
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and the current number of entries."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": self._size,
+        }
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
@@ -5,28 +5,114 @@ This module is responsible for translating document components using LLMs.
 """
 
 import os
-import time
+import re
+import asyncio
 import logging
-from typing import List, Dict, Any, Union
+import threading
+import weakref
+from bisect import bisect_left, bisect_right
+from typing import List, Dict, Any, Union, Optional, Tuple
 import openai
 import tiktoken
 import json
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from auto_wealth_translate.utils.logger import get_logger
+from auto_wealth_translate.utils.progress import ProgressCallback, report_progress
 from auto_wealth_translate.core.document_processor import (
     DocumentComponent, TextComponent, TableComponent, 
     ImageComponent, ChartComponent
 )
+from auto_wealth_translate.core.translation_memory import TranslationMemory
+from auto_wealth_translate.core.llm_clients import get_client, get_async_client
+from auto_wealth_translate.core.rate_limiter import RateLimiter, get_rate_limiter
 
 logger = get_logger(__name__)
 
+# Maximum number of concurrent async requests per API provider, shared by all
+# TranslationService instances in the process
+PROVIDER_CONCURRENCY_LIMITS = {
+    "openai": 64,
+    "xai": 16,
+}
+
+# Provider semaphores are bound to the event loop they were created on
+_provider_semaphores = weakref.WeakKeyDictionary()
+
+def _provider_semaphore(provider: str) -> asyncio.Semaphore:
+    """Get the process-wide semaphore for a provider on the running event loop."""
+    loop = asyncio.get_running_loop()
+    semaphores = _provider_semaphores.setdefault(loop, {})
+    if provider not in semaphores:
+        semaphores[provider] = asyncio.Semaphore(PROVIDER_CONCURRENCY_LIMITS.get(provider, 16))
+    return semaphores[provider]
+
+# Sentence ends (Latin and CJK punctuation) used to align long-text chunks
+_SENTENCE_END = re.compile(r'(?<=[.!?])\s+|(?<=[。！？])')
+
+# Values kept out of translation, most specific first so dates and numbers
+# inside URLs or email addresses are not split up
+_PROTECTED_PATTERN = re.compile(
+    r'(?P<url>https?://[^\s]+)'
+    r'|(?P<email>\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b)'
+    r'|(?P<date>\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b)'
+    r'|(?P<number>\b\d+(?:\.\d+)?\b)'
+)
+_PLACEHOLDER_PATTERN = re.compile(r'__(?:url|email|date|number)_\d+__')
+
+_tokenizers: Dict[str, Any] = {}
+_tokenizers_lock = threading.Lock()
+
+def get_tokenizer(model: str):
+    """
+    Get the tiktoken encoding for a model, loading it on first use.
+    
+    Loaded encodings are shared process-wide; failed loads are not cached so a
+    later call can retry. Grok models use the GPT-4 encoding; other non-OpenAI
+    models have no tokenizer.
+    
+    Args:
+        model: Model name
+        
+    Returns:
+        The encoding, or None if the model has no tokenizer or it cannot be loaded
+    """
+    if model.startswith("grok"):
+        # Use a similar tokenizer to GPT models since we don't have a specific one for Grok
+        model = "gpt-4"
+    elif not model.startswith("gpt"):
+        return None
+    
+    with _tokenizers_lock:
+        tokenizer = _tokenizers.get(model)
+        if tokenizer is not None:
+            return tokenizer
+        try:
+            try:
+                tokenizer = tiktoken.encoding_for_model(model)
+            except KeyError:
+                tokenizer = tiktoken.encoding_for_model("gpt-3.5-turbo")
+        except Exception as e:
+            logger.warning(f"Could not load tokenizer for {model}, using token estimates: {str(e)}")
+            return None
+        if tokenizer is not None:
+            _tokenizers[model] = tokenizer
+        return tokenizer
+
+def estimate_tokens(text: str) -> float:
+    """Rough token count for text without a tokenizer (CJK characters count as one token each)."""
+    cjk_chars = sum(1 for char in text if '\u3000' <= char <= '\u9fff' or '\uac00' <= char <= '\ud7af')
+    return len(text.split()) * 1.5 + cjk_chars
+
 class TranslationService:
     """
     Service for translating document components.
     """
     
-    def __init__(self, source_lang: str = "en", target_lang: str = "zh", model: str = "gpt-4"):
+    def __init__(self, source_lang: str = "en", target_lang: str = "zh", model: str = "gpt-4",
+                 translation_memory: Optional[TranslationMemory] = None,
+                 batch_token_budget: Optional[int] = None, max_batch_items: int = 40,
+                 max_concurrency: int = 3, progress_callback: Optional[ProgressCallback] = None):
         """
         Initialize the translation service.
         
@@ -34,6 +120,14 @@ class TranslationService:
             source_lang: Source language code (e.g., 'en', 'fr')
             target_lang: Target language code (e.g., 'zh', 'fr')
             model: Model to use for translation (e.g., 'gpt-4', 'grok-2')
+            translation_memory: Optional translation memory consulted before calling the LLM
+            batch_token_budget: Maximum input tokens packed into one batched request
+                                (defaults to a quarter of the model context)
+            max_batch_items: Maximum number of segments packed into one batched request
+            max_concurrency: Maximum number of requests in flight for one document
+            progress_callback: Optional callback receiving 'translate' events (see
+                               ``utils.progress``) with segments translated out of the
+                               total and the tokens used so far
             
         Note:
             To use the OpenAI API for translation, you need to set the OPENAI_API_KEY
@@ -44,6 +138,7 @@ class TranslationService:
         self.source_lang = source_lang
         self.target_lang = target_lang
         self.model = model
+        self.translation_memory = translation_memory
         
         # Max tokens for context length (model dependent)
         if "gpt-3.5" in model:
@@ -53,6 +148,19 @@ class TranslationService:
         else:
             self.max_tokens = 8000  # Default for GPT-4 and others
         
+        # Leave room in the response for translations that are longer than the source
+        self.batch_token_budget = batch_token_budget or self.max_tokens // 4
+        self.max_batch_items = max_batch_items
+        self.max_concurrency = max_concurrency
+        self.progress_callback = progress_callback
+        
+        # Tokens reported by the API for every request made by this service
+        self.token_usage = {"requests": 0, "prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+        self._usage_lock = threading.Lock()
+        
+        # Texts returned untranslated (or with a placeholder marker) because translation failed
+        self.untranslated_segments = 0
+        
         # Language names for reference
         self.language_names = {
             "en": "English",
@@ -86,24 +194,38 @@ class TranslationService:
             else:
                 logger.info(f"Initialized xAI {model} model")
                 
-        # Create tokenizer for token counting
-        try:
-            if model.startswith("gpt"):
-                self.tokenizer = tiktoken.encoding_for_model(model)
-            elif model.startswith("grok"):
-                # Use a similar tokenizer to GPT models since we don't have a specific one for Grok
-                self.tokenizer = tiktoken.encoding_for_model("gpt-4")
-            else:
-                self.tokenizer = None
-        except:
-            self.tokenizer = tiktoken.encoding_for_model("gpt-3.5-turbo")
+        # Tokenizer for token counting, shared by all services using the same model
+        self.tokenizer = get_tokenizer(model)
+        # Token counts of system prompts, which repeat across the requests of a document
+        self._system_token_counts: Dict[str, int] = {}
             
+    def translation_succeeded(self) -> bool:
+        """Check that no text has fallen back to its source since the service was created."""
+        return self.untranslated_segments == 0
+    
+    def output_settings(self) -> Dict[str, Any]:
+        """
+        Settings besides the languages and model that shape the translated output.
+        
+        Used to key cached documents, so that outputs produced with different
+        settings are not shared.
+        """
+        return {
+            "max_tokens": self.max_tokens,
+            "batch_token_budget": self.batch_token_budget,
+            "max_batch_items": self.max_batch_items,
+        }
+    
     def _count_tokens(self, text):
         """Count the number of tokens in a text string."""
         if self.tokenizer:
             return len(self.tokenizer.encode(text))
         # Rough estimate if tokenizer not available
-        return len(text.split()) * 1.5
+        return estimate_tokens(text)
+    
+    def _encode(self, text: str) -> Optional[List[int]]:
+        """Encode text with the tokenizer, or return None if there is none."""
+        return self.tokenizer.encode(text) if self.tokenizer else None
     
     def translate(self, components: List[DocumentComponent]) -> List[DocumentComponent]:
         """
@@ -115,6 +237,60 @@ class TranslationService:
         Returns:
             List of translated document components
         """
+        financial_terms = self._start_translation(components)
+        if financial_terms is None:
+            return components
+        
+        # Collect every translatable string (text blocks and table cells) and translate them in batches
+        segments = self._collect_segments(components)
+        
+        if segments:
+            logger.info(f"Translating {len(segments)} unique text segments...")
+            translations = self._translate_segments(segments, financial_terms)
+        else:
+            logger.info("No translatable components found in document")
+            translations = {}
+        
+        return self._apply_translations(components, translations)
+    
+    async def atranslate(self, components: List[DocumentComponent]) -> List[DocumentComponent]:
+        """
+        Translate all components of a document without blocking the event loop.
+        
+        Requests are issued with the async API client. At most ``max_concurrency``
+        requests are in flight for this call, and the process-wide limit for the
+        provider (see ``PROVIDER_CONCURRENCY_LIMITS``) is respected across calls.
+        Cancelling the awaiting task cancels all outstanding requests.
+        
+        Args:
+            components: List of document components
+            
+        Returns:
+            List of translated document components
+        """
+        financial_terms = self._start_translation(components)
+        if financial_terms is None:
+            return components
+        
+        segments = self._collect_segments(components)
+        
+        if segments:
+            logger.info(f"Translating {len(segments)} unique text segments asynchronously...")
+            translations = await self._atranslate_segments(segments, financial_terms)
+        else:
+            logger.info("No translatable components found in document")
+            translations = {}
+        
+        return self._apply_translations(components, translations)
+    
+    def _start_translation(self, components: List[DocumentComponent]) -> Optional[List[str]]:
+        """
+        Log the translation job, check credentials and extract the glossary.
+        
+        Returns:
+            Financial terms for consistent translation, or None if the API key is missing
+            (in which case text components are marked and should be returned as-is)
+        """
         source_lang_name = self.language_names.get(self.source_lang, self.source_lang)
         target_lang_name = self.language_names.get(self.target_lang, self.target_lang)
         
@@ -129,93 +305,62 @@ class TranslationService:
             for comp in components:
                 if isinstance(comp, TextComponent):
                     comp.text = f"[API KEY MISSING] {comp.text}"
-            return components
+                    self._record_untranslated()
+            return None
             
         # Extract financial terms for consistent translation
         financial_terms = self._extract_financial_terms(components)
         if financial_terms:
             logger.info(f"Extracted {len(financial_terms)} financial terms for consistent translation: {', '.join(financial_terms[:5])}{'...' if len(financial_terms) > 5 else ''}")
         
-        # Initialize translated components
-        translated_components = []
+        # Count of components by type for logging
+        component_types = {'text': 0, 'table': 0, 'image': 0, 'chart': 0, 'other': 0}
+        for component in components:
+            if isinstance(component, TextComponent):
+                component_types['text'] += 1
+            elif isinstance(component, TableComponent):
+                component_types['table'] += 1
+            elif isinstance(component, ImageComponent):
+                component_types['image'] += 1
+            elif isinstance(component, ChartComponent):
+                component_types['chart'] += 1
+            else:
+                component_types['other'] += 1
         
-        # Use ThreadPoolExecutor for parallel translation of text components
-        with ThreadPoolExecutor(max_workers=3) as executor:
-            # Submit text components for translation
-            future_to_component = {}
-            
-            # Count of components by type for logging
-            component_types = {'text': 0, 'table': 0, 'image': 0, 'chart': 0, 'other': 0}
-            
-            # Process different component types
-            for component in components:
+        logger.info(f"Document contains: {component_types['text']} text components, {component_types['table']} tables, " +
+                    f"{component_types['image']} images, {component_types['chart']} charts, {component_types['other']} other components")
+        
+        return financial_terms
+    
+    def _apply_translations(self, components: List[DocumentComponent], translations: Dict[str, str]) -> List[DocumentComponent]:
+        """Rebuild components with the translated text, preserving document order."""
+        translated_components = []
+        successful = 0
+        failed = 0
+        for component in components:
+            try:
                 if isinstance(component, TextComponent):
-                    component_types['text'] += 1
-                    # Submit text components for translation
-                    future = executor.submit(
-                        self._translate_text_component, 
-                        component, 
-                        financial_terms
-                    )
-                    future_to_component[future] = component
-                    
+                    translated_components.append(self._translate_text_component(component, translations))
+                    successful += 1
                 elif isinstance(component, TableComponent):
-                    component_types['table'] += 1
-                    # Submit table components for translation
-                    future = executor.submit(
-                        self._translate_table_component, 
-                        component,
-                        financial_terms
-                    )
-                    future_to_component[future] = component
-                    
-                elif isinstance(component, ImageComponent):
-                    component_types['image'] += 1
-                    translated_components.append(component)
-                elif isinstance(component, ChartComponent):
-                    component_types['chart'] += 1
-                    translated_components.append(component)
+                    translated_components.append(self._translate_table_component(component, translations))
+                    successful += 1
                 else:
-                    component_types['other'] += 1
                     # For non-translatable components, just copy them
                     translated_components.append(component)
-            
-            # Log component counts
-            logger.info(f"Document contains: {component_types['text']} text components, {component_types['table']} tables, " +
-                        f"{component_types['image']} images, {component_types['chart']} charts, {component_types['other']} other components")
-            
-            # Process completed translations
-            total_futures = len(future_to_component)
-            
-            if total_futures > 0:
-                logger.info(f"Translating {total_futures} components...")
-                
-                completed = 0
-                successful = 0
-                failed = 0
-                
-                for future in as_completed(future_to_component):
-                    try:
-                        translated_component = future.result()
-                        translated_components.append(translated_component)
-                        successful += 1
-                        
-                    except Exception as exc:
-                        original_component = future_to_component[future]
-                        logger.error(f"Error translating component {original_component.component_id}: {str(exc)}")
-                        # Fall back to the original component in case of error
-                        translated_components.append(original_component)
-                        failed += 1
-                    
-                    # Log progress
-                    completed += 1
-                    if completed % 10 == 0 or completed == total_futures:
-                        logger.info(f"Translation progress: {completed}/{total_futures} components " +
-                                   f"({successful} successful, {failed} failed)")
-                
-                logger.info(f"Translation complete: {successful} components translated successfully, {failed} components failed")
-            else:
-                logger.info("No translatable components found in document")
+            except Exception as exc:
+                logger.error(f"Error translating component {component.component_id}: {str(exc)}")
+                # Fall back to the original component in case of error
+                translated_components.append(component)
+                failed += 1
+                self._record_untranslated()
+        
+        if successful or failed:
+            logger.info(f"Translation complete: {successful} components translated successfully, {failed} components failed")
+        
+        if self.translation_memory:
+            stats = self.translation_memory.stats()
+            logger.info(f"Translation memory: {stats['hits']} hits, {stats['misses']} misses, {stats['size']} entries")
         
         return translated_components
     
@@ -249,50 +394,338 @@ class TranslationService:
                                 
         return list(terms)
     
-    def _translate_text_component(self, component: TextComponent, financial_terms: List[str]) -> TextComponent:
-        """Translate a text component."""
+    def _collect_segments(self, components: List[DocumentComponent]) -> List[str]:
+        """Collect the unique, non-empty strings that need translation, in document order."""
+        segments = {}
+        for component in components:
+            if isinstance(component, TextComponent):
+                if component.text.strip():
+                    segments[component.text] = None
+            elif isinstance(component, TableComponent):
+                for row in component.rows:
+                    for cell in row:
+                        if cell.strip():
+                            segments[cell] = None
+        return list(segments)
+    
+    def _translate_text_component(self, component: TextComponent, translations: Dict[str, str]) -> TextComponent:
+        """Create a translated copy of a text component."""
         if not component.text.strip():
             return component
+        
+        # Create a new component with translated text
+        return TextComponent(
+            component_id=component.component_id,
+            component_type=component.component_type,
+            page_number=component.page_number,
+            text=translations.get(component.text, component.text),
+            font_info=component.font_info,
+            position=component.position,
+            is_header=component.is_header,
+            is_footer=component.is_footer,
+            metadata=component.metadata
+        )
+    
+    def _translate_table_component(self, component: TableComponent, translations: Dict[str, str]) -> TableComponent:
+        """Create a translated copy of a table component."""
+        translated_rows = [
+            [translations.get(cell, cell) for cell in row]
+            for row in component.rows
+        ]
+        
+        # Create a new component with translated text
+        return TableComponent(
+            component_id=component.component_id,
+            component_type=component.component_type,
+            page_number=component.page_number,
+            rows=translated_rows,
+            position=component.position,
+            metadata=component.metadata
+        )
+    
+    def _translate_segments(self, segments: List[str], financial_terms: List[str] = None) -> Dict[str, str]:
+        """
+        Translate many short text segments, packing them into batched API requests.
+        
+        Args:
+            segments: Unique source strings to translate
+            financial_terms: List of financial terms for consistent translation
             
-        try:
-            # Translate the text content
-            translated_text = self._translate_text(component.text, financial_terms)
+        Returns:
+            Mapping from each source string to its translation (the source on failure)
+        """
+        if not self.model.startswith("gpt"):
+            # Fall back to dummy translation for non-OpenAI models
+            translations = {segment: self._translate_text(segment, financial_terms) for segment in segments}
+            self._report_translation_progress(len(segments), len(segments))
+            return translations
+        
+        prepared, translated, batches = self._plan_segments(segments, financial_terms)
+        done_segments = sum(1 for result in translated.values() if result is not None)
+        self._report_translation_progress(done_segments, len(translated))
+        
+        # Use ThreadPoolExecutor for parallel translation of batches
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            future_to_batch = {
+                executor.submit(self._translate_batch, batch, financial_terms): batch
+                for batch in batches
+            }
+            completed = 0
+            for future in as_completed(future_to_batch):
+                batch = future_to_batch[future]
+                try:
+                    results = future.result()
+                except Exception as exc:
+                    logger.error(f"Error translating batch of {len(batch)} segments: {str(exc)}")
+                    results = batch  # Fall back to the original text
+                    self._record_untranslated(len(batch))
+                for source, result in zip(batch, results):
+                    translated[source] = result
+                done_segments += len(batch)
+                self._report_translation_progress(done_segments, len(translated))
+                
+                # Log progress
+                completed += 1
+                if completed % 10 == 0 or completed == len(batches):
+                    logger.info(f"Translation progress: {completed}/{len(batches)} requests")
+        
+        return self._finish_segments(prepared, translated)
+    
+    async def _atranslate_segments(self, segments: List[str], financial_terms: List[str] = None) -> Dict[str, str]:
+        """Async counterpart of ``_translate_segments``."""
+        if not self.model.startswith("gpt"):
+            # Fall back to dummy translation for non-OpenAI models
+            translations = {segment: self._translate_text(segment, financial_terms) for segment in segments}
+            self._report_translation_progress(len(segments), len(segments))
+            return translations
+        
+        prepared, translated, batches = self._plan_segments(segments, financial_terms)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        completed = 0
+        done_segments = sum(1 for result in translated.values() if result is not None)
+        self._report_translation_progress(done_segments, len(translated))
+        
+        async def run_batch(batch):
+            nonlocal completed, done_segments
+            async with semaphore:
+                try:
+                    results = await self._atranslate_batch(batch, financial_terms)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as exc:
+                    logger.error(f"Error translating batch of {len(batch)} segments: {str(exc)}")
+                    results = batch  # Fall back to the original text
+                    self._record_untranslated(len(batch))
+            for source, result in zip(batch, results):
+                translated[source] = result
+            done_segments += len(batch)
+            self._report_translation_progress(done_segments, len(translated))
             
-            # Create a new component with translated text
-            return TextComponent(
-                component_id=component.component_id,
-                component_type=component.component_type,
-                page_number=component.page_number,
-                text=translated_text,
-                font_info=component.font_info,
-                position=component.position,
-                is_header=component.is_header,
-                is_footer=component.is_footer
+            # Log progress
+            completed += 1
+            if completed % 10 == 0 or completed == len(batches):
+                logger.info(f"Translation progress: {completed}/{len(batches)} requests")
+        
+        # gather() cancels the outstanding batches if this coroutine is cancelled
+        await asyncio.gather(*(run_batch(batch) for batch in batches))
+        
+        return self._finish_segments(prepared, translated)
+    
+    def _report_translation_progress(self, completed: int, total: int) -> None:
+        """Report translated segments and tokens used so far to the progress callback."""
+        report_progress(self.progress_callback, "translate", completed, total,
+                        tokens=self.token_usage["total_tokens"])
+    
+    def _plan_segments(self, segments: List[str], financial_terms: List[str] = None):
+        """
+        Protect special tokens, consult the translation memory and batch the rest.
+        
+        Returns:
+            Tuple of (prepared, translated, batches) where ``prepared`` maps each
+            segment to its placeholder text and placeholders, ``translated`` maps
+            placeholder text to known translations (None if pending) and
+            ``batches`` lists the pending placeholder texts grouped per request
+        """
+        # Protect numbers, dates, email addresses and URLs in every segment
+        prepared = {}
+        for segment in segments:
+            prepared[segment] = self._prepare_text_for_translation(segment)
+        
+        # Consult the translation memory, then batch whatever is left
+        glossary_version = TranslationMemory.glossary_version(financial_terms)
+        translated = {}
+        pending = []
+        for text_with_placeholders, _ in prepared.values():
+            if text_with_placeholders in translated:
+                continue
+            cached = None
+            if self.translation_memory:
+                cached = self.translation_memory.get(
+                    text_with_placeholders, self.source_lang, self.target_lang, self.model, glossary_version
+                )
+            if cached is not None:
+                translated[text_with_placeholders] = cached
+            else:
+                translated[text_with_placeholders] = None
+                pending.append(text_with_placeholders)
+        
+        batches = self._pack_batches(pending)
+        if pending:
+            logger.info(f"Packed {len(pending)} segments into {len(batches)} translation requests "
+                        f"({len(segments) - len(pending)} served from translation memory)")
+        
+        return prepared, translated, batches
+    
+    def _finish_segments(self, prepared, translated) -> Dict[str, str]:
+        """Restore placeholders, mapping each source segment to its translation."""
+        return {
+            segment: self._restore_placeholders(translated[text_with_placeholders] or text_with_placeholders, placeholders)
+            for segment, (text_with_placeholders, placeholders) in prepared.items()
+        }
+    
+    def _pack_batches(self, texts: List[str]) -> List[List[str]]:
+        """
+        Pack texts into batches that fit the per-request token budget.
+        
+        Texts that exceed the budget on their own are placed in a batch of one,
+        which is translated (and chunked if necessary) individually.
+        """
+        batches = []
+        current_batch = []
+        current_tokens = 0
+        
+        for text in texts:
+            # Account for JSON quoting and the separator between items
+            text_tokens = self._count_tokens(json.dumps(text, ensure_ascii=False)) + 1
+            
+            if text_tokens > self.batch_token_budget:
+                batches.append([text])
+                continue
+            
+            if current_batch and (current_tokens + text_tokens > self.batch_token_budget or
+                                  len(current_batch) >= self.max_batch_items):
+                batches.append(current_batch)
+                current_batch = []
+                current_tokens = 0
+            
+            current_batch.append(text)
+            current_tokens += text_tokens
+        
+        if current_batch:
+            batches.append(current_batch)
+        
+        return batches
+    
+    def _translate_batch(self, texts: List[str], financial_terms: List[str] = None) -> List[str]:
+        """
+        Translate several segments with a single API request.
+        
+        The segments are sent as a JSON array and the model is asked to return a
+        JSON array of the same length. If the response is malformed, the batch is
+        split in half and each half is retried.
+        
+        Args:
+            texts: Segments to translate (with placeholders already applied)
+            financial_terms: List of financial terms for consistent translation
+            
+        Returns:
+            Translated segments, in the same order as the input
+        """
+        if len(texts) == 1:
+            # The translation memory was already consulted when the batch was planned
+            return [self._translate_uncached(texts[0], self.target_lang, financial_terms)[0]]
+        
+        try:
+            response_text = self._chat_completion(
+                self._build_batch_system_message(len(texts), financial_terms),
+                json.dumps(texts, ensure_ascii=False),
+                temperature=0.3
             )
         except Exception as e:
-            logger.error(f"Error translating text component: {str(e)}")
-            return component  # Return original on error
+            logger.error(f"API error in batch translation: {str(e)}")
+            self._record_untranslated(len(texts))
+            return texts  # Return original text on error
+        
+        results = self._parse_batch_response(response_text, len(texts))
+        if results is None:
+            logger.warning(f"Malformed batch response for {len(texts)} segments, splitting batch")
+            middle = len(texts) // 2
+            return (self._translate_batch(texts[:middle], financial_terms) +
+                    self._translate_batch(texts[middle:], financial_terms))
+        
+        glossary_version = TranslationMemory.glossary_version(financial_terms)
+        for text, result in zip(texts, results):
+            self._remember(text, result, self.target_lang, glossary_version)
+        
+        return results
     
-    def _translate_table_component(self, component: TableComponent, financial_terms: List[str]) -> TableComponent:
-        """Translate a table component."""
+    async def _atranslate_batch(self, texts: List[str], financial_terms: List[str] = None) -> List[str]:
+        """Async counterpart of ``_translate_batch``."""
+        if len(texts) == 1:
+            # The translation memory was already consulted when the batch was planned
+            return [(await self._atranslate_uncached(texts[0], self.target_lang, financial_terms))[0]]
+        
         try:
-            # Translate each cell
-            translated_rows = []
-            for row in component.rows:
-                translated_row = [self._translate_text(cell, financial_terms) for cell in row]
-                translated_rows.append(translated_row)
-            
-            # Create a new component with translated text
-            return TableComponent(
-                component_id=component.component_id,
-                component_type=component.component_type,
-                page_number=component.page_number,
-                rows=translated_rows,
-                position=component.position
+            response_text = await self._achat_completion(
+                self._build_batch_system_message(len(texts), financial_terms),
+                json.dumps(texts, ensure_ascii=False),
+                temperature=0.3
             )
+        except asyncio.CancelledError:
+            raise
         except Exception as e:
-            logger.error(f"Error translating table component: {str(e)}")
-            return component  # Return original on error
+            logger.error(f"API error in batch translation: {str(e)}")
+            self._record_untranslated(len(texts))
+            return texts  # Return original text on error
+        
+        results = self._parse_batch_response(response_text, len(texts))
+        if results is None:
+            logger.warning(f"Malformed batch response for {len(texts)} segments, splitting batch")
+            middle = len(texts) // 2
+            first, second = await asyncio.gather(
+                self._atranslate_batch(texts[:middle], financial_terms),
+                self._atranslate_batch(texts[middle:], financial_terms)
+            )
+            return first + second
+        
+        glossary_version = TranslationMemory.glossary_version(financial_terms)
+        for text, result in zip(texts, results):
+            self._remember(text, result, self.target_lang, glossary_version)
+        
+        return results
+    
+    def _build_batch_system_message(self, item_count: int, financial_terms: List[str] = None) -> str:
+        """Build the system prompt for a batched (JSON array) request."""
+        system_message = self._build_system_message(self.target_lang, financial_terms)
+        system_message += (
+            f" You will receive a JSON array of {item_count} strings. Translate each string independently and "
+            f"respond with ONLY a JSON array of exactly {item_count} translated strings in the same order. "
+            "Do not merge, split, omit or number the items, and keep placeholders such as __number_0__ unchanged."
+        )
+        return system_message
+    
+    @staticmethod
+    def _parse_batch_response(response_text: str, expected_count: int) -> Optional[List[str]]:
+        """Parse a JSON array response, returning None if it is malformed."""
+        content = response_text.strip()
+        
+        # Strip markdown code fences the model sometimes adds
+        if content.startswith("```"):
+            content = content.strip("`")
+            if content.lower().startswith("json"):
+                content = content[4:]
+            content = content.strip()
+        
+        try:
+            results = json.loads(content)
+        except ValueError:
+            return None
+        
+        if (not isinstance(results, list) or len(results) != expected_count or
+                not all(isinstance(item, str) for item in results)):
+            return None
+        
+        return [item.strip() for item in results]
     
     def _translate_text(self, text: str, financial_terms: List[str] = None) -> str:
         """
@@ -314,12 +747,13 @@ class TranslationService:
         
         try:
             if self.model.startswith("gpt"):
-                translated_text = self._translate_with_openai(text_with_placeholders, financial_terms)
+                translated_text = self._translate_with_openai(text_with_placeholders, financial_terms=financial_terms)
             else:
                 # Fall back to dummy translation for non-OpenAI models
                 source_lang_name = self.language_names.get(self.source_lang, self.source_lang)
                 target_lang_name = self.language_names.get(self.target_lang, self.target_lang)
                 translated_text = f"[{source_lang_name} → {target_lang_name}] {text}"
+                self._record_untranslated()
             
             # Restore placeholders
             restored_text = self._restore_placeholders(translated_text, placeholders)
@@ -327,41 +761,46 @@ class TranslationService:
                 
         except Exception as e:
             logger.error(f"Translation error: {str(e)}")
+            self._record_untranslated()
             return text  # Return original text on error
     
     def _prepare_text_for_translation(self, text):
-        """Prepare text for translation by replacing special items with placeholders."""
-        import re
-        
-        # Patterns to match
-        patterns = {
-            'number': r'\b\d+(\.\d+)?\b',
-            'date': r'\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b',
-            'email': r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
-            'url': r'https?://[^\s]+'
-        }
+        """
+        Prepare text for translation by replacing special items with placeholders.
         
+        URLs, email addresses, dates and numbers are replaced in a single pass;
+        repeated values share a placeholder.
+        
+        Args:
+            text: Text to prepare
+            
+        Returns:
+            Tuple of (text with placeholders, mapping of placeholder to original value)
+        """
         placeholders = {}
-        text_with_placeholders = text
+        seen = {}
         
-        # Replace patterns with placeholders
-        for pattern_type, pattern in patterns.items():
-            matches = re.finditer(pattern, text_with_placeholders)
-            for i, match in enumerate(matches):
-                placeholder = f"__{pattern_type}_{i}__"
-                placeholders[placeholder] = match.group(0)
-                text_with_placeholders = text_with_placeholders.replace(match.group(0), placeholder)
+        def replace(match):
+            value = match.group(0)
+            placeholder = seen.get(value)
+            if placeholder is None:
+                placeholder = f"__{match.lastgroup}_{len(seen)}__"
+                seen[value] = placeholder
+                placeholders[placeholder] = value
+            return placeholder
         
-        return text_with_placeholders, placeholders
+        return _PROTECTED_PATTERN.sub(replace, text), placeholders
     
     def _restore_placeholders(self, translated_text, placeholders):
         """Restore placeholders in translated text with original values."""
-        restored_text = translated_text
-        for placeholder, original in placeholders.items():
-            restored_text = restored_text.replace(placeholder, original)
-        return restored_text
+        if not placeholders:
+            return translated_text
+        return _PLACEHOLDER_PATTERN.sub(
+            lambda match: placeholders.get(match.group(0), match.group(0)), translated_text
+        )
     
-    def _translate_with_openai(self, text: str, target_lang: str = None, financial_terms: List[str] = None, temperature: float = 0.3) -> str:
+    def _translate_with_openai(self, text: str, target_lang: str = None, financial_terms: List[str] = None, temperature: float = 0.3,
+                               usage: Optional[Dict[str, int]] = None) -> str:
         """
         Translate text using OpenAI or xAI API.
         
@@ -370,24 +809,155 @@ class TranslationService:
             target_lang: Target language code (overrides self.target_lang if provided)
             financial_terms: List of financial terms for consistent translation
             temperature: Temperature for OpenAI generation (lower for more consistency)
+            usage: Optional dictionary to which the token usage of this call's requests
+                   is added (in addition to ``token_usage``)
             
         Returns:
             Translated text
         """
         if not self.api_key:
             logger.warning("No API key provided, returning original text")
+            self._record_untranslated()
             return f"[NO API KEY] {text}"
         
         # Use provided target_lang if available, otherwise use instance target_lang
         actual_target_lang = target_lang if target_lang is not None else self.target_lang
         
-        # Check if the text is too long and needs to be chunked
-        if self._count_tokens(text) > self.max_tokens // 2:
-            return self._translate_long_text(text, financial_terms, actual_target_lang)
+        # Check the translation memory before calling out to the API
+        glossary_version = TranslationMemory.glossary_version(financial_terms)
+        cached = self._recall(text, actual_target_lang, glossary_version)
+        if cached is not None:
+            return cached
+        
+        return self._translate_uncached(text, actual_target_lang, financial_terms, temperature, usage)[0]
+    
+    def _translate_uncached(self, text: str, target_lang: str, financial_terms: List[str] = None,
+                            temperature: float = 0.3,
+                            usage: Optional[Dict[str, int]] = None) -> Tuple[str, bool]:
+        """
+        Translate text with the API without consulting the translation memory.
+        
+        Used once the memory has already been checked for ``text``; the result
+        is still stored in the memory if the whole text was translated.
+        
+        Args:
+            text: Text to translate
+            target_lang: Target language code
+            financial_terms: List of financial terms for consistent translation
+            temperature: Temperature for OpenAI generation
+            usage: Optional dictionary to which the token usage of this call's requests is added
+            
+        Returns:
+            Tuple of (translated text, whether all of it was translated); on error
+            the original text (or chunk) is kept and the flag is False
+        """
+        glossary_version = TranslationMemory.glossary_version(financial_terms)
+        
+        # Check if the text is too long and needs to be chunked (reusing the encoding for the split)
+        tokens = self._encode(text)
+        token_count = len(tokens) if tokens is not None else self._count_tokens(text)
+        if token_count > self.max_tokens // 2:
+            translated_text, complete = self._translate_long_text(text, financial_terms, target_lang,
+                                                                  tokens=tokens, usage=usage)
+            if complete:
+                self._remember(text, translated_text, target_lang, glossary_version)
+            return translated_text, complete
         
         # Prepare system message with instructions
+        system_message = self._build_system_message(target_lang, financial_terms)
+        self._log_request(text, target_lang)
+        
+        try:
+            translated_text = self._chat_completion(system_message, text, temperature=temperature, usage=usage,
+                                                    user_tokens=token_count)
+        except Exception as e:
+            logger.error(f"API error: {str(e)}")
+            self._record_untranslated()
+            return text, False  # Return original text on error
+        
+        self._verify_translation(translated_text, target_lang)
+        self._remember(text, translated_text, target_lang, glossary_version)
+        return translated_text, True
+    
+    async def _atranslate_with_openai(self, text: str, target_lang: str = None, financial_terms: List[str] = None, temperature: float = 0.3) -> str:
+        """Async counterpart of ``_translate_with_openai``."""
+        if not self.api_key:
+            logger.warning("No API key provided, returning original text")
+            self._record_untranslated()
+            return f"[NO API KEY] {text}"
+        
+        actual_target_lang = target_lang if target_lang is not None else self.target_lang
+        
+        glossary_version = TranslationMemory.glossary_version(financial_terms)
+        cached = self._recall(text, actual_target_lang, glossary_version)
+        if cached is not None:
+            return cached
+        
+        translated_text, _ = await self._atranslate_uncached(text, actual_target_lang, financial_terms, temperature)
+        return translated_text
+    
+    async def _atranslate_uncached(self, text: str, target_lang: str, financial_terms: List[str] = None,
+                                   temperature: float = 0.3) -> Tuple[str, bool]:
+        """Async counterpart of ``_translate_uncached``."""
+        glossary_version = TranslationMemory.glossary_version(financial_terms)
+        
+        tokens = self._encode(text)
+        token_count = len(tokens) if tokens is not None else self._count_tokens(text)
+        if token_count > self.max_tokens // 2:
+            translated_text, complete = await self._atranslate_long_text(text, financial_terms, target_lang,
+                                                                         tokens=tokens)
+            if complete:
+                self._remember(text, translated_text, target_lang, glossary_version)
+            return translated_text, complete
+        
+        system_message = self._build_system_message(target_lang, financial_terms)
+        self._log_request(text, target_lang)
+        
+        try:
+            translated_text = await self._achat_completion(system_message, text, temperature=temperature,
+                                                           user_tokens=token_count)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"API error: {str(e)}")
+            self._record_untranslated()
+            return text, False  # Return original text on error
+        
+        self._verify_translation(translated_text, target_lang)
+        self._remember(text, translated_text, target_lang, glossary_version)
+        return translated_text, True
+    
+    def _log_request(self, text: str, target_lang: str) -> None:
+        """Log an outgoing single-text translation request."""
+        source_lang_name = self.language_names.get(self.source_lang, self.source_lang)
+        target_lang_name = self.language_names.get(target_lang, target_lang)
+        logger.info(f"Translating text with {self._provider_name()} ({len(text)} chars) from {source_lang_name} to {target_lang_name}")
+        if target_lang == "zh":
+            logger.info("Chinese translation requested - ensuring proper character encoding")
+    
+    def _verify_translation(self, translated_text: str, target_lang: str) -> None:
+        """Verify Chinese translation when appropriate."""
+        if target_lang != "zh":
+            return
+        model_provider = self._provider_name()
+        has_chinese = any('\u4e00' <= char <= '\u9fff' for char in translated_text)
+        if not has_chinese:
+            logger.warning(f"{model_provider} translation did not return Chinese characters. Result: {translated_text[:100]}...")
+        else:
+            logger.info(f"Chinese characters verified in {model_provider} translation output")
+    
+    def _provider(self) -> str:
+        """API provider key for the configured model ('openai' or 'xai')."""
+        return "xai" if self.model.startswith("grok") else "openai"
+    
+    def _provider_name(self) -> str:
+        """Human-readable name of the API provider for the configured model."""
+        return "OpenAI" if self.model.startswith("gpt") else "xAI Grok" if self.model.startswith("grok") else "Custom"
+    
+    def _build_system_message(self, target_lang: str, financial_terms: List[str] = None) -> str:
+        """Build the translator system prompt for a target language and glossary."""
         source_lang_name = self.language_names.get(self.source_lang, self.source_lang)
-        target_lang_name = self.language_names.get(actual_target_lang, actual_target_lang)
+        target_lang_name = self.language_names.get(target_lang, target_lang)
         
         system_message = f"You are a professional translator specializing in financial documents. Translate from {source_lang_name} to {target_lang_name}."
         
@@ -397,159 +967,287 @@ class TranslationService:
             system_message += f" Ensure consistent translation of the following financial terms: {terms_text}."
             
         system_message += " Preserve formatting, numbers, and special characters. Maintain the professional tone of financial documents."
+        return system_message
+    
+    def _get_client(self):
+        """Get the shared, connection-pooled API client for the configured model."""
+        return get_client(self._provider(), self.api_key)
+    
+    def _get_async_client(self):
+        """Get the shared, connection-pooled async API client for the configured model."""
+        return get_async_client(self._provider(), self.api_key)
+    
+    def _completion_request(self, system_message: str, user_content: str, temperature: float,
+                            user_tokens: Optional[int] = None):
+        """
+        Build the chat completion arguments and the token estimate used for rate limiting.
         
-        # Log important info
-        model_provider = "OpenAI" if self.model.startswith("gpt") else "xAI Grok" if self.model.startswith("grok") else "Custom"
-        logger.info(f"Translating text with {model_provider} ({len(text)} chars) from {source_lang_name} to {target_lang_name}")
-        if actual_target_lang == "zh":
-            logger.info("Chinese translation requested - ensuring proper character encoding")
+        ``user_tokens`` is the token count of ``user_content`` if the caller has
+        already encoded it; otherwise the content is counted here.
+        """
+        max_completion_tokens = self.max_tokens // 2
+        request = {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": system_message},
+                {"role": "user", "content": user_content}
+            ],
+            "temperature": temperature,
+            "max_tokens": max_completion_tokens
+        }
+        # The API counts max_tokens against the token budget until the request completes
+        if user_tokens is None:
+            user_tokens = self._count_tokens(user_content)
+        estimated_tokens = int(self._count_system_tokens(system_message) + user_tokens) + max_completion_tokens
+        return request, estimated_tokens
+    
+    def _count_system_tokens(self, system_message: str) -> int:
+        """Count the tokens of a system prompt, reusing the count for a prompt seen before."""
+        count = self._system_token_counts.get(system_message)
+        if count is None:
+            count = self._count_tokens(system_message)
+            self._system_token_counts[system_message] = count
+        return count
+    
+    def _completion_text(self, raw_response, limiter: RateLimiter, estimated_tokens: int,
+                         usage: Optional[Dict[str, int]] = None) -> str:
+        """Parse a raw completion response and settle its token usage with the rate limiter."""
+        response = raw_response.parse()
+        response_usage = getattr(response, "usage", None)
+        limiter.reconcile(estimated_tokens, getattr(response_usage, "total_tokens", None))
+        self._record_usage(response_usage, usage)
+        return response.choices[0].message.content.strip()
+    
+    def _record_usage(self, usage, call_usage: Optional[Dict[str, int]] = None) -> None:
+        """Add the token usage of one API response to ``token_usage`` (and ``call_usage`` if given)."""
+        with self._usage_lock:
+            for totals in (self.token_usage, call_usage):
+                if totals is None:
+                    continue
+                totals["requests"] = totals.get("requests", 0) + 1
+                for key in ("prompt_tokens", "completion_tokens", "total_tokens"):
+                    value = getattr(usage, key, None)
+                    if isinstance(value, int):
+                        totals[key] = totals.get(key, 0) + value
+    
+    def _record_untranslated(self, count: int = 1) -> None:
+        """Count texts that fell back to their source (see ``translation_succeeded``)."""
+        with self._usage_lock:
+            self.untranslated_segments += count
+    
+    def _chat_completion(self, system_message: str, user_content: str, temperature: float = 0.3,
+                         usage: Optional[Dict[str, int]] = None, user_tokens: Optional[int] = None) -> str:
+        """
+        Send a single chat completion request and return the response text.
         
-        try:
-            # Configure client based on model type
-            if self.model.startswith("gpt"):
-                # Call OpenAI API for translation using the latest client format
-                client = openai.OpenAI(api_key=self.api_key)
-            elif self.model.startswith("grok"):
-                # Call xAI API for translation
-                client = openai.OpenAI(
-                    api_key=self.api_key,
-                    base_url="https://api.x.ai/v1"
-                )
-            else:
-                # Default to OpenAI
-                client = openai.OpenAI(api_key=self.api_key)
-            
-            response = client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_message},
-                    {"role": "user", "content": text}
-                ],
-                temperature=temperature,  # Use provided temperature
-                max_tokens=self.max_tokens // 2
-            )
-            
-            translated_text = response.choices[0].message.content.strip()
+        Args:
+            system_message: System prompt
+            user_content: User message content
+            temperature: Sampling temperature
+            usage: Optional dictionary to which the token usage of this request is added
+            user_tokens: Token count of ``user_content``, if already known
             
-            # Verify Chinese translation when appropriate
-            if actual_target_lang == "zh":
-                has_chinese = any('\u4e00' <= char <= '\u9fff' for char in translated_text)
-                if not has_chinese:
-                    logger.warning(f"{model_provider} translation did not return Chinese characters. Result: {translated_text[:100]}...")
-                else:
-                    logger.info(f"Chinese characters verified in {model_provider} translation output")
-                    
-            return translated_text
+        Returns:
+            The stripped response content
             
+        Raises:
+            Exception: If the request fails after the rate limiter's retries
+        """
+        request, estimated_tokens = self._completion_request(system_message, user_content, temperature, user_tokens)
+        limiter = get_rate_limiter(self.model)
+        client = self._get_client()
+        
+        raw_response = limiter.call(
+            lambda: client.chat.completions.with_raw_response.create(**request),
+            estimated_tokens
+        )
+        return self._completion_text(raw_response, limiter, estimated_tokens, usage)
+    
+    async def _achat_completion(self, system_message: str, user_content: str, temperature: float = 0.3,
+                                user_tokens: Optional[int] = None) -> str:
+        """Async counterpart of ``_chat_completion``, bounded by the provider concurrency limit."""
+        request, estimated_tokens = self._completion_request(system_message, user_content, temperature, user_tokens)
+        limiter = get_rate_limiter(self.model)
+        client = self._get_async_client()
+        
+        async with _provider_semaphore(self._provider()):
+            raw_response = await limiter.acall(
+                lambda: client.chat.completions.with_raw_response.create(**request),
+                estimated_tokens
+            )
+        return self._completion_text(raw_response, limiter, estimated_tokens)
+    
+    def _recall(self, text: str, target_lang: str, glossary_version: str) -> Optional[str]:
+        """Look up a translation in the translation memory, if one is configured."""
+        if not self.translation_memory:
+            return None
+        cached = self.translation_memory.get(
+            text, self.source_lang, target_lang, self.model, glossary_version
+        )
+        if cached is not None:
+            logger.debug(f"Translation memory hit ({len(text)} chars)")
+        return cached
+    
+    def _remember(self, text: str, translated_text: str, target_lang: str, glossary_version: str) -> None:
+        """Store a successful translation in the translation memory, if one is configured."""
+        if not self.translation_memory or not translated_text or translated_text == text:
+            return
+        try:
+            self.translation_memory.put(
+                text, translated_text, self.source_lang, target_lang, self.model, glossary_version
+            )
         except Exception as e:
-            logger.error(f"API error: {str(e)}")
-            
-            # Simple retry with backoff in case of rate limiting
-            if "rate limit" in str(e).lower():
-                logger.info("Rate limit hit, retrying after delay...")
-                time.sleep(2)
-                try:
-                    # Configure client based on model type (same as above)
-                    if self.model.startswith("gpt"):
-                        client = openai.OpenAI(api_key=self.api_key)
-                    elif self.model.startswith("grok"):
-                        client = openai.OpenAI(
-                            api_key=self.api_key,
-                            base_url="https://api.x.ai/v1"
-                        )
-                    else:
-                        client = openai.OpenAI(api_key=self.api_key)
-                    
-                    response = client.chat.completions.create(
-                        model=self.model,
-                        messages=[
-                            {"role": "system", "content": system_message},
-                            {"role": "user", "content": text}
-                        ],
-                        temperature=temperature,  # Use provided temperature
-                        max_tokens=self.max_tokens // 2
-                    )
-                    
-                    translated_text = response.choices[0].message.content.strip()
-                    
-                    # Verify Chinese translation when appropriate
-                    if actual_target_lang == "zh":
-                        has_chinese = any('\u4e00' <= char <= '\u9fff' for char in translated_text)
-                        if not has_chinese:
-                            logger.warning(f"Retry translation did not return Chinese characters.")
-                        else:
-                            logger.info("Chinese characters verified in retry translation")
-                            
-                    return translated_text
-                except Exception as e2:
-                    logger.error(f"API retry failed: {str(e2)}")
-            
-            return text  # Return original text on error
+            logger.warning(f"Could not store translation in memory: {str(e)}")
     
-    def _translate_long_text(self, text: str, financial_terms: List[str] = None, target_lang: str = None) -> str:
+    def _split_long_text(self, text: str, tokens: Optional[List[int]] = None) -> List[str]:
         """
-        Handle translation of long text by splitting it into chunks.
+        Split text into sentence-aligned chunks that fit in a single request.
+        
+        With a tokenizer the text is encoded once and cut at token offsets,
+        moving each cut back to the last sentence end before it (or cutting
+        mid-sentence if a single sentence is longer than a chunk).
         
         Args:
-            text: Long text to translate
-            financial_terms: List of financial terms for consistent translation
-            target_lang: Target language code (overrides self.target_lang if provided)
+            text: Text to split
+            tokens: Encoding of ``text``, if the caller already has it
             
         Returns:
-            Combined translated text
+            List of chunks
         """
-        # Use provided target_lang if available, otherwise use instance target_lang
-        actual_target_lang = target_lang if target_lang is not None else self.target_lang
+        limit = self.max_tokens // 2
+        if tokens is None:
+            tokens = self._encode(text)
+        
+        if tokens is None:
+            chunks = self._split_long_text_estimated(text, limit)
+        else:
+            chunks = self._split_long_text_by_tokens(text, tokens, limit)
         
-        # Simple text chunking by sentences
-        import re
+        logger.info(f"Split long text ({len(text)} chars) into {len(chunks)} chunks for translation")
+        return chunks
+    
+    def _split_long_text_by_tokens(self, text: str, tokens: List[int], limit: int) -> List[str]:
+        """Cut text into chunks of at most ``limit`` tokens, aligned to sentence ends where possible."""
+        decoded, offsets = self.tokenizer.decode_with_offsets(tokens)
+        if decoded != text:
+            # Offsets only line up with text that round-trips through the tokenizer
+            return self._split_long_text_estimated(text, limit)
+        
+        sentence_ends = [match.start() for match in _SENTENCE_END.finditer(text)]
+        
+        chunks = []
+        start_token = 0
+        while start_token < len(tokens):
+            start_char = offsets[start_token]
+            end_token = start_token + limit
+            if end_token >= len(tokens):
+                end_char = len(text)
+                end_token = len(tokens)
+            else:
+                # Last sentence end inside the window, else a hard cut at the token boundary
+                end_char = offsets[end_token]
+                index = bisect_right(sentence_ends, end_char) - 1
+                if index >= 0 and sentence_ends[index] > start_char:
+                    end_char = sentence_ends[index]
+                    end_token = max(bisect_left(offsets, end_char), start_token + 1)
+                    end_char = offsets[end_token] if end_token < len(tokens) else len(text)
+            
+            chunk = text[start_char:end_char].strip()
+            if chunk:
+                chunks.append(chunk)
+            start_token = end_token
         
-        # Split text into sentences
-        sentences = re.split(r'(?<=[.!?])\s+', text)
+        return chunks
+    
+    def _split_long_text_estimated(self, text: str, limit: int) -> List[str]:
+        """Group sentences into chunks using estimated token counts."""
+        # Split text into sentences, keeping the original text between them
+        bounds = [0] + [match.start() for match in _SENTENCE_END.finditer(text)] + [len(text)]
         
         # Group sentences into chunks
         chunks = []
-        current_chunk = []
+        chunk_start = 0
         current_length = 0
         
-        for sentence in sentences:
-            sentence_length = self._count_tokens(sentence)
+        for start, end in zip(bounds, bounds[1:]):
+            sentence_length = self._count_tokens(text[start:end])
             
             # If adding this sentence would exceed chunk size, start a new chunk
-            if current_length + sentence_length > (self.max_tokens // 2):
-                chunks.append(" ".join(current_chunk))
-                current_chunk = [sentence]
+            if start > chunk_start and current_length + sentence_length > limit:
+                chunks.append(text[chunk_start:start].strip())
+                chunk_start = start
                 current_length = sentence_length
             else:
-                current_chunk.append(sentence)
                 current_length += sentence_length
         
         # Add any remaining sentences
-        if current_chunk:
-            chunks.append(" ".join(current_chunk))
+        if text[chunk_start:].strip():
+            chunks.append(text[chunk_start:].strip())
         
-        logger.info(f"Split long text ({len(text)} chars) into {len(chunks)} chunks for translation")
+        return chunks
+    
+    def _translate_long_text(self, text: str, financial_terms: List[str] = None, target_lang: str = None,
+                             tokens: Optional[List[int]] = None,
+                             usage: Optional[Dict[str, int]] = None) -> Tuple[str, bool]:
+        """
+        Handle translation of long text by splitting it into chunks.
+        
+        Args:
+            text: Long text to translate
+            financial_terms: List of financial terms for consistent translation
+            target_lang: Target language code (overrides self.target_lang if provided)
+            tokens: Encoding of ``text``, if already computed
+            usage: Optional dictionary to which the token usage of the chunk requests is added
+            
+        Returns:
+            Tuple of (combined translated text, whether every chunk was translated)
+        """
+        # Use provided target_lang if available, otherwise use instance target_lang
+        actual_target_lang = target_lang if target_lang is not None else self.target_lang
+        glossary_version = TranslationMemory.glossary_version(financial_terms)
+        
+        chunks = self._split_long_text(text, tokens)
         
         # Translate each chunk
         translated_chunks = []
+        complete = True
         for i, chunk in enumerate(chunks):
             logger.info(f"Translating chunk {i+1}/{len(chunks)} of long text")
-            translated_chunk = self._translate_with_openai(
-                text=chunk,
-                target_lang=actual_target_lang,
-                financial_terms=financial_terms
-            )
+            translated_chunk = self._recall(chunk, actual_target_lang, glossary_version)
+            if translated_chunk is None:
+                translated_chunk, chunk_complete = self._translate_uncached(
+                    chunk, actual_target_lang, financial_terms, usage=usage
+                )
+                complete = complete and chunk_complete
             translated_chunks.append(translated_chunk)
-            
-            # Add a small delay between API calls to avoid rate limiting
-            if i < len(chunks) - 1:
-                time.sleep(1)  # Increased delay to better handle rate limits
         
-        # Combine translated chunks
+        return self._join_chunks(translated_chunks, actual_target_lang), complete
+    
+    async def _atranslate_long_text(self, text: str, financial_terms: List[str] = None, target_lang: str = None,
+                                    tokens: Optional[List[int]] = None) -> Tuple[str, bool]:
+        """Async counterpart of ``_translate_long_text``; chunks are translated concurrently."""
+        actual_target_lang = target_lang if target_lang is not None else self.target_lang
+        glossary_version = TranslationMemory.glossary_version(financial_terms)
+        
+        async def translate_chunk(chunk):
+            cached = self._recall(chunk, actual_target_lang, glossary_version)
+            if cached is not None:
+                return cached, True
+            return await self._atranslate_uncached(chunk, actual_target_lang, financial_terms)
+        
+        chunks = self._split_long_text(text, tokens)
+        results = await asyncio.gather(*(translate_chunk(chunk) for chunk in chunks))
+        
+        translated_chunks = [translated_chunk for translated_chunk, _ in results]
+        complete = all(chunk_complete for _, chunk_complete in results)
+        return self._join_chunks(translated_chunks, actual_target_lang), complete
+    
+    def _join_chunks(self, translated_chunks: List[str], target_lang: str) -> str:
+        """Combine translated chunks of a long text."""
         result = " ".join(translated_chunks)
         
         # Verify Chinese translation when appropriate
-        if actual_target_lang == "zh":
+        if target_lang == "zh":
             has_chinese = any('\u4e00' <= char <= '\u9fff' for char in result)
             if not has_chinese:
                 logger.warning("Long text translation did not produce Chinese characters")
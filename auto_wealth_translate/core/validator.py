@@ -39,14 +39,16 @@ class OutputValidator:
             translated_document: Translated document output
             
         Returns:
-            Validation results including score and issues
+            Validation results including score, issues and whether validation
+            passed ('success', True when no issues were found)
         """
         logger.info("Validating translated document")
         
         # Initialize validation results
         results = {
             "score": 0,
-            "issues": []
+            "issues": [],
+            "success": False
         }
         
         # Check for completeness
@@ -124,6 +126,7 @@ class OutputValidator:
             if not results["issues"]:
                 results["issues"].append("Low quality translation detected")
         
+        results["success"] = not results["issues"]
         return results
     
     def validate_markdown_document(self, markdown_result: Dict[str, Any], original_components: List[DocumentComponent]) -> Dict[str, Any]:
@@ -135,14 +138,16 @@ class OutputValidator:
             original_components: Original document components
             
         Returns:
-            Validation results including score and issues
+            Validation results including score, issues and whether validation
+            passed ('success', True when no issues were found)
         """
         logger.info("Validating markdown-processed document")
         
         # Initialize validation results
         results = {
             "score": 8,  # Start with a higher base score for markdown processing
-            "issues": []
+            "issues": [],
+            "success": False
         }
         
         # Check document existence
@@ -183,7 +188,8 @@ class OutputValidator:
             logger.info(f"Markdown translation validated with moderate score: {results['score']}/10")
         else:
             logger.warning(f"Markdown translation validated with low score: {results['score']}/10")
-            
+        
+        results["success"] = not results["issues"]
         return results
     
     def _check_formatting_consistency(self, original_components, translated_components):
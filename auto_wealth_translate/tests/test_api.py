@@ -0,0 +1,104 @@
+"""
+Tests for the API module.
+"""
+
+import asyncio
+import hashlib
+import io
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from fastapi import HTTPException, UploadFile
+from fastapi.testclient import TestClient
+
+from auto_wealth_translate import api
+from auto_wealth_translate.core.job_store import JobStore
+
+
+class TestTranslateUpload(unittest.TestCase):
+    """Tests for uploads to the /translate endpoint."""
+
+    def setUp(self):
+        """Point the API at a temporary job store and upload directory."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.upload_dir = self.temp_dir / "uploads"
+        self.upload_dir.mkdir()
+        self.store = JobStore(str(self.temp_dir / "jobs.sqlite"))
+        self.addCleanup(self.store.close)
+
+        translation_service = MagicMock()
+        translation_service.return_value.output_settings.return_value = {}
+        self.addCleanup(patch.stopall)
+        for target, value in (("UPLOAD_DIR", self.upload_dir), ("OUTPUT_DIR", self.temp_dir),
+                              ("job_store", self.store), ("TranslationService", translation_service),
+                              ("MAX_UPLOAD_BYTES", 1024)):
+            patch.object(api, target, value).start()
+        self.submit = patch.object(api.job_queue, "submit", return_value=1).start()
+
+        # Not used as a context manager, so the shared job queue is not shut down
+        self.client = TestClient(api.app)
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _upload(self, data: bytes):
+        return self.client.post("/translate", data={"target_lang": "fr"},
+                                files={"file": ("plan.pdf", data, "application/pdf")})
+
+    def test_upload_is_hashed(self):
+        """Test that the stored job records the SHA-256 and size of the upload."""
+        data = b"%PDF-1.7 " + bytes(range(256)) * 2
+
+        response = self._upload(data)
+
+        self.assertEqual(response.status_code, 200)
+        job = self.store.get(response.json()["job_id"])
+        self.assertEqual(job["content_sha256"], hashlib.sha256(data).hexdigest())
+        self.assertEqual(job["file_size"], len(data))
+        self.assertEqual(len(list(self.upload_dir.iterdir())), 1)
+
+    def test_duplicate_upload_is_removed(self):
+        """Test that an upload attached to an existing job does not leave its file behind."""
+        first = self._upload(b"%PDF-1.7 plan").json()
+        second = self._upload(b"%PDF-1.7 plan").json()
+
+        self.assertTrue(second["deduplicated"])
+        self.assertEqual(second["job_id"], first["job_id"])
+        self.assertEqual(self.submit.call_count, 1)
+        self.assertEqual([path.stem for path in self.upload_dir.iterdir()], [first["job_id"]])
+
+    def test_oversized_upload_is_rejected(self):
+        """Test that uploads over the limit get HTTP 413 and leave no file behind."""
+        response = self._upload(b"x" * 2048)
+
+        self.assertEqual(response.status_code, 413)
+        self.assertEqual(list(self.upload_dir.iterdir()), [])
+
+    def test_oversized_stream_is_rejected(self):
+        """Test that an upload of unknown size is cut off once the streamed bytes exceed the limit."""
+        path = self.upload_dir / "stream.pdf"
+        upload = UploadFile(io.BytesIO(b"x" * 2048), filename="stream.pdf")
+
+        with patch.object(api, "UPLOAD_CHUNK_SIZE", 512):
+            with self.assertRaises(HTTPException) as raised:
+                asyncio.run(api._save_upload(upload, path))
+
+        self.assertEqual(raised.exception.status_code, 413)
+        self.assertFalse(path.exists())
+
+    def test_upload_is_removed_when_job_creation_fails(self):
+        """Test that the upload is deleted if the job record cannot be created."""
+        with patch.object(self.store, "create_or_attach", side_effect=sqlite3.OperationalError("locked")):
+            with self.assertRaises(sqlite3.OperationalError):
+                self._upload(b"%PDF-1.7 plan")
+
+        self.assertEqual(list(self.upload_dir.iterdir()), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+"""
+Tests for the artifact cache module.
+"""
+
+import hashlib
+import os
+import shutil
+import tempfile
+import unittest
+
+from auto_wealth_translate.core.artifact_cache import ArtifactCache, artifact_key, file_sha256
+
+
+class TestArtifactCache(unittest.TestCase):
+    """Tests for the ArtifactCache class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = ArtifactCache(os.path.join(self.temp_dir, "cache"))
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_key_and_round_trip(self):
+        """Test that outputs are keyed by content and settings and can be read back."""
+        input_path = os.path.join(self.temp_dir, "plan.pdf")
+        with open(input_path, "wb") as f:
+            f.write(b"%PDF-1.4 plan" * 1000)
+        digest = file_sha256(input_path, chunk_size=100)
+        self.assertEqual(digest, hashlib.sha256(b"%PDF-1.4 plan" * 1000).hexdigest())
+
+        settings = {"max_tokens": 8000, "max_batch_items": 40}
+        key = artifact_key(digest, "en", "fr", "gpt-4", "enhanced", settings)
+        self.assertEqual(key, artifact_key(digest, "en", "fr", "gpt-4", "enhanced", dict(settings)))
+        self.assertNotEqual(key, artifact_key(digest, "en", "fr", "gpt-4", "bilingual", settings))
+        self.assertNotEqual(key, artifact_key(digest, "en", "de", "gpt-4", "enhanced", settings))
+        self.assertNotEqual(key, artifact_key(digest, "es", "fr", "gpt-4", "enhanced", settings))
+        self.assertNotEqual(key, artifact_key(digest, "en", "fr", "gpt-4", "enhanced",
+                                              {"max_tokens": 8000, "max_batch_items": 10}))
+
+        self.assertIsNone(self.cache.get(key, ".pdf"))
+
+        output_path = os.path.join(self.temp_dir, "plan_fr.pdf")
+        with open(output_path, "wb") as f:
+            f.write(b"translated")
+        cached_path = self.cache.put(key, output_path)
+
+        self.assertEqual(self.cache.get(key, ".pdf"), cached_path)
+        self.assertEqual(cached_path.read_bytes(), b"translated")
+        self.assertEqual([p.name for p in cached_path.parent.iterdir()], [cached_path.name])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,150 @@
+"""
+Tests for the document processor module.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import fitz
+
+from auto_wealth_translate.core.document_processor import DocumentProcessor, TextComponent
+
+
+def _crash_worker(self, page_indices, page_modes):
+    """Stand-in for ``_extract_page_range`` that kills the worker process."""
+    os._exit(1)
+
+
+def _extract_page_range(self, page_indices, page_modes):
+    """
+    Stand-in for ``DocumentProcessor._extract_page_range`` that reports which
+    range each page was extracted in; it shares the method's name so that the
+    bound method still pickles into the worker processes.
+    """
+    return [(page_idx, [TextComponent(component_id="", component_type="text", page_number=page_idx + 1,
+                                      text=f"{page_indices.start}-{page_indices.stop}",
+                                      metadata=dict(page_modes[page_idx]))])
+            for page_idx in page_indices]
+
+
+class TestDocumentProcessor(unittest.TestCase):
+    """Tests for the DocumentProcessor class."""
+
+    def setUp(self):
+        """Create a small multi-page PDF."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.pdf_path = os.path.join(self.temp_dir, "report.pdf")
+
+        doc = fitz.open()
+        for page_idx in range(5):
+            page = doc.new_page()
+            page.insert_text((72, 150), f"Portfolio summary for page {page_idx + 1}", fontsize=12)
+            page.insert_text((72, 300), f"Net worth increased by {page_idx + 2}%", fontsize=11)
+        doc.save(self.pdf_path)
+        doc.close()
+
+    def tearDown(self):
+        """Remove the temporary PDF."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_parallel_matches_serial(self):
+        """Test that parallel extraction returns the same components as serial extraction."""
+        serial = DocumentProcessor(self.pdf_path).process()
+        parallel = DocumentProcessor(self.pdf_path, max_workers=2).process()
+
+        self.assertEqual(len(serial), 10)
+        self.assertEqual(serial, parallel)
+        self.assertEqual([c.component_id for c in serial], [f"text_{i}" for i in range(10)])
+        self.assertEqual([c.page_number for c in serial], sorted(c.page_number for c in serial))
+
+    def test_parallel_falls_back_to_serial_when_worker_crashes(self):
+        """Test that a crashed worker process does not abort extraction."""
+        serial = DocumentProcessor(self.pdf_path).process()
+
+        with patch.object(DocumentProcessor, "_extract_page_range", _crash_worker):
+            parallel = DocumentProcessor(self.pdf_path, max_workers=2).process()
+
+        self.assertEqual(serial, parallel)
+
+    def test_iter_pages_streams_in_order(self):
+        """Test that page iteration yields the same components as process()."""
+        processor = DocumentProcessor(self.pdf_path)
+        pages = list(processor.iter_pages())
+
+        self.assertEqual([page_number for page_number, _ in pages], [1, 2, 3, 4, 5])
+        self.assertEqual([c for _, components in pages for c in components], processor.process())
+
+    def test_ocr_data_to_components(self):
+        """Test that OCR word boxes are grouped into lines and scaled to PDF points."""
+        data = {
+            "text": ["", "Net", "Worth", "Total"],
+            "conf": ["-1", "95", "93", "90"],
+            "block_num": [1, 1, 1, 1],
+            "par_num": [1, 1, 1, 1],
+            "line_num": [0, 1, 1, 2],
+            "word_num": [0, 1, 2, 1],
+            "left": [0, 600, 800, 600],
+            "top": [0, 600, 600, 900],
+            "width": [0, 150, 200, 180],
+            "height": [0, 50, 50, 50],
+        }
+        page = fitz.open(self.pdf_path)[0]
+
+        processor = DocumentProcessor(self.pdf_path, ocr_granularity=DocumentProcessor.OCR_LINE)
+        lines = processor._ocr_data_to_components(data, page, 0, 72 / 300)
+
+        self.assertEqual([c.text for c in lines], ["Net Worth", "Total"])
+        self.assertEqual(lines[0].position, {"x0": 144.0, "y0": 144.0, "x1": 240.0, "y1": 156.0})
+
+        processor = DocumentProcessor(self.pdf_path, ocr_granularity=DocumentProcessor.OCR_WORD)
+        words = processor._ocr_data_to_components(data, page, 0, 72 / 300)
+
+        self.assertEqual([c.text for c in words], ["Net", "Worth", "Total"])
+
+    def _make_mixed_pdf(self):
+        """Append a scanned page to the test PDF and return the new path."""
+        doc = fitz.open(self.pdf_path)
+        scanned = doc.new_page()
+        scan = fitz.Pixmap(fitz.csGRAY, fitz.IRect(0, 0, 200, 280), False)
+        scan.clear_with(200)
+        scanned.insert_image(scanned.rect, pixmap=scan)
+        mixed_path = os.path.join(self.temp_dir, "mixed.pdf")
+        doc.save(mixed_path)
+        doc.close()
+        return mixed_path
+
+    def test_ocr_is_decided_per_page(self):
+        """Test that only scanned pages of a mixed document are OCRed."""
+        mixed_path = self._make_mixed_pdf()
+
+        def fake_ocr(page, page_idx):
+            return [TextComponent(component_id="", component_type="text",
+                                  page_number=page_idx + 1, text="Scanned appendix")]
+
+        processor = DocumentProcessor(mixed_path, ocr_workers=1)
+        with patch.object(processor, "_extract_text_with_ocr", side_effect=fake_ocr) as mock_ocr:
+            components = processor.process()
+
+        self.assertEqual(mock_ocr.call_count, 1)
+        self.assertEqual(components[-2].text, "Scanned appendix")
+        self.assertTrue(components[-2].metadata["ocr"])
+        self.assertGreater(components[-2].metadata["image_coverage"], 0.9)
+        self.assertFalse(components[0].metadata["ocr"])
+
+    def test_ocr_workers_apply_to_scanned_pages_only(self):
+        """Test that text pages keep their ranges while scanned pages are extracted on their own."""
+        processor = DocumentProcessor(self._make_mixed_pdf(), max_workers=1, ocr_workers=2)
+        with patch.object(DocumentProcessor, "_extract_page_range", _extract_page_range):
+            components = processor.process()
+
+        self.assertEqual([c.page_number for c in components], [1, 2, 3, 4, 5, 6])
+        self.assertEqual(components[-1].text, "5-6")
+        self.assertTrue(components[-1].metadata["ocr"])
+        self.assertEqual({c.text for c in components[:-1]}, {"0-2", "2-4", "4-5"})
+
+
+if __name__ == '__main__':
+    unittest.main()
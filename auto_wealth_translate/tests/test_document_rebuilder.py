@@ -0,0 +1,143 @@
+"""
+Tests for the document rebuilder module.
+"""
+
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+import fitz
+
+from auto_wealth_translate.core.document_processor import TextComponent, TableComponent
+from auto_wealth_translate.core.document_rebuilder import DocumentRebuilder, DocumentOutput
+from auto_wealth_translate.core.markdown_processor import MarkdownProcessor
+
+
+class TestDocumentRebuilder(unittest.TestCase):
+    """Tests for the DocumentRebuilder class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.rebuilder = DocumentRebuilder()
+        self.components = [
+            TextComponent(component_id="text_0", component_type="text", page_number=1,
+                          text="投资组合摘要", font_info={"size": 14},
+                          position={"x0": 50, "y0": 50, "x1": 550, "y1": 80}, is_header=True),
+            TextComponent(component_id="text_1", component_type="text", page_number=1,
+                          text="净资产增长了百分之五。" * 10, font_info={"size": 11},
+                          position={"x0": 50, "y0": 100, "x1": 300, "y1": 130}),
+            TableComponent(component_id="table_2", component_type="table", page_number=2,
+                           rows=[["资产", "比例"], ["Equity", "60%"]],
+                           position={"x0": 50, "y0": 200, "x1": 550, "y1": 260}),
+        ]
+
+    def test_vector_mode_writes_selectable_text(self):
+        """Test that vector mode produces real PDF text rather than page images."""
+        output = self.rebuilder.rebuild(self.components, "pdf", DocumentRebuilder.MODE_VECTOR)
+
+        doc = fitz.open(stream=output.data, filetype="pdf")
+        self.assertEqual(len(doc), 2)
+        self.assertIn("投资组合摘要", doc[0].get_text())
+        self.assertIn("Equity", doc[1].get_text())
+        self.assertEqual(doc[0].get_images(), [])
+        # Overlong text is shrunk to fit its box instead of being cut off
+        self.assertEqual(doc[0].get_text().replace("\n", "").count("净资产增长了百分之五"), 10)
+
+    def test_parallel_rebuild_matches_serial(self):
+        """Test that rendering pages in worker processes gives the same pages in order."""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            source_path = os.path.join(temp_dir, "source.pdf")
+            doc = fitz.open()
+            for page_idx in range(4):
+                doc.new_page().insert_text((72, 72), f"Page {page_idx + 1}")
+            doc.save(source_path)
+            doc.close()
+            
+            components = [
+                TextComponent(component_id=f"text_{i}", component_type="text", page_number=i + 1,
+                              text=f"Seite {i + 1}", position={"x0": 50, "y0": 300, "x1": 300, "y1": 330})
+                for i in range(4)
+            ]
+            
+            for mode in (DocumentRebuilder.MODE_VECTOR, DocumentRebuilder.MODE_BILINGUAL):
+                serial = self.rebuilder.rebuild(components, "pdf", mode, source_pdf_path=source_path)
+                parallel = DocumentRebuilder(max_workers=2).rebuild(components, "pdf", mode,
+                                                                    source_pdf_path=source_path)
+                
+                serial_doc = fitz.open(stream=serial.data, filetype="pdf")
+                parallel_doc = fitz.open(stream=parallel.data, filetype="pdf")
+                self.assertEqual([page.get_text() for page in parallel_doc],
+                                 [page.get_text() for page in serial_doc])
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def test_failed_fragment_is_not_replaced(self):
+        """Test that a failing page range raises instead of rendering the enhanced layout."""
+        missing_path = os.path.join(tempfile.gettempdir(), "missing-source.pdf")
+        
+        for render in (self.rebuilder._rebuild_pdf_precise, self.rebuilder._rebuild_pdf_bilingual):
+            with self.assertRaises(Exception):
+                render(self.components, missing_path, page_range=range(1, 2))
+            
+            # The whole document still falls back to enhanced mode
+            output = render(self.components, missing_path)
+            self.assertEqual(len(fitz.open(stream=output.data, filetype="pdf")), 2)
+    
+    def test_bilingual_markdown_translates_each_page_once(self):
+        """Test that a supplied translation service translates page Markdown once and not the components."""
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir, ignore_errors=True)
+        source_path = os.path.join(temp_dir, "source.pdf")
+        doc = fitz.open()
+        for page_idx in range(2):
+            doc.new_page().insert_text((72, 72), f"Portfolio page {page_idx + 1}")
+        doc.save(source_path)
+        doc.close()
+        
+        translation_service = MagicMock()
+        with patch.object(MarkdownProcessor, "translate_markdown",
+                          side_effect=lambda md_content, translator: f"Traduit: {md_content}") as mock_translate:
+            output = self.rebuilder.rebuild(self.components, "pdf", DocumentRebuilder.MODE_BILINGUAL_MARKDOWN,
+                                            source_pdf_path=source_path,
+                                            translation_service=translation_service)
+        
+        self.assertEqual(mock_translate.call_count, 2)
+        for page_num, call in enumerate(mock_translate.call_args_list, start=1):
+            md_content, translator = call.args
+            self.assertIn(f"Portfolio page {page_num}", md_content)
+            self.assertIs(translator, translation_service)
+        translation_service.translate.assert_not_called()
+        
+        output_doc = fitz.open(stream=output.data, filetype="pdf")
+        self.assertEqual(output_doc[0].get_text().strip(), "Portfolio page 1")
+        self.assertGreaterEqual(len(output_doc), 4)
+    
+    def test_rebuild_reports_page_progress(self):
+        """Test that the progress callback receives an event per rebuilt page."""
+        events = []
+        rebuilder = DocumentRebuilder(progress_callback=events.append)
+        rebuilder.rebuild(self.components, "pdf", DocumentRebuilder.MODE_VECTOR)
+        
+        self.assertEqual(events, [{"stage": "rebuild", "completed": 1, "total": 2},
+                                  {"stage": "rebuild", "completed": 2, "total": 2}])
+    
+    def test_output_writes_to_stream(self):
+        """Test that a document output can be written to a stream and reports its media type."""
+        output = DocumentOutput(b"%PDF-1.7 " + b"x" * 100, "pdf")
+        
+        buffer = io.BytesIO()
+        output.save(buffer)
+        self.assertEqual(buffer.getvalue(), output.data)
+        
+        self.assertEqual(output.media_type, "application/pdf")
+        self.assertEqual(DocumentOutput.media_type_for(".DOCX"),
+                         "application/vnd.openxmlformats-officedocument.wordprocessingml.document")
+        self.assertEqual(DocumentOutput.media_type_for(".txt"), "application/octet-stream")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+"""
+Tests for the job queue module.
+"""
+
+import threading
+import time
+import unittest
+
+from auto_wealth_translate.core.job_queue import JobQueue, QueueFullError
+
+
+class TestJobQueue(unittest.TestCase):
+    """Tests for the JobQueue class."""
+
+    def test_runs_jobs_with_bounded_concurrency(self):
+        """Test that every job runs and no more than max_workers run at once."""
+        job_queue = JobQueue(max_workers=2, max_queued=10)
+        lock = threading.Lock()
+        state = {"in_flight": 0, "peak": 0}
+        done = []
+
+        def job(index):
+            with lock:
+                state["in_flight"] += 1
+                state["peak"] = max(state["peak"], state["in_flight"])
+            time.sleep(0.02)
+            with lock:
+                state["in_flight"] -= 1
+                done.append(index)
+
+        for index in range(6):
+            job_queue.submit(f"job-{index}", job, index)
+        job_queue.join()
+        job_queue.shutdown()
+
+        self.assertEqual(sorted(done), list(range(6)))
+        self.assertEqual(state["peak"], 2)
+
+    def test_rejects_jobs_when_full(self):
+        """Test that submissions beyond the queue capacity raise QueueFullError."""
+        job_queue = JobQueue(max_workers=1, max_queued=2)
+        release = threading.Event()
+        started = threading.Event()
+
+        def blocking_job():
+            started.set()
+            release.wait(5)
+
+        job_queue.submit("running", blocking_job)
+        started.wait(5)
+        job_queue.submit("queued-1", blocking_job)
+        job_queue.submit("queued-2", blocking_job)
+
+        self.assertTrue(job_queue.full())
+        with self.assertRaises(QueueFullError) as context:
+            job_queue.submit("rejected", blocking_job)
+        self.assertEqual(context.exception.depth, 2)
+        self.assertEqual(job_queue.running, 1)
+
+        release.set()
+        job_queue.join()
+        job_queue.shutdown()
+        self.assertEqual(job_queue.depth, 0)
+
+    def test_shutdown_does_not_block_on_full_queue(self):
+        """Test that shutting down with a full queue returns at once and still runs queued jobs."""
+        job_queue = JobQueue(max_workers=1, max_queued=1)
+        release = threading.Event()
+        started = threading.Event()
+        done = []
+
+        def blocking_job():
+            started.set()
+            release.wait(5)
+            done.append("running")
+
+        job_queue.submit("running", blocking_job)
+        started.wait(5)
+        job_queue.submit("queued", done.append, "queued")
+        self.assertTrue(job_queue.full())
+
+        start = time.monotonic()
+        job_queue.shutdown(wait=False)
+        self.assertLess(time.monotonic() - start, 0.5)
+        with self.assertRaises(RuntimeError):
+            job_queue.submit("late", done.append, "late")
+
+        release.set()
+        job_queue.join()
+        self.assertEqual(done, ["running", "queued"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+"""
+Tests for the job store module.
+"""
+
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from auto_wealth_translate.core.job_store import JobStore, process_owner
+
+
+class TestJobStore(unittest.TestCase):
+    """Tests for the JobStore class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, "jobs.sqlite")
+        self.store = JobStore(self.db_path)
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.store.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_jobs_are_shared_and_updated(self):
+        """Test that jobs persist across store instances and updates are applied."""
+        job = self.store.create("job-1", input_file="plan.pdf", target_lang="fr", model="gpt-4",
+                                content_sha256="ab" * 32, file_size=1024)
+        self.assertEqual(job["status"], "queued")
+
+        # Another worker process opens the same database
+        other = JobStore(self.db_path)
+        self.assertTrue(other.update("job-1", status="completed", progress=1.0, validation_score=9.5))
+        other.close()
+
+        stored = self.store.get("job-1")
+        self.assertEqual(stored["status"], "completed")
+        self.assertEqual(stored["validation_score"], 9.5)
+        self.assertEqual(stored["content_sha256"], "ab" * 32)
+        
+        self.store.update("job-1", progress_detail={"stage": "rebuild", "completed": 2, "total": 3})
+        self.assertEqual(self.store.get("job-1")["progress_detail"]["completed"], 2)
+        self.assertGreaterEqual(stored["updated_at"], stored["created_at"])
+
+        self.assertFalse(self.store.update("missing", progress=0.5))
+        with self.assertRaises(ValueError):
+            self.store.update("job-1", model="gpt-3.5-turbo")
+
+        self.assertTrue(self.store.delete("job-1"))
+        self.assertIsNone(self.store.get("job-1"))
+
+    def test_create_or_attach_deduplicates(self):
+        """Test that identical submissions share a job until it fails."""
+        job, created = self.store.create_or_attach("job-1", "plan.pdf", "fr", "gpt-4", dedup_key="key")
+        self.assertTrue(created)
+
+        job, created = self.store.create_or_attach("job-2", "copy.pdf", "fr", "gpt-4", dedup_key="key")
+        self.assertFalse(created)
+        self.assertEqual(job["job_id"], "job-1")
+        self.assertIsNone(self.store.get("job-2"))
+
+        self.store.update("job-1", status="failed")
+        job, created = self.store.create_or_attach("job-3", "plan.pdf", "fr", "gpt-4", dedup_key="key")
+        self.assertTrue(created)
+        self.assertEqual(job["job_id"], "job-3")
+
+    def test_fail_abandoned_after_restart(self):
+        """Test that jobs queued by an exited process are failed and no longer deduplicated."""
+        exited = subprocess.Popen([sys.executable, "-c", "pass"])
+        exited.wait()
+        host = socket.gethostname()
+        dead_owner = f"{host}:{exited.pid}:0a1b2c3d"
+        live_owner = f"{host}:{os.getppid()}:0a1b2c3d"
+        # An earlier process that had this process's PID, e.g. before a container restart
+        predecessor = f"{host}:{os.getpid()}:0a1b2c3d"
+
+        self.store.create_or_attach("queued", "plan.pdf", "fr", "gpt-4", dedup_key="key", owner=dead_owner)
+        self.store.create("running", "plan.pdf", "de", "gpt-4", status="processing", owner=predecessor)
+        self.store.create("legacy", "plan.pdf", "es", "gpt-4")
+        self.store.create("live", "plan.pdf", "it", "gpt-4", owner=live_owner)
+        self.store.create("own", "plan.pdf", "pt", "gpt-4", owner=process_owner())
+        self.store.create("done", "plan.pdf", "ja", "gpt-4", status="completed", owner=dead_owner)
+
+        # The restarted process recovers jobs before queueing its own
+        abandoned = self.store.fail_abandoned()
+
+        self.assertEqual(sorted(abandoned), ["legacy", "queued", "running"])
+        job = self.store.get("queued")
+        self.assertEqual(job["status"], "failed")
+        self.assertIsNone(job["dedup_key"])
+        self.assertEqual(self.store.get("live")["status"], "queued")
+        self.assertEqual(self.store.get("own")["status"], "queued")
+        self.assertEqual(self.store.get("done")["status"], "completed")
+
+        # A live PID registered by a newer process no longer belongs to the job's owner
+        other = JobStore(self.db_path)
+        self.addCleanup(other.close)
+        other._conn.execute("INSERT OR REPLACE INTO processes VALUES (?, ?, ?, ?)",
+                            (host, os.getppid(), "4e5f6a7b", "2026-01-01T00:00:00.000000"))
+        other._conn.commit()
+        self.assertEqual(self.store.fail_abandoned(), ["live"])
+
+        job, created = self.store.create_or_attach("retry", "plan.pdf", "fr", "gpt-4", dedup_key="key")
+        self.assertTrue(created)
+
+    def test_keyset_pagination(self):
+        """Test that cursors walk every matching job newest first without repeats."""
+        for index in range(7):
+            self.store.create(f"job-{index}", input_file="plan.pdf", target_lang="fr", model="gpt-4")
+            if index % 2:
+                self.store.update(f"job-{index}", status="failed")
+
+        pages = []
+        jobs, cursor = self.store.list(limit=3)
+        pages.append(jobs)
+        while cursor:
+            jobs, cursor = self.store.list(limit=3, cursor=cursor)
+            pages.append(jobs)
+
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+        self.assertEqual([job["job_id"] for page in pages for job in page],
+                         [f"job-{index}" for index in reversed(range(7))])
+
+        failed, cursor = self.store.list(limit=10, status="failed")
+        self.assertEqual([job["job_id"] for job in failed], ["job-5", "job-3", "job-1"])
+        self.assertIsNone(cursor)
+
+        with self.assertRaises(ValueError):
+            self.store.list(cursor="not a cursor")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+"""
+Tests for the LLM client registry.
+"""
+
+import asyncio
+import unittest
+
+from auto_wealth_translate.core import llm_clients
+
+
+class TestLLMClients(unittest.TestCase):
+    """Tests for the pooled client registry."""
+
+    def tearDown(self):
+        """Clean up pooled clients."""
+        llm_clients.close_clients()
+
+    def test_client_is_reused(self):
+        """Test that clients are shared per provider, base URL and key."""
+        client = llm_clients.get_client("openai", "key-a")
+
+        self.assertIs(llm_clients.get_client("openai", "key-a"), client)
+        self.assertIsNot(llm_clients.get_client("openai", "key-b"), client)
+        self.assertIsNot(llm_clients.get_client("xai", "key-a"), client)
+        self.assertEqual(str(llm_clients.get_client("xai", "key-a").base_url), "https://api.x.ai/v1/")
+
+    def test_async_client_is_reused_per_loop(self):
+        """Test that async clients are shared within an event loop."""
+        async def get_pair():
+            return (llm_clients.get_async_client("openai", "key-a"),
+                    llm_clients.get_async_client("openai", "key-a"))
+
+        first, second = asyncio.run(get_pair())
+        self.assertIs(first, second)
+
+    def test_configure_client_pool(self):
+        """Test that pool settings are validated and reset existing clients."""
+        client = llm_clients.get_client("openai", "key-a")
+        original = dict(llm_clients.CLIENT_POOL_SETTINGS)
+        try:
+            llm_clients.configure_client_pool(max_connections=5)
+            self.assertIsNot(llm_clients.get_client("openai", "key-a"), client)
+            with self.assertRaises(ValueError):
+                llm_clients.configure_client_pool(pool_size=5)
+        finally:
+            llm_clients.CLIENT_POOL_SETTINGS.update(original)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,174 @@
+"""
+Tests for the markdown processor module.
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+import fitz
+
+from auto_wealth_translate.core.document_processor import TextComponent
+from auto_wealth_translate.core.markdown_processor import MarkdownProcessor
+
+
+class TestMarkdownProcessor(unittest.TestCase):
+    """Tests for the MarkdownProcessor class."""
+
+    def setUp(self):
+        """Create a small two-page PDF."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.pdf_path = os.path.join(self.temp_dir, "report.pdf")
+
+        doc = fitz.open()
+        for page_idx in range(2):
+            page = doc.new_page()
+            page.insert_text((72, 150), f"Portfolio summary {page_idx + 1}", fontsize=16)
+            page.insert_text((72, 300), f"Net worth increased by {page_idx + 2}%", fontsize=11)
+        doc.save(self.pdf_path)
+        doc.close()
+
+        self.processor = MarkdownProcessor()
+
+    def tearDown(self):
+        """Remove the temporary PDF."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_markdown_with_components_single_pass(self):
+        """Test that the markdown and the component inventory come from the same pass."""
+        md_content, components = self.processor.pdf_to_markdown_with_components(self.pdf_path)
+
+        self.assertEqual(md_content, self.processor.pdf_to_markdown(self.pdf_path))
+        self.assertIn("# Portfolio summary 1", md_content)
+
+        texts = [c for c in components if isinstance(c, TextComponent)]
+        self.assertEqual([c.page_number for c in texts], [1, 1, 2, 2])
+        self.assertEqual(texts[3].text, "Net worth increased by 3%")
+        self.assertEqual([c.component_id for c in components],
+                         [f"{c.component_type}_{i}" for i, c in enumerate(components)])
+
+    def test_pdf_to_markdown_selected_pages_of_open_document(self):
+        """Test converting selected pages of an already open document."""
+        with fitz.open(self.pdf_path) as doc:
+            md_content = self.processor.pdf_to_markdown(doc, pages=[1])
+
+        self.assertIn("Portfolio summary 2", md_content)
+        self.assertNotIn("Portfolio summary 1", md_content)
+
+    def test_translate_markdown_concurrent_keeps_order(self):
+        """Test that segments are translated concurrently and reassembled in order."""
+
+        class SlowTranslator:
+            source_lang = "en"
+            target_lang = "fr"
+            max_concurrency = 4
+            language_names = {"en": "English", "fr": "French"}
+
+            def __init__(self):
+                self.in_flight = 0
+                self.peak = 0
+                self.lock = threading.Lock()
+
+            def _translate_with_openai(self, text, target_lang=None, temperature=0.3, usage=None):
+                with self.lock:
+                    self.in_flight += 1
+                    self.peak = max(self.peak, self.in_flight)
+                # Earlier segments finish last
+                time.sleep(0.05 * (5 - int(text.split()[-1])))
+                with self.lock:
+                    self.in_flight -= 1
+                return text.replace("Paragraph", "Paragraphe")
+
+        translator = SlowTranslator()
+        md_content = "\n".join(f"## Section\nParagraph {i}" for i in range(1, 5))
+
+        result = self.processor.translate_markdown(md_content, translator)
+
+        self.assertEqual(result, "\n".join(f"## Section\nParagraphe {i}" for i in range(1, 5)))
+        self.assertGreater(translator.peak, 1)
+
+    def test_post_edit_flagged_segments_within_budget(self):
+        """Test that only flagged segments are post-edited and their own tokens are accounted for."""
+
+        class EchoTranslator:
+            source_lang = "en"
+            target_lang = "fr"
+            max_concurrency = 2
+            language_names = {"en": "English", "fr": "French"}
+
+            def __init__(self):
+                self.token_usage = {"total_tokens": 0}
+                self.edits = 0
+
+            def _count_tokens(self, text):
+                return len(text.split())
+
+            def _translate_with_openai(self, text, target_lang=None, temperature=0.3, usage=None):
+                self.token_usage["total_tokens"] += 10
+                usage["total_tokens"] = usage.get("total_tokens", 0) + 10
+                usage["requests"] = usage.get("requests", 0) + 1
+                if "professional editor" in text:
+                    self.edits += 1
+                    # Another document translating on the same service meanwhile
+                    self.token_usage["total_tokens"] += 1000
+                    return "Paragraphe revu"
+                # Leave the second paragraph untranslated (low confidence)
+                return text if "2" in text else text.replace("Paragraph", "Paragraphe")
+
+        md_content = "Paragraph 1\n---\nParagraph 2\n---\nParagraph 3"
+
+        translator = EchoTranslator()
+        processor = MarkdownProcessor(post_edit=MarkdownProcessor.POST_EDIT_FLAGGED)
+        result = processor.translate_markdown(md_content, translator)
+
+        self.assertEqual(result, "Paragraphe 1\n---\nParagraphe revu\n---\nParagraphe 3")
+        self.assertEqual(translator.edits, 1)
+        self.assertEqual(processor.usage["flagged_segments"], 1)
+        self.assertEqual(processor.usage["translation_tokens"], 30)
+        self.assertEqual(processor.usage["post_edit_tokens"], 10)
+        self.assertEqual(processor.usage["post_edit_requests"], 1)
+
+        # A budget too small for any request skips the pass entirely
+        translator = EchoTranslator()
+        processor = MarkdownProcessor(post_edit=MarkdownProcessor.POST_EDIT_ALL, post_edit_token_budget=100)
+        result = processor.translate_markdown(md_content, translator)
+
+        self.assertEqual(translator.edits, 0)
+        self.assertEqual(processor.usage["post_edit_skipped"], 1)
+        self.assertEqual(processor.usage["post_edit_tokens"], 0)
+        self.assertEqual(processor.usage["post_edit_requests"], 0)
+
+        # Post-editing is off by default
+        translator = EchoTranslator()
+        self.processor.translate_markdown(md_content, translator)
+        self.assertEqual(translator.edits, 0)
+
+    def test_spans_merged_into_paragraphs(self):
+        """Test that wrapped lines become one paragraph and paragraphs share a segment."""
+        doc = fitz.open()
+        page = doc.new_page()
+        page.insert_text((72, 72), "Annual Review", fontsize=18)
+        body = ["Your portfolio returned five percent this", "year, ahead of its bench-",
+                "mark. Fees were unchanged."]
+        for line_idx, line in enumerate(body):
+            page.insert_text((72, 120 + line_idx * 14), line, fontsize=11)
+        page.insert_text((72, 200), "Next year we expect lower volatility.", fontsize=11)
+
+        md_content = self.processor.pdf_to_markdown(doc)
+        doc.close()
+
+        self.assertIn("# Annual Review\n\n", md_content)
+        self.assertIn("Your portfolio returned five percent this year, ahead of its benchmark. "
+                      "Fees were unchanged.\n\nNext year we expect lower volatility.", md_content)
+
+        text_segments = [s for s in self.processor._split_markdown(md_content) if s["type"] == "text"]
+        self.assertEqual(len(text_segments), 1)
+        self.assertEqual(self.processor._reconstruct_markdown(self.processor._split_markdown(md_content)),
+                         md_content)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+"""
+Tests for the rate limiter module.
+"""
+
+import unittest
+from unittest.mock import MagicMock, patch
+
+import httpx
+import openai
+
+from auto_wealth_translate.core.rate_limiter import (
+    RateLimiter, TokenBucket, parse_duration, parse_retry_after
+)
+
+
+def _rate_limit_error(headers):
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    response = httpx.Response(429, headers=headers, request=request)
+    return openai.RateLimitError("Rate limit reached", response=response, body=None)
+
+
+class TestRateLimiter(unittest.TestCase):
+    """Tests for the RateLimiter class."""
+
+    def test_parse_headers(self):
+        """Test parsing of reset durations and Retry-After headers."""
+        self.assertEqual(parse_duration("6m0s"), 360.0)
+        self.assertAlmostEqual(parse_duration("1.5s"), 1.5)
+        self.assertAlmostEqual(parse_duration("20ms"), 0.02)
+        self.assertIsNone(parse_duration("soon"))
+        self.assertEqual(parse_retry_after({"retry-after": "3"}), 3.0)
+        self.assertEqual(parse_retry_after({"retry-after-ms": "250", "retry-after": "3"}), 0.25)
+        self.assertIsNone(parse_retry_after({}))
+        self.assertIsNone(parse_retry_after({"retry-after": "not a date"}))
+
+    def test_token_bucket_reserves_debt(self):
+        """Test that over-reservation returns the time needed to refill."""
+        bucket = TokenBucket(per_minute=60)
+
+        self.assertEqual(bucket.reserve(60, now=bucket.updated), 0.0)
+        self.assertAlmostEqual(bucket.reserve(30, now=bucket.updated), 30.0)
+
+    def test_headers_adapt_limits(self):
+        """Test that x-ratelimit headers update capacity and remaining budget."""
+        limiter = RateLimiter(requests_per_minute=100, tokens_per_minute=1000)
+        limiter.update_from_headers({
+            "x-ratelimit-limit-tokens": "600",
+            "x-ratelimit-remaining-tokens": "0",
+            "x-ratelimit-reset-tokens": "2s",
+        })
+
+        self.assertEqual(limiter.tokens.capacity, 600)
+        self.assertGreater(limiter._reserve(10), 1.0)
+
+    @patch('auto_wealth_translate.core.rate_limiter.time.sleep')
+    def test_call_retries_with_retry_after(self, mock_sleep):
+        """Test that 429 responses are retried after the server-requested delay."""
+        limiter = RateLimiter(requests_per_minute=1000, tokens_per_minute=100000, base_delay=0.1)
+        request = MagicMock(side_effect=[_rate_limit_error({"retry-after": "2"}), "ok"])
+
+        self.assertEqual(limiter.call(request, tokens=10), "ok")
+        self.assertEqual(request.call_count, 2)
+        self.assertGreaterEqual(mock_sleep.call_args[0][0], 1.9)
+
+    @patch('auto_wealth_translate.core.rate_limiter.time.sleep')
+    def test_retry_refunds_failed_reservation(self, mock_sleep):
+        """Test that retries do not keep the tokens reserved by failed attempts."""
+        limiter = RateLimiter(requests_per_minute=1000, tokens_per_minute=1000, base_delay=0.01)
+        request = MagicMock(side_effect=[_rate_limit_error({}), _rate_limit_error({}), "ok"])
+
+        self.assertEqual(limiter.call(request, tokens=400), "ok")
+        self.assertGreater(limiter.tokens.level, 500)
+
+    def test_call_raises_non_retryable(self):
+        """Test that non-transient errors are raised immediately."""
+        limiter = RateLimiter(requests_per_minute=1000, tokens_per_minute=100000)
+        request = MagicMock(side_effect=ValueError("bad request"))
+
+        with self.assertRaises(ValueError):
+            limiter.call(request, tokens=10)
+        self.assertEqual(request.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+"""
+Tests for the spatial index utilities.
+"""
+
+import random
+import unittest
+
+from auto_wealth_translate.utils.spatial_index import GridIndex
+
+
+def _overlaps(a, b):
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+class TestGridIndex(unittest.TestCase):
+    """Tests for the GridIndex class."""
+
+    def test_query_returns_candidates_in_order(self):
+        """Test that queries return nearby boxes in insertion order."""
+        index = GridIndex([(0, 0, 10, 10), (500, 500, 520, 510), (5, 5, 200, 20)], cell_size=50)
+
+        self.assertEqual(index.query((1, 1, 4, 4)), [0, 2])
+        self.assertEqual(index.query((505, 505, 506, 506)), [1])
+        self.assertEqual(index.query((300, 300, 310, 310)), [])
+
+    def test_query_finds_every_overlap(self):
+        """Test that no overlapping box is missed compared to a linear scan."""
+        rng = random.Random(7)
+        boxes = []
+        for _ in range(300):
+            x0, y0 = rng.uniform(0, 600), rng.uniform(0, 800)
+            boxes.append((x0, y0, x0 + rng.uniform(0, 150), y0 + rng.uniform(0, 40)))
+        index = GridIndex(boxes, cell_size=40)
+
+        for _ in range(200):
+            x0, y0 = rng.uniform(0, 600), rng.uniform(0, 800)
+            query = (x0, y0, x0 + rng.uniform(0, 60), y0 + rng.uniform(0, 12))
+            expected = [i for i, box in enumerate(boxes) if _overlaps(box, query)]
+            candidates = index.query(query)
+            self.assertEqual([i for i in candidates if _overlaps(boxes[i], query)], expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+"""
+Tests for the translation memory module.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from auto_wealth_translate.core.translation_memory import TranslationMemory
+
+
+class TestTranslationMemory(unittest.TestCase):
+    """Tests for the TranslationMemory class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, "memory.sqlite")
+        self.memory = TranslationMemory(self.db_path, max_entries=10)
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.memory.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_hit_and_miss(self):
+        """Test that stored translations are returned and counted."""
+        self.assertIsNone(self.memory.get("Past performance", "en", "fr", "gpt-4"))
+
+        self.memory.put("Past performance", "Performances passées", "en", "fr", "gpt-4")
+
+        self.assertEqual(self.memory.get("Past  performance\n", "en", "fr", "gpt-4"), "Performances passées")
+        self.assertEqual(self.memory.stats()["hits"], 1)
+        self.assertEqual(self.memory.stats()["misses"], 1)
+
+    def test_key_includes_context(self):
+        """Test that language pair, model and glossary version are part of the key."""
+        self.memory.put("Portfolio", "Portefeuille", "en", "fr", "gpt-4", glossary_version="v1")
+
+        self.assertIsNone(self.memory.get("Portfolio", "en", "es", "gpt-4", glossary_version="v1"))
+        self.assertIsNone(self.memory.get("Portfolio", "en", "fr", "gpt-3.5-turbo", glossary_version="v1"))
+        self.assertIsNone(self.memory.get("Portfolio", "en", "fr", "gpt-4", glossary_version="v2"))
+
+    def test_glossary_version_is_order_independent(self):
+        """Test that the glossary version does not depend on term order."""
+        self.assertEqual(
+            TranslationMemory.glossary_version(["Equity", "Bonds"]),
+            TranslationMemory.glossary_version(["Bonds", "Equity"])
+        )
+        self.assertEqual(TranslationMemory.glossary_version([]), "")
+
+    def test_eviction(self):
+        """Test that the memory stays bounded."""
+        for i in range(25):
+            self.memory.put(f"text {i}", f"texte {i}", "en", "fr", "gpt-4")
+
+        stats = self.memory.stats()
+        self.assertLessEqual(stats["size"], 10)
+        self.assertGreater(stats["evictions"], 0)
+        # The most recent entry survives eviction
+        self.assertEqual(self.memory.get("text 24", "en", "fr", "gpt-4"), "texte 24")
+
+    def test_persistence(self):
+        """Test that entries survive reopening the database."""
+        self.memory.put("Net Worth", "Valeur nette", "en", "fr", "gpt-4")
+        self.memory.close()
+
+        self.memory = TranslationMemory(self.db_path, max_entries=10)
+        self.assertEqual(self.memory.get("Net Worth", "en", "fr", "gpt-4"), "Valeur nette")
+
+
+if __name__ == '__main__':
+    unittest.main()
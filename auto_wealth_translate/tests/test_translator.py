@@ -5,8 +5,15 @@ Tests for the translator module.
 import unittest
 from unittest.mock import MagicMock, patch
 import os
+import json
+import asyncio
+import shutil
+import tempfile
 
 from auto_wealth_translate.core.translator import TranslationService
+from auto_wealth_translate.core.llm_clients import close_clients
+from auto_wealth_translate.core.translation_memory import TranslationMemory
+from auto_wealth_translate.core.document_processor import TextComponent, TableComponent
 
 
 class TestTranslationService(unittest.TestCase):
@@ -137,5 +144,273 @@ Legend items: Actions, Obligations, Liquidités
         self.assertEqual(translated_charts[0]['legend_items'][2], "Liquidités")
 
 
+
+class TestBatchTranslation(unittest.TestCase):
+    """Tests for batched segment translation."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        os.environ["OPENAI_API_KEY"] = "test-key"
+        # Avoid downloading tokenizer data; fall back to the word-count estimate
+        with patch('auto_wealth_translate.core.translator.tiktoken') as mock_tiktoken:
+            mock_tiktoken.encoding_for_model.return_value = None
+            self.service = TranslationService(target_lang="fr")
+    
+    def tearDown(self):
+        """Drop pooled clients so mocks don't leak between tests."""
+        close_clients()
+    
+    def _mock_response(self, content):
+        response = MagicMock()
+        response.choices[0].message.content = content
+        raw_response = MagicMock(headers={})
+        raw_response.parse.return_value = response
+        return raw_response
+    
+    def test_pack_batches_respects_limits(self):
+        """Test that batches respect the item limit and oversized texts go alone."""
+        self.service.max_batch_items = 2
+        self.service.batch_token_budget = 20
+        
+        long_text = " ".join(["word"] * 50)
+        batches = self.service._pack_batches(["a", "b", "c", long_text])
+        
+        self.assertEqual(batches, [["a", "b"], [long_text], ["c"]])
+    
+    def test_parse_batch_response(self):
+        """Test parsing of batched responses."""
+        parse = TranslationService._parse_batch_response
+        
+        self.assertEqual(parse('["un", "deux"]', 2), ["un", "deux"])
+        self.assertEqual(parse('```json\n["un", "deux"]\n```', 2), ["un", "deux"])
+        self.assertIsNone(parse('["un"]', 2))
+        self.assertIsNone(parse('1. un\n2. deux', 2))
+    
+    def test_placeholders_round_trip(self):
+        """Test that protected values get unique placeholders and are restored in one pass."""
+        text = ("Fund 12 rose 123.5% on 01/02/2024, see https://example.com/q1?id=12 "
+                "or mail ir@example.com; 12 units held.")
+        
+        prepared, placeholders = self.service._prepare_text_for_translation(text)
+        
+        self.assertEqual(prepared, "Fund __number_0__ rose __number_1__% on __date_2__, see __url_3__ "
+                                   "or mail __email_4__; __number_0__ units held.")
+        self.assertEqual(placeholders["__url_3__"], "https://example.com/q1?id=12")
+        self.assertEqual(self.service._restore_placeholders(prepared, placeholders), text)
+        
+        # Number-dense table text round-trips with one placeholder per distinct value
+        table = " | ".join(f"{i}.{i % 7} {i * 13}" for i in range(1, 400))
+        prepared, placeholders = self.service._prepare_text_for_translation(table)
+        self.assertEqual(len(placeholders), len(set(table.replace(" | ", " ").split())))
+        self.assertEqual(self.service._restore_placeholders(prepared, placeholders), table)
+    
+    def test_split_long_text_on_token_offsets(self):
+        """Test that long text is encoded once and cut at sentence-aligned token offsets."""
+        
+        class CharEncoding:
+            """One token per character."""
+            encode_calls = 0
+            
+            def encode(self, text):
+                self.encode_calls += 1
+                return [ord(char) for char in text]
+            
+            def decode_with_offsets(self, tokens):
+                return "".join(chr(token) for token in tokens), list(range(len(tokens)))
+        
+        encoding = CharEncoding()
+        self.service.tokenizer = encoding
+        self.service.max_tokens = 40
+        text = "Short one. Another short one. This single sentence is far too long for one chunk."
+        
+        chunks = self.service._split_long_text(text, encoding.encode(text))
+        
+        self.assertEqual(encoding.encode_calls, 1)
+        self.assertEqual(chunks[:2], ["Short one.", "Another short one."])
+        self.assertTrue(all(len(chunk) <= 20 for chunk in chunks))
+        self.assertEqual("".join(chunks[2:]).replace(" ", ""), text[30:].replace(" ", ""))
+        
+        # Without a tokenizer sentences are grouped by estimate
+        self.service.tokenizer = None
+        self.assertEqual(self.service._split_long_text("你好。世界！"), ["你好。世界！"])
+    
+    @patch('auto_wealth_translate.core.llm_clients.openai')
+    def test_translate_batches_cells(self, mock_openai):
+        """Test that table cells and text share one request."""
+        def create(**kwargs):
+            items = json.loads(kwargs["messages"][1]["content"])
+            return self._mock_response(json.dumps([f"fr:{item}" for item in items]))
+        mock_openai.OpenAI.return_value.chat.completions.with_raw_response.create.side_effect = create
+        
+        components = [
+            TextComponent(component_id="text_0", component_type="text", page_number=1, text="Net Worth"),
+            TableComponent(component_id="table_1", component_type="table", page_number=1,
+                           rows=[["Equity", "60%"], ["Net Worth", ""]]),
+        ]
+        translated = self.service.translate(components)
+        
+        self.assertEqual(mock_openai.OpenAI.return_value.chat.completions.with_raw_response.create.call_count, 1)
+        self.assertEqual(translated[0].text, "fr:Net Worth")
+        self.assertEqual(self.service.token_usage["requests"], 1)
+        self.assertEqual(translated[1].rows, [["fr:Equity", "fr:60%"], ["fr:Net Worth", ""]])
+    
+    @patch('auto_wealth_translate.core.llm_clients.openai')
+    def test_single_segment_looks_up_memory_once(self, mock_openai):
+        """Test that a segment sent on its own is looked up in the translation memory once."""
+        mock_openai.OpenAI.return_value.chat.completions.with_raw_response.create.return_value = \
+            self._mock_response("Valeur nette")
+        
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir, ignore_errors=True)
+        memory = TranslationMemory(os.path.join(temp_dir, "memory.sqlite"))
+        self.addCleanup(memory.close)
+        self.service.translation_memory = memory
+        
+        components = [TextComponent(component_id="text_0", component_type="text", page_number=1, text="Net Worth")]
+        translated = self.service.translate(components)
+        
+        self.assertEqual(translated[0].text, "Valeur nette")
+        self.assertEqual((memory.hits, memory.misses), (0, 1))
+        
+        self.service.translate([TextComponent(component_id="text_0", component_type="text", page_number=1,
+                                              text="Net Worth")])
+        self.assertEqual((memory.hits, memory.misses), (1, 1))
+    
+    @patch('auto_wealth_translate.core.llm_clients.openai')
+    def test_partial_long_text_is_not_remembered(self, mock_openai):
+        """Test that a long text is not stored in the memory when one of its chunks failed."""
+        mock_openai.OpenAI.return_value.chat.completions.with_raw_response.create.side_effect = [
+            self._mock_response("Premier paragraphe."), RuntimeError("service unavailable")
+        ]
+        
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir, ignore_errors=True)
+        memory = TranslationMemory(os.path.join(temp_dir, "memory.sqlite"))
+        self.addCleanup(memory.close)
+        self.service.translation_memory = memory
+        self.service.max_tokens = 40
+        
+        first = "The portfolio returned five percent this year after fees and taxes."
+        second = "Fixed income allocations were increased to reduce overall volatility."
+        text = f"{first} {second}"
+        translated = self.service._translate_with_openai(text)
+        
+        self.assertEqual(translated, f"Premier paragraphe. {second}")
+        version = TranslationMemory.glossary_version(None)
+        self.assertIsNone(memory.get(text, "en", "fr", "gpt-4", version))
+        self.assertEqual(memory.get(first, "en", "fr", "gpt-4", version), "Premier paragraphe.")
+        self.assertFalse(self.service.translation_succeeded())
+    
+    @patch('auto_wealth_translate.core.llm_clients.openai')
+    def test_call_usage_is_reported_separately(self, mock_openai):
+        """Test that a call's token usage is returned to the caller as well as added to the totals."""
+        response = self._mock_response("Valeur nette")
+        response.parse.return_value.usage = MagicMock(prompt_tokens=10, completion_tokens=5, total_tokens=15)
+        mock_openai.OpenAI.return_value.chat.completions.with_raw_response.create.return_value = response
+        self.service.token_usage["total_tokens"] = 100
+        
+        usage = {}
+        self.service._translate_with_openai("Net Worth", usage=usage)
+        
+        self.assertEqual(usage, {"requests": 1, "prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15})
+        self.assertEqual(self.service.token_usage["total_tokens"], 115)
+    
+    @patch('auto_wealth_translate.core.llm_clients.openai')
+    def test_request_text_is_encoded_once(self, mock_openai):
+        """Test that a request reuses the text's encoding and the system prompt's token count."""
+        mock_openai.OpenAI.return_value.chat.completions.with_raw_response.create.return_value = \
+            self._mock_response("Valeur nette")
+        self.service.tokenizer = MagicMock(wraps=self.service.tokenizer)
+        
+        self.service._translate_with_openai("Net Worth")
+        self.assertEqual(self.service.tokenizer.encode.call_count, 2)
+        
+        self.service._translate_with_openai("Total Assets")
+        self.assertEqual(self.service.tokenizer.encode.call_count, 3)
+    
+    @patch('auto_wealth_translate.core.llm_clients.openai')
+    def test_translate_reports_progress(self, mock_openai):
+        """Test that the progress callback receives segments translated out of the total."""
+        def create(**kwargs):
+            items = json.loads(kwargs["messages"][1]["content"])
+            response = self._mock_response(json.dumps([f"fr:{item}" for item in items]))
+            response.parse.return_value.usage = MagicMock(prompt_tokens=10, completion_tokens=5, total_tokens=15)
+            return response
+        mock_openai.OpenAI.return_value.chat.completions.with_raw_response.create.side_effect = create
+        
+        events = []
+        self.service.progress_callback = events.append
+        self.service.max_batch_items = 2
+        components = [
+            TextComponent(component_id=f"text_{i}", component_type="text", page_number=1, text=f"Line {chr(65 + i)}")
+            for i in range(6)
+        ]
+        self.service.translate(components)
+        
+        self.assertEqual([event["completed"] for event in events], [0, 2, 4, 6])
+        self.assertTrue(all(event["stage"] == "translate" and event["total"] == 6 for event in events))
+        self.assertEqual(events[-1]["tokens"], 45)
+    
+    @patch('auto_wealth_translate.core.llm_clients.openai')
+    def test_failed_requests_are_counted(self, mock_openai):
+        """Test that segments returned untranslated after an API error mark the translation as failed."""
+        mock_openai.OpenAI.return_value.chat.completions.with_raw_response.create.side_effect = \
+            RuntimeError("service unavailable")
+        
+        components = [
+            TextComponent(component_id=f"text_{i}", component_type="text", page_number=1, text=f"Line {chr(65 + i)}")
+            for i in range(3)
+        ]
+        translated = self.service.translate(components)
+        
+        self.assertEqual([c.text for c in translated], ["Line A", "Line B", "Line C"])
+        self.assertEqual(self.service.untranslated_segments, 3)
+        self.assertFalse(self.service.translation_succeeded())
+    
+    @patch('auto_wealth_translate.core.llm_clients.openai')
+    def test_malformed_batch_is_split(self, mock_openai):
+        """Test that a malformed batch response falls back to smaller requests."""
+        def create(**kwargs):
+            content = kwargs["messages"][1]["content"]
+            try:
+                items = json.loads(content)
+            except ValueError:
+                return self._mock_response(f"fr:{content}")
+            if len(items) > 2:
+                return self._mock_response("Here are your translations!")
+            return self._mock_response(json.dumps([f"fr:{item}" for item in items]))
+        mock_openai.OpenAI.return_value.chat.completions.with_raw_response.create.side_effect = create
+        
+        results = self.service._translate_batch(["one", "two", "three"])
+        
+        self.assertEqual(results, ["fr:one", "fr:two", "fr:three"])
+    
+    @patch('auto_wealth_translate.core.llm_clients.openai')
+    def test_atranslate_bounds_concurrency(self, mock_openai):
+        """Test that the async API translates all batches with bounded concurrency."""
+        in_flight = 0
+        peak = 0
+        
+        async def create(**kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return self._mock_response(f"fr:{kwargs['messages'][1]['content']}")
+        mock_openai.AsyncOpenAI.return_value.chat.completions.with_raw_response.create.side_effect = create
+        
+        self.service.max_batch_items = 1
+        self.service.max_concurrency = 2
+        components = [
+            TextComponent(component_id=f"text_{i}", component_type="text", page_number=1, text=f"Line {chr(65 + i)}")
+            for i in range(6)
+        ]
+        translated = asyncio.run(self.service.atranslate(components))
+        
+        self.assertEqual([c.text for c in translated], [f"fr:Line {chr(65 + i)}" for i in range(6)])
+        self.assertLessEqual(peak, 2)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,62 @@
+"""
+Progress reporting utilities for AutoWealthTranslate.
+
+Long-running stages (page extraction, translation and rebuilding) accept an
+optional callback that receives progress events as dictionaries, e.g.
+``{"stage": "translate", "completed": 40, "total": 120, "tokens": 5321}``.
+"""
+
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, TypeVar
+
+from auto_wealth_translate.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+ProgressCallback = Callable[[Dict[str, Any]], None]
+
+T = TypeVar("T")
+
+def report_progress(callback: Optional[ProgressCallback], stage: str, completed: int, total: int,
+                    **details: Any) -> None:
+    """
+    Send a progress event to a callback.
+
+    Errors raised by the callback are logged and never interrupt the stage
+    that reported the progress.
+
+    Args:
+        callback: Progress callback (nothing is reported if None)
+        stage: Stage name ('extract', 'translate' or 'rebuild')
+        completed: Units of work done so far
+        total: Total units of work in the stage
+        **details: Extra event fields
+    """
+    if callback is None:
+        return
+    try:
+        callback({"stage": stage, "completed": completed, "total": total, **details})
+    except Exception as e:
+        logger.warning(f"Progress callback failed: {str(e)}")
+
+def track_progress(items: Iterable[T], callback: Optional[ProgressCallback], stage: str,
+                   total: int) -> Iterator[T]:
+    """
+    Iterate over items, reporting progress after each one has been processed.
+
+    Progress for an item is reported when the loop asks for the next item, so
+    items skipped with ``continue`` still count as processed.
+
+    Args:
+        items: Items to iterate over (e.g. page numbers)
+        callback: Progress callback (items are passed through if None)
+        stage: Stage name
+        total: Total number of items
+
+    Yields:
+        The items
+    """
+    completed = 0
+    for item in items:
+        yield item
+        completed += 1
+        report_progress(callback, stage, completed, total)
@@ -0,0 +1,71 @@
+"""
+Spatial indexing utilities for AutoWealthTranslate.
+
+Provides a uniform grid index over bounding boxes so that overlap queries
+only look at nearby boxes instead of every box on a page.
+"""
+
+import math
+from collections import defaultdict
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+BBox = Tuple[float, float, float, float]
+
+class GridIndex:
+    """
+    Uniform grid ("bucket") index over axis-aligned bounding boxes.
+
+    Each box is registered in every grid cell it touches. Queries return the
+    indices of boxes sharing a cell with the query box, in insertion order,
+    so callers that want the first match in list order get the same result
+    as a linear scan.
+    """
+
+    def __init__(self, boxes: Iterable[BBox], cell_size: float = 50.0):
+        """
+        Build the index.
+
+        Args:
+            boxes: Bounding boxes as (x0, y0, x1, y1); a box's position in the
+                iterable is its index
+            cell_size: Width and height of a grid cell in page units
+        """
+        self.cell_size = cell_size
+        self._cells: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        self._size = 0
+        for index, box in enumerate(boxes):
+            for cell in self._cells_for(box):
+                self._cells[cell].append(index)
+            self._size += 1
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _cells_for(self, box: Sequence[float]):
+        x0, y0, x1, y1 = box
+        # Normalize inverted boxes so they are still found
+        if x1 < x0:
+            x0, x1 = x1, x0
+        if y1 < y0:
+            y0, y1 = y1, y0
+        size = self.cell_size
+        for cx in range(math.floor(x0 / size), math.floor(x1 / size) + 1):
+            for cy in range(math.floor(y0 / size), math.floor(y1 / size) + 1):
+                yield cx, cy
+
+    def query(self, box: BBox) -> List[int]:
+        """
+        Find boxes that may overlap a query box.
+
+        Args:
+            box: Query box as (x0, y0, x1, y1)
+
+        Returns:
+            Sorted indices of candidate boxes (a superset of the overlapping ones)
+        """
+        candidates = set()
+        for cell in self._cells_for(box):
+            bucket = self._cells.get(cell)
+            if bucket:
+                candidates.update(bucket)
+        return sorted(candidates)
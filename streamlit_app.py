@@ -18,6 +18,7 @@ import re
 
 from auto_wealth_translate.core.document_processor import DocumentProcessor
 from auto_wealth_translate.core.translator import TranslationService
+from auto_wealth_translate.core.translation_memory import TranslationMemory
 from auto_wealth_translate.core.document_rebuilder import DocumentRebuilder
 from auto_wealth_translate.core.validator import OutputValidator
 from auto_wealth_translate.core.markdown_processor import MarkdownProcessor
@@ -68,6 +69,7 @@ TRANSLATION_MODELS = {
 PDF_PROCESSING_MODES = {
     "enhanced": "Enhanced Layout (Improved basic mode)",
     "precise": "Precise Layout (Canva-like, preserves original formatting)",
+    "vector": "Vector Layout (Selectable text, small files, fast)",
     "bilingual": "Bilingual Mode (Adds translation pages after originals)",
     "markdown": "Markdown Mode (Document structure preservation, best for complex formats)",
     "bilingual_markdown": "Bilingual Markdown Mode (Best quality translations with bilingual layout)"
@@ -92,6 +94,15 @@ PDF_MODE_DESCRIPTIONS = {
     - Best for complex documents where layout preservation is critical
     """,
     
+    "vector": """
+    **Vector Layout Mode**: Writes translations as real PDF text.
+    - Text stays selectable and searchable
+    - Embeds only the font glyphs that are used, keeping files small
+    - Much faster than rendering pages as images
+    - Built-in CJK font support for Chinese characters
+    - Best for large documents where speed and file size matter
+    """,
+    
     "bilingual": """
     **Bilingual Mode**: Keeps original pages and adds translations.
     - Original document pages remain untouched
@@ -125,12 +136,24 @@ PDF_MODE_DESCRIPTIONS = {
     """
 }
 
+# Post-editing policies for markdown mode
+POST_EDIT_OPTIONS = {
+    "off": "Off (fastest, lowest cost)",
+    "flagged": "Failed or low-confidence segments only",
+    "all": "Whole document (about 2x tokens)"
+}
+
 def create_temp_dir():
     """Create a temporary directory for file processing."""
     temp_dir = Path(tempfile.gettempdir()) / "autowealthtranslate_streamlit"
     temp_dir.mkdir(parents=True, exist_ok=True)
     return temp_dir
 
+@st.cache_resource
+def get_translation_memory(db_path):
+    """Open a translation memory once and share it across sessions and reruns."""
+    return TranslationMemory(db_path)
+
 def get_file_download_link(file_path, link_text):
     """Generate a download link for a file."""
     with open(file_path, "rb") as f:
@@ -141,7 +164,8 @@ def get_file_download_link(file_path, link_text):
     href = f'<a href="data:{mime_type};base64,{b64}" download="{filename}">{link_text}</a>'
     return href
 
-def translate_document(input_file, source_lang, target_lang, model="gpt-4", api_key=None, pdf_mode="enhanced", xai_api_key=None):
+def translate_document(input_file, source_lang, target_lang, model="gpt-4", api_key=None, pdf_mode="enhanced", xai_api_key=None,
+                       post_edit="off", translation_memory_path=None):
     """
     Process and translate a document.
     
@@ -153,6 +177,8 @@ def translate_document(input_file, source_lang, target_lang, model="gpt-4", api_
         api_key: OpenAI API key
         pdf_mode: PDF processing mode ('enhanced', 'precise', 'bilingual', 'markdown', or 'bilingual_markdown')
         xai_api_key: xAI API key for Grok models
+        post_edit: Post-editing policy for markdown mode ('off', 'flagged', or 'all')
+        translation_memory_path: Optional path to a translation memory database
     
     Returns:
         Path to translated file, validation results, markdown content (if markdown mode)
@@ -165,6 +191,7 @@ def translate_document(input_file, source_lang, target_lang, model="gpt-4", api_
         os.environ["XAI_API_KEY"] = xai_api_key
     
     temp_dir = create_temp_dir()
+    translation_memory = get_translation_memory(translation_memory_path) if translation_memory_path else None
     
     # Generate unique filename
     input_path = Path(input_file)
@@ -180,12 +207,13 @@ def translate_document(input_file, source_lang, target_lang, model="gpt-4", api_
         logger.info(f"Using translation model: {model}")
         logger.info(f"Output path will be: {output_path}")
         
-        md_processor = MarkdownProcessor()
+        md_processor = MarkdownProcessor(post_edit=post_edit)
         
         # Convert document to markdown
         if input_path.suffix.lower() == '.pdf':
             logger.info(f"Converting PDF to Markdown: {input_path}")
-            md_content = md_processor.pdf_to_markdown(str(input_path))
+            # One pass yields both the markdown and the component inventory used for validation
+            md_content, doc_components = md_processor.pdf_to_markdown_with_components(str(input_path))
             
             # Log some extracted content for verification
             logger.info(f"Extracted markdown content sample (first 200 chars): {md_content[:200]}")
@@ -199,7 +227,8 @@ def translate_document(input_file, source_lang, target_lang, model="gpt-4", api_
         translation_service = TranslationService(
             source_lang=source_lang,
             target_lang=target_lang, 
-            model=model
+            model=model,
+            translation_memory=translation_memory
         )
         
         # Translate markdown content
@@ -225,10 +254,6 @@ def translate_document(input_file, source_lang, target_lang, model="gpt-4", api_
         elif output_path.suffix.lower() == '.docx':
             md_processor.markdown_to_docx(translated_md, str(output_path))
         
-        # Initialize document processor for validation purposes
-        doc_processor = DocumentProcessor(str(input_path))
-        doc_components = doc_processor.process()
-        
         # Create metadata for validation
         markdown_result = {
             "markdown_processed": True,
@@ -237,7 +262,8 @@ def translate_document(input_file, source_lang, target_lang, model="gpt-4", api_
             "structure_preservation": 0.9,  # Estimated structure preservation
             "target_language": target_lang,
             "cjk_support": True,
-            "tables_preserved": True
+            "tables_preserved": True,
+            "token_usage": md_processor.usage
         }
         
         # Validate output
@@ -252,7 +278,8 @@ def translate_document(input_file, source_lang, target_lang, model="gpt-4", api_
         translation_service = TranslationService(
             source_lang=source_lang,
             target_lang=target_lang, 
-            model=model
+            model=model,
+            translation_memory=translation_memory
         )
         doc_rebuilder = DocumentRebuilder()
         validator = OutputValidator()
@@ -260,28 +287,27 @@ def translate_document(input_file, source_lang, target_lang, model="gpt-4", api_
         # Process document
         doc_components = doc_processor.process()
         
-        # Translate components
-        translated_components = translation_service.translate(doc_components)
-        
         # Rebuild document
-        if pdf_mode == "bilingual_markdown":
-            # For bilingual markdown mode, we use a special rebuilder that takes the language info directly
+        if pdf_mode == "bilingual_markdown" and input_path.suffix.lower() == '.pdf':
+            # Bilingual markdown mode translates each page itself, so the components are
+            # handed over untranslated together with the service instead of translating twice
             rebuilt_doc = doc_rebuilder.rebuild(
-                translated_components, 
+                doc_components, 
                 output_format=input_path.suffix[1:],
                 rebuild_mode=pdf_mode,
                 source_pdf_path=str(input_path),
-                source_lang=source_lang,
-                target_lang=target_lang,
-                translation_model=model
+                translation_service=translation_service
             )
         else:
+            # Translate components
+            translated_components = translation_service.translate(doc_components)
+            
             # For other modes, use standard rebuilder
             rebuilt_doc = doc_rebuilder.rebuild(
                 translated_components, 
                 output_format=input_path.suffix[1:],
                 rebuild_mode=pdf_mode,
-                source_pdf_path=str(input_path) if pdf_mode in ['precise', 'bilingual'] else None
+                source_pdf_path=str(input_path) if pdf_mode in ['precise', 'vector', 'bilingual'] else None
             )
         
         # Validate output
@@ -362,6 +388,7 @@ def main():
         help="""
         Enhanced: Better version of the standard layout engine.
         Precise: Preserves exact original layout, replacing only text (Canva-like).
+        Vector: Writes translations as selectable PDF text without rendering pages to images.
         Bilingual: Keeps original pages and adds translation pages after each.
         Markdown: Uses Markdown as intermediate format for better structure preservation.
         """
@@ -370,8 +397,25 @@ def main():
     # Display detailed description of selected mode
     st.sidebar.markdown(PDF_MODE_DESCRIPTIONS[pdf_mode])
     
+    # Optional LLM editing pass for markdown mode
+    post_edit = "off"
+    if pdf_mode == "markdown":
+        post_edit = st.sidebar.selectbox(
+            "Post-editing",
+            options=list(MarkdownProcessor.POST_EDIT_POLICIES),
+            format_func=lambda x: POST_EDIT_OPTIONS[x],
+            help="An extra LLM pass that polishes the translation. Editing the whole document roughly doubles token usage."
+        )
+    
+    # Reuse earlier translations across documents
+    translation_memory_path = st.sidebar.text_input(
+        "Translation Memory Database",
+        value=os.environ.get("AWT_TRANSLATION_MEMORY", ""),
+        help="Path to a translation memory database. Previously translated text is reused instead of calling the API. Leave empty to disable."
+    ).strip()
+    
     # Chinese character support info
-    if pdf_mode in ["precise", "bilingual", "markdown"]:
+    if pdf_mode in ["precise", "vector", "bilingual", "markdown"]:
         st.sidebar.success("✓ Advanced Chinese character support is enabled in this mode")
     
     # Main area - File upload
@@ -487,7 +531,9 @@ def main():
                     model,
                     openai_key,
                     pdf_mode,
-                    xai_key
+                    xai_key,
+                    post_edit,
+                    translation_memory_path or None
                 )
                 
                 status_text.text("Step 4/4: Finalizing document...")